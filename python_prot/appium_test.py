@@ -4,57 +4,43 @@ Appium test script for FindMy app on iOS
 """
 
 from appium import webdriver
-from appium.options.ios import XCUITestOptions
 from appium.webdriver.common.appiumby import AppiumBy
+from harness import APPIUM_SERVER_URL, build_options
+from harness.hierarchy import HierarchyArchive, summarize
+from harness.screenshots import ScreenshotPipeline
+from page_objects import FindMyMainPage
+import os
 import time
 
-# W3C compliant capabilities using XCUITestOptions
-options = XCUITestOptions()
-
-# Required capabilities
-options.platform_name = 'iOS'
-options.automation_name = 'XCUITest'
-options.device_name = 'Chi Thu – iPhone'  # Your device name
-options.udid = '00008110-001E64343483801E'  # Your device UDID
-
-# FindMy app bundle identifier
-options.bundle_id = 'com.apple.findmy'
-
-# Additional options
-options.no_reset = True  # Don't reset app state
-options.new_command_timeout = 300  # 5 minutes timeout
-
-# WebDriverAgent configuration for real device
-options.show_xcode_log = True  # Show Xcode build logs for debugging
-options.use_prebuilt_wda = True  # Use prebuilt WDA if available
-options.xcode_org_id = '5C489RHX7L'  # Your Apple Developer Team ID
-options.xcode_signing_id = 'Apple Development'  # Signing identity
-options.updated_wda_bundle_id = 'com.chithule.WebDriverAgentRunner'  # Unique bundle ID
-
-# Connect to Appium server
-appium_server_url = 'http://127.0.0.1:4723'
 
 def test_findmy_app():
     """Test FindMy app basic functionality"""
     
-    driver = webdriver.Remote(appium_server_url, options=options)
+    started = time.perf_counter()
+    driver = webdriver.Remote(APPIUM_SERVER_URL, options=build_options())
+    os.makedirs("./screenshots", exist_ok=True)
+    screenshots = ScreenshotPipeline("./screenshots/appium_test.zip")
+    hierarchy = HierarchyArchive("./screenshots/appium_test_hierarchy.sqlite")
     
     try:
         print("✅ Connected to FindMy app")
         
-        # Wait for app to load
-        time.sleep(3)
+        # Wait for the main screen instead of a fixed sleep
+        main_page = FindMyMainPage(driver).wait_until_ready()
+        print(f"⏱️  Interactive {time.perf_counter() - started:.2f} s after connecting")
         
-        # Print page source to inspect elements
-        print("\n📱 App UI Structure:")
-        print(driver.page_source)
+        # Archive the page source instead of dumping it; inspect it with
+        # python -m harness.hierarchy screenshots/appium_test_hierarchy.sqlite --run appium_test --step N
+        source = driver.page_source
+        step = hierarchy.record(source, "launched", run="appium_test")
+        print(f"\n📱 App UI Structure (step {step}): {summarize(source)}")
         
         # Example: Find and tap on People tab
         try:
             people_tab = driver.find_element(AppiumBy.ACCESSIBILITY_ID, "People")
             people_tab.click()
+            main_page.wait_for_tab_selected(people_tab)
             print("✅ Tapped People tab")
-            time.sleep(2)
         except Exception as e:
             print(f"⚠️ Could not find People tab: {e}")
         
@@ -62,15 +48,14 @@ def test_findmy_app():
         try:
             devices_tab = driver.find_element(AppiumBy.ACCESSIBILITY_ID, "Devices")
             devices_tab.click()
+            main_page.wait_for_tab_selected(devices_tab)
             print("✅ Tapped Devices tab")
-            time.sleep(2)
         except Exception as e:
             print(f"⚠️ Could not find Devices tab: {e}")
         
-        # Take screenshot
-        screenshot_path = "./screenshots/appium_screenshot.png"
-        driver.save_screenshot(screenshot_path)
-        print(f"📸 Screenshot saved to: {screenshot_path}")
+        # Take screenshot (decoded and written in the background)
+        screenshots.capture(driver, "devices tab", test="appium_test")
+        hierarchy.record(driver.page_source, "devices tab", run="appium_test")
         
     except Exception as e:
         print(f"❌ Error during test: {e}")
@@ -78,6 +63,10 @@ def test_findmy_app():
     finally:
         # Close the session
         driver.quit()
+        screenshots.close()
+        hierarchy.close()
+        print(f"📸 Screenshots saved to: {screenshots.path}")
+        print(f"🌳 UI hierarchy saved to: {hierarchy.path}")
         print("✅ Test completed")
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark name lookups and visibility checks
+"""
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+
+TARGET_DEVICE = "Chi's Laptop"
+LIST_SIZES = (5, 50, 500)
+
+
+def test_tap_device_by_name(findmy_session, benchmark):
+    """Find the last device of 5, 50 and 500-cell Devices lists, starting at the top"""
+    commands = []
+    for list_size in LIST_SIZES:
+        devices = [f"Family iPhone {number}" for number in range(1, list_size)] + [TARGET_DEVICE]
+        main_page, recorder = findmy_session(devices=devices)
+        main_page.tap_devices_tab()
+        detail_pages = []
+        
+        def scroll_to_top():
+            # Every round is a cold lookup, not a repeat at the row the last one left on screen
+            next(main_page.iter_cells())
+        
+        def lookup():
+            detail_pages.append(main_page.tap_device_by_name(TARGET_DEVICE))
+        
+        def close():
+            detail_pages.pop().tap_close_button()
+        
+        result = benchmark(f"tap_device_by_name[{list_size}]", lookup, recorder, setup=scroll_to_top, teardown=close)
+        commands.append(result.commands)
+    
+    # Rows below the fold cost scrolls, so longer lists must cost more commands
+    assert commands[0] < commands[1] < commands[2], commands
+
+
+def test_is_element_visible_hit(findmy_session, benchmark):
+    """Visibility check for an element that is on screen"""
+    main_page, recorder = findmy_session()
+    
+    def check():
+        assert main_page.is_element_visible(AppiumBy.ACCESSIBILITY_ID, main_page.DEVICES_TAB)
+    
+    benchmark("is_element_visible_hit", check, recorder)
+
+
+def test_is_element_absent(findmy_session, benchmark):
+    """Absence check for an element that is not there"""
+    main_page, recorder = findmy_session()
+    
+    def check():
+        assert main_page.is_element_absent(AppiumBy.ACCESSIBILITY_ID, "No Such Button")
+    
+    benchmark("is_element_absent", check, recorder)
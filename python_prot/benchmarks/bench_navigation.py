@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark tab switching and detail-page navigation
+"""
+
+
+def test_tab_switching(findmy_session, benchmark):
+    """Cycle through all four tabs"""
+    main_page, recorder = findmy_session()
+    
+    def cycle_tabs():
+        main_page.tap_devices_tab()
+        main_page.tap_items_tab()
+        main_page.tap_me_tab()
+        main_page.tap_people_tab()
+    
+    benchmark("tab_switching", cycle_tabs, recorder)
+
+
+def test_open_and_close_device_details(findmy_session, benchmark):
+    """Open the first device and close its detail page"""
+    main_page, recorder = findmy_session()
+    main_page.tap_devices_tab()
+    
+    def open_and_close():
+        main_page.tap_first_device().tap_close_button()
+    
+    benchmark("device_details_open_close", open_and_close, recorder)
+
+
+def test_open_and_close_person_details(findmy_session, benchmark):
+    """Open the first person and close their detail page"""
+    main_page, recorder = findmy_session()
+    main_page.tap_people_tab()
+    
+    def open_and_close():
+        main_page.tap_first_person().tap_close_button()
+    
+    benchmark("person_details_open_close", open_and_close, recorder)
+
+
+def test_batched_tab_switching(findmy_session, benchmark):
+    """Cycle through all four tabs with one W3C Actions call"""
+    main_page, recorder = findmy_session()
+    
+    def cycle_tabs():
+        main_page.batch().tap_tab("Devices").tap_tab("Items").tap_tab("Me").tap_tab("People").perform()
+    
+    benchmark("batched_tab_switching", cycle_tabs, recorder)
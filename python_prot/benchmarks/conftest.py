@@ -0,0 +1,103 @@
+"""
+Benchmark fixtures: stand-in server, latency model and baseline gates
+"""
+
+import os
+import pytest
+from harness import SessionPool
+from harness.benchmark import Baseline, measure
+from harness.fake_appium import FakeAppiumServer, FindMyApp, LatencyModel, SimulatorBackend
+from harness.instrumentation import CommandRecorder
+from page_objects import FindMyMainPage
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks", "Page-object benchmarks")
+    group.addoption("--bench-latency-ms", type=float, default=20.0,
+                    help="stand-in server delay per command (default 20)")
+    group.addoption("--bench-jitter-ms", type=float, default=0.0,
+                    help="stand-in server +/- jitter per command")
+    group.addoption("--bench-rounds", type=int, default=3,
+                    help="measured rounds per benchmark (default 3)")
+    group.addoption("--bench-baseline", default=BASELINE_PATH,
+                    help="baseline file to compare against")
+    group.addoption("--bench-time-tolerance", type=float, default=0.25,
+                    help="allowed relative wall-time regression (default 0.25)")
+    group.addoption("--update-baseline", action="store_true",
+                    help="save this run's results as the new baseline instead of failing")
+
+
+def pytest_collect_file(file_path, parent):
+    """Collect bench_*.py modules (kept out of the default test run)"""
+    if file_path.suffix == ".py" and file_path.name.startswith("bench_"):
+        return pytest.Module.from_parent(parent, path=file_path)
+
+
+@pytest.fixture(scope="session")
+def latency_model_settings(request):
+    return {
+        "base_ms": request.config.getoption("--bench-latency-ms"),
+        "jitter_ms": request.config.getoption("--bench-jitter-ms"),
+    }
+
+
+@pytest.fixture(scope="session")
+def baseline(request, latency_model_settings):
+    """Baseline results; rewritten at the end with --update-baseline"""
+    baseline = Baseline(
+        request.config.getoption("--bench-baseline"),
+        latency_model_settings,
+        time_tolerance=request.config.getoption("--bench-time-tolerance"),
+    )
+    
+    yield baseline
+    
+    if request.config.getoption("--update-baseline"):
+        baseline.save()
+
+
+@pytest.fixture
+def findmy_session(latency_model_settings):
+    """Factory: a driver on a stand-in server simulating the given lists"""
+    servers, pools = [], []
+    
+    def start(**lists):
+        latency = LatencyModel(
+            base=latency_model_settings["base_ms"] / 1000.0,
+            jitter=latency_model_settings["jitter_ms"] / 1000.0,
+            seed=0,
+        )
+        server = FakeAppiumServer(SimulatorBackend(FindMyApp(**lists)), latency=latency).start()
+        recorder = CommandRecorder()
+        pool = SessionPool(server_url=server.url, on_create=recorder.attach)
+        servers.append(server)
+        pools.append(pool)
+        driver = pool.acquire()
+        return FindMyMainPage(driver).wait_until_ready(), recorder
+    
+    yield start
+    
+    for pool in pools:
+        pool.close_all()
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def benchmark(request, baseline):
+    """Measure a flow and fail if it regressed against the baseline"""
+    rounds = request.config.getoption("--bench-rounds")
+    update = request.config.getoption("--update-baseline")
+    
+    def run(name, flow, recorder, setup=None, teardown=None, command_slack=0):
+        result = measure(name, flow, recorder, rounds=rounds, setup=setup, teardown=teardown)
+        regressions = baseline.check(result, command_slack=command_slack)
+        print(f"\n⏱️  {name}: {result.median_s * 1000:.1f} ms, {result.commands} commands")
+        if regressions and not update:
+            pytest.fail("Benchmark regression:\n" + "\n".join(regressions))
+        return result
+    
+    return run
@@ -0,0 +1,6 @@
+"""Test harness support package"""
+
+from .capabilities import APPIUM_SERVER_URL, FINDMY_BUNDLE_ID, build_options
+from .session_pool import SessionPool
+
+__all__ = ['APPIUM_SERVER_URL', 'FINDMY_BUNDLE_ID', 'build_options', 'SessionPool']
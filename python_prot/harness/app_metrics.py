@@ -0,0 +1,255 @@
+"""
+Launch and time-to-interactive metrics for the app under test, per app version
+    
+    python -m harness.app_metrics --repetitions 10
+    python -m harness.app_metrics --fake --fake-launch-ms 900 --fake-detail-ms 250 --fake-version 4.1
+
+Cold launch: terminate, then activate until the main screen is ready.
+Warm launch: send the app to the background, then activate it again.
+Screen TTI: from the tap command until the target page's readiness
+contract holds and its hierarchy has settled.
+
+Results are stored per app version in app_metrics.json; a version whose
+median is clearly above the previous version's is reported as a regression.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.command import Command
+
+from harness.capabilities import APPIUM_SERVER_URL, FINDMY_BUNDLE_ID
+from harness.session_pool import SessionPool
+from page_objects import FindMyMainPage
+from page_objects.flight_recorder import recorder as flight_recorder
+
+
+DEFAULT_REPETITIONS = 5
+DEFAULT_HISTORY_PATH = 'app_metrics.json'
+
+# A metric regresses when its median exceeds the previous version's by
+# more than this fraction and this many seconds
+REGRESSION_TOLERANCE = 0.2
+REGRESSION_SLACK = 0.05
+
+# Commands that start a screen transition
+TAP_COMMANDS = frozenset({Command.CLICK_ELEMENT, Command.W3C_ACTIONS})
+
+# name -> (precondition(main page), action(main page) returning the ready target page)
+SCREENS = {
+    'devices_tab': (lambda page: page.tap_people_tab(), lambda page: page.tap_devices_tab()),
+    'people_tab': (lambda page: page.tap_devices_tab(), lambda page: page.tap_people_tab()),
+    'person_detail': (lambda page: page.tap_people_tab(), lambda page: page.tap_first_person()),
+    'device_detail': (lambda page: page.tap_devices_tab(), lambda page: page.tap_first_device()),
+}
+
+
+class Measurement:
+    """Repeated timings of one metric, in seconds"""
+    
+    def __init__(self, name, samples=None):
+        self.name = name
+        self.samples = list(samples or [])
+    
+    @property
+    def median(self):
+        return statistics.median(self.samples)
+    
+    @property
+    def spread(self):
+        """Standard deviation (0 for a single sample)"""
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+    
+    def to_dict(self):
+        return {
+            'median_s': round(self.median, 4),
+            'stdev_s': round(self.spread, 4),
+            'min_s': round(min(self.samples), 4),
+            'max_s': round(max(self.samples), 4),
+            'repetitions': len(self.samples),
+        }
+
+
+class TapClock:
+    """Remembers when the last tap command of a driver was sent"""
+    
+    def __init__(self, driver):
+        self.tapped_at = None
+        execute = driver.execute
+        
+        def timed_execute(driver_command, params=None):
+            if driver_command in TAP_COMMANDS:
+                self.tapped_at = time.perf_counter()
+            return execute(driver_command, params)
+        
+        driver.execute = timed_execute
+
+
+def app_version(driver, bundle_id=FINDMY_BUNDLE_ID):
+    """'<short version> (<build>)' of an installed system app, 'unknown' when not reported"""
+    try:
+        apps = driver.execute_script('mobile: listApps', {'applicationType': 'System'}) or {}
+    except WebDriverException:
+        return 'unknown'
+    info = apps.get(bundle_id) or {}
+    version = info.get('CFBundleShortVersionString')
+    build = info.get('CFBundleVersion')
+    if not version:
+        return 'unknown'
+    return version if not build or build == version else f"{version} ({build})"
+
+
+class AppMetrics:
+    """Measure launches and screen TTI on one session, repetitions times each
+    
+    metrics = AppMetrics(driver, repetitions=10)
+    results = metrics.run()        # {"cold_launch": Measurement, ...}
+    """
+    
+    def __init__(self, driver, bundle_id=FINDMY_BUNDLE_ID, repetitions=DEFAULT_REPETITIONS):
+        self.driver = driver
+        self.bundle_id = bundle_id
+        self.repetitions = repetitions
+        self.clock = TapClock(driver)
+    
+    def _main_page(self):
+        return FindMyMainPage(self.driver).return_to_main_screen().wait_until_ready()
+    
+    def cold_launch(self):
+        self.driver.terminate_app(self.bundle_id)
+        started = time.perf_counter()
+        self.driver.activate_app(self.bundle_id)
+        FindMyMainPage(self.driver).wait_until_ready()
+        return time.perf_counter() - started
+    
+    def warm_launch(self):
+        self._main_page()
+        self.driver.background_app(-1)
+        started = time.perf_counter()
+        self.driver.activate_app(self.bundle_id)
+        FindMyMainPage(self.driver).wait_until_ready()
+        return time.perf_counter() - started
+    
+    def screen_tti(self, screen):
+        precondition, action = SCREENS[screen]
+        page = self._main_page()
+        precondition(page)
+        self.clock.tapped_at = None
+        action(page)
+        ready = time.perf_counter()
+        if self.clock.tapped_at is None:
+            raise RuntimeError(f"{screen}: no tap command was sent")
+        return ready - self.clock.tapped_at
+    
+    def run(self, screens=tuple(SCREENS)):
+        """Every metric, repetitions times; one metric at a time so caches stay comparable"""
+        results = {}
+        measures = [('cold_launch', self.cold_launch), ('warm_launch', self.warm_launch)]
+        measures += [(f"tti.{screen}", lambda screen=screen: self.screen_tti(screen)) for screen in screens]
+        for name, measure in measures:
+            results[name] = Measurement(name, [measure() for _ in range(self.repetitions)])
+        self._main_page()
+        return results
+
+
+class MetricsHistory:
+    """Latest results per app version, kept in one JSON file"""
+    
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self.versions = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as source:
+                self.versions = json.load(source).get('versions', {})
+    
+    def record(self, version, results, device=None):
+        self.versions[version] = {
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'device': device,
+            'metrics': {name: measurement.to_dict() for name, measurement in results.items()},
+        }
+    
+    def previous(self, version):
+        """The most recently recorded other version, or None"""
+        others = [(entry['recorded_at'], name) for name, entry in self.versions.items() if name != version]
+        return max(others)[1] if others else None
+    
+    def regressions(self, version, tolerance=REGRESSION_TOLERANCE, slack=REGRESSION_SLACK):
+        """Metrics of version that got slower than the previous version"""
+        previous = self.previous(version)
+        if previous is None or version not in self.versions:
+            return []
+        found = []
+        before = self.versions[previous]['metrics']
+        for name, metric in self.versions[version]['metrics'].items():
+            if name not in before:
+                continue
+            allowed = before[name]['median_s'] * (1 + tolerance) + slack
+            if metric['median_s'] > allowed:
+                found.append(f"{name}: median {metric['median_s']:.3f}s on {version}, "
+                             f"{before[name]['median_s']:.3f}s on {previous} (limit {allowed:.3f}s)")
+        return found
+    
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as output:
+            json.dump({'versions': self.versions}, output, indent=2, sort_keys=True)
+            output.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harness.app_metrics', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repetitions', type=int, default=DEFAULT_REPETITIONS)
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH, help='per-version results (updated)')
+    parser.add_argument('--server-url', default=APPIUM_SERVER_URL)
+    parser.add_argument('--verbose', action='store_true', help='show page-object output')
+    parser.add_argument('--fake', action='store_true', help='run against the stand-in server')
+    parser.add_argument('--fake-version', default='4.0', help='stand-in: app version reported')
+    parser.add_argument('--fake-launch-ms', type=float, default=800.0, help='stand-in: cold launch delay')
+    parser.add_argument('--fake-tab-ms', type=float, default=100.0, help='stand-in: tab content delay')
+    parser.add_argument('--fake-detail-ms', type=float, default=200.0, help='stand-in: detail page delay')
+    args = parser.parse_args(argv)
+    flight_recorder.echo = args.verbose
+    
+    with contextlib.ExitStack() as stack:
+        server_url = args.server_url
+        if args.fake:
+            from harness.fake_appium import FakeAppiumServer, FindMyApp, SimulatorBackend
+            delays = {'launch': args.fake_launch_ms / 1000.0, 'tab': args.fake_tab_ms / 1000.0,
+                      'detail': args.fake_detail_ms / 1000.0}
+            app = FindMyApp(delays=delays, version=args.fake_version)
+            server_url = stack.enter_context(FakeAppiumServer(SimulatorBackend(app))).url
+        
+        pool = SessionPool(server_url=server_url)
+        stack.callback(pool.close_all)
+        driver = pool.acquire()
+        version = app_version(driver)
+        print(f"📏 Measuring FindMy {version}, {args.repetitions} repetitions per metric")
+        results = AppMetrics(driver, repetitions=args.repetitions).run()
+        device = driver.capabilities.get('deviceName') or driver.capabilities.get('appium:deviceName')
+    
+    for name, measurement in results.items():
+        print(f"⏱️  {name:20s} median {measurement.median * 1000:7.0f} ms  ± {measurement.spread * 1000:5.0f} ms  "
+              f"({min(measurement.samples) * 1000:.0f}-{max(measurement.samples) * 1000:.0f} ms)")
+    
+    history = MetricsHistory(args.history)
+    history.record(version, results, device=device)
+    history.save()
+    regressions = history.regressions(version)
+    for regression in regressions:
+        print(f"❌ {regression}")
+    previous = history.previous(version)
+    if previous and not regressions:
+        print(f"✅ No regressions against {previous}")
+    print(f"📄 History: {args.history}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
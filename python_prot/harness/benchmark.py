@@ -0,0 +1,114 @@
+"""
+Benchmark measurement and baseline regression gates
+"""
+
+import json
+import os
+import statistics
+import time
+
+
+class BenchmarkResult:
+    """Wall times and WebDriver command counts of repeated runs of one flow"""
+    
+    def __init__(self, name, wall_times, command_counts):
+        self.name = name
+        self.wall_times = wall_times
+        self.command_counts = command_counts
+    
+    @property
+    def median_s(self):
+        return statistics.median(self.wall_times)
+    
+    @property
+    def commands(self):
+        return int(statistics.median(self.command_counts))
+    
+    def to_dict(self):
+        return {
+            'median_s': round(self.median_s, 4),
+            'min_s': round(min(self.wall_times), 4),
+            'max_s': round(max(self.wall_times), 4),
+            'commands': self.commands,
+            'rounds': len(self.wall_times),
+        }
+
+
+def measure(name, flow, recorder, rounds=3, setup=None, teardown=None, warmup=1):
+    """Run flow() rounds times, counting commands through recorder
+    
+    setup() and teardown() run around every round but are not measured;
+    warmup rounds are run first and discarded.
+    """
+    wall_times, command_counts = [], []
+    for round_number in range(warmup + rounds):
+        if setup is not None:
+            setup()
+        commands_before = recorder.count()
+        started = time.perf_counter()
+        flow()
+        elapsed = time.perf_counter() - started
+        commands = recorder.count() - commands_before
+        if teardown is not None:
+            teardown()
+        if round_number >= warmup:
+            wall_times.append(elapsed)
+            command_counts.append(commands)
+    return BenchmarkResult(name, wall_times, command_counts)
+
+
+class Baseline:
+    """Stored benchmark results and the thresholds a new run must meet
+    
+    A benchmark regresses when it sends more WebDriver commands than its
+    baseline (plus an optional per-benchmark slack for polling loops), or
+    when its median wall time exceeds the baseline by more than
+    time_tolerance (relative) and time_slack (absolute seconds). Times
+    are only compared when the baseline was recorded with the same
+    latency model.
+    """
+    
+    def __init__(self, path, latency_model, time_tolerance=0.25, time_slack=0.05):
+        self.path = path
+        self.latency_model = latency_model
+        self.time_tolerance = time_tolerance
+        self.time_slack = time_slack
+        self.results = {}
+        self.stored = {}
+        self.stored_latency_model = None
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as source:
+                data = json.load(source)
+            self.stored = data.get('benchmarks', {})
+            self.stored_latency_model = data.get('latency_model')
+    
+    def check(self, result, command_slack=0):
+        """Record a result and return a list of regressions (empty if none)"""
+        self.results[result.name] = result.to_dict()
+        stored = self.stored.get(result.name)
+        if stored is None:
+            return []
+        
+        regressions = []
+        allowed_commands = stored['commands'] + command_slack
+        if result.commands > allowed_commands:
+            regressions.append(
+                f"{result.name}: {result.commands} commands, baseline {stored['commands']} (+{command_slack} allowed)"
+            )
+        if self.stored_latency_model == self.latency_model:
+            allowed_s = stored['median_s'] * (1 + self.time_tolerance) + self.time_slack
+            if result.median_s > allowed_s:
+                regressions.append(
+                    f"{result.name}: median {result.median_s:.3f}s, baseline {stored['median_s']:.3f}s "
+                    f"(limit {allowed_s:.3f}s)"
+                )
+        return regressions
+    
+    def save(self):
+        """Write this run's results as the new baseline"""
+        benchmarks = dict(self.stored)
+        benchmarks.update(self.results)
+        with open(self.path, 'w', encoding='utf-8') as output:
+            json.dump({'latency_model': self.latency_model, 'benchmarks': benchmarks},
+                      output, indent=2, sort_keys=True)
+            output.write('\n')
@@ -0,0 +1,57 @@
+"""
+Shared Appium capabilities for the FindMy tests
+"""
+
+import os
+from appium.options.ios import XCUITestOptions
+
+
+# Appium server the tests talk to (override with APPIUM_SERVER_URL)
+APPIUM_SERVER_URL = os.environ.get('APPIUM_SERVER_URL', 'http://127.0.0.1:4723')
+
+# FindMy app bundle identifier
+FINDMY_BUNDLE_ID = 'com.apple.findmy'
+
+# Default device and WebDriverAgent signing settings
+# (DEVICE_NAME, DEVICE_UDID, WDA_LOCAL_PORT and WDA_BUNDLE_ID override them,
+# which is how the parallel scheduler points each worker at its own device)
+DEFAULT_DEVICE = {
+    'device_name': os.environ.get('DEVICE_NAME', 'Chi Thu – iPhone'),
+    'udid': os.environ.get('DEVICE_UDID', '00008110-001E64343483801E'),
+    'xcode_org_id': '5C489RHX7L',  # Apple Developer Team ID
+    'xcode_signing_id': 'Apple Development',
+    'updated_wda_bundle_id': os.environ.get('WDA_BUNDLE_ID', 'com.chithule.WebDriverAgentRunner'),
+}
+if os.environ.get('WDA_LOCAL_PORT'):
+    DEFAULT_DEVICE['wda_local_port'] = int(os.environ['WDA_LOCAL_PORT'])
+
+
+def build_options(**overrides):
+    """Build W3C compliant XCUITest options for the FindMy app
+    
+    Any keyword argument overrides the matching DEFAULT_DEVICE entry,
+    e.g. build_options(udid='...', wda_local_port=8101).
+    """
+    device = dict(DEFAULT_DEVICE, **overrides)
+    
+    options = XCUITestOptions()
+    
+    # Required capabilities
+    options.platform_name = 'iOS'
+    options.automation_name = 'XCUITest'
+    options.bundle_id = FINDMY_BUNDLE_ID
+    
+    # Keep app state between sessions
+    options.no_reset = True
+    options.new_command_timeout = 300  # 5 minutes timeout
+    
+    # WebDriverAgent configuration for real device
+    options.show_xcode_log = True
+    options.use_prebuilt_wda = True
+    
+    for name, value in device.items():
+        if not isinstance(getattr(type(options), name, None), property):
+            raise ValueError(f"Unknown XCUITest option: {name}")
+        setattr(options, name, value)
+    
+    return options
@@ -0,0 +1,12 @@
+"""Stand-in Appium server for offline page-object runs"""
+
+from .app import FindMyApp
+from .backends import ProxyBackend, Recorder, ReplayBackend, SimulatorBackend
+from .cassette import Cassette
+from .latency import LatencyModel
+from .server import FakeAppiumServer
+
+__all__ = [
+    'FakeAppiumServer', 'FindMyApp', 'SimulatorBackend', 'ProxyBackend',
+    'Recorder', 'ReplayBackend', 'Cassette', 'LatencyModel',
+]
@@ -0,0 +1,61 @@
+"""
+Command line for the stand-in Appium server
+    
+    python -m harness.fake_appium simulate --port 4723
+    python -m harness.fake_appium record --upstream http://127.0.0.1:4723 --cassette run.jsonl.gz --port 4724
+    python -m harness.fake_appium replay --cassette run.jsonl.gz --port 4723 --latency-ms 80 --jitter-ms 20
+"""
+
+import argparse
+
+from .backends import ProxyBackend, Recorder, ReplayBackend, SimulatorBackend
+from .cassette import Cassette
+from .latency import LatencyModel
+from .server import FakeAppiumServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harness.fake_appium', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('mode', choices=['simulate', 'record', 'replay'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4723)
+    parser.add_argument('--cassette', help='cassette to write (record) or read (replay)')
+    parser.add_argument('--upstream', help='real Appium server to record from (default: simulate)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='base delay per command')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='uniform +/- jitter per command')
+    parser.add_argument('--seed', type=int, default=0, help='jitter random seed')
+    parser.add_argument('--drift-ms', type=float, default=0.0,
+                        help='extra delay per command already served (simulates degradation)')
+    parser.add_argument('--spike-ms', type=float, default=0.0, help='stall added to every --spike-every-th command')
+    parser.add_argument('--spike-every', type=int, default=0, help='commands between stalls (0 = never)')
+    parser.add_argument('--recorded-timing', action='store_true', help='replay with the recorded durations')
+    args = parser.parse_args(argv)
+    
+    if args.mode in ('record', 'replay') and not args.cassette:
+        parser.error(f"{args.mode} needs --cassette")
+    
+    if args.mode == 'replay':
+        backend = ReplayBackend(Cassette.load(args.cassette), use_recorded_timing=args.recorded_timing)
+    elif args.mode == 'record':
+        inner = ProxyBackend(args.upstream) if args.upstream else SimulatorBackend()
+        backend = Recorder(inner)
+    else:
+        backend = SimulatorBackend()
+    
+    latency = LatencyModel(base=args.latency_ms / 1000.0, jitter=args.jitter_ms / 1000.0, seed=args.seed,
+                           drift=args.drift_ms / 1000.0, spike=args.spike_ms / 1000.0, spike_every=args.spike_every)
+    server = FakeAppiumServer(backend, host=args.host, port=args.port, latency=latency)
+    print(f"🟢 Stand-in Appium server ({args.mode}) on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.mode == 'record':
+            backend.cassette.save(args.cassette)
+            print(f"💾 Saved {len(backend.cassette)} interactions to {args.cassette}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,324 @@
+"""
+Simulated FindMy app used by the stand-in Appium server
+"""
+
+import hashlib
+import threading
+import time
+from xml.sax.saxutils import quoteattr
+
+
+# XCUITest application states (see appium.webdriver.applicationstate)
+NOT_RUNNING = 1
+RUNNING_IN_BACKGROUND = 3
+RUNNING_IN_FOREGROUND = 4
+
+SCREEN_WIDTH = 390
+SCREEN_HEIGHT = 844
+
+# List geometry: like UITableView, only the rows in the viewport plus a few
+# prefetched rows on either side are materialised in the hierarchy
+TABLE_TOP = 120
+TABLE_BOTTOM = 761
+ROW_HEIGHT = 60
+VISIBLE_ROWS = (TABLE_BOTTOM - TABLE_TOP) // ROW_HEIGHT
+PREFETCH_ROWS = 2
+
+DEFAULT_PEOPLE = ["Anna Le", "Minh Tran", "Linh Nguyen"]
+DEFAULT_DEVICES = ["Chi's iPhone", "Chi's Laptop", "Chi's iPad", "Chi's Apple Watch"]
+DEFAULT_ITEMS = ["Keys", "Backpack"]
+
+TABS = ("People", "Devices", "Items", "Me")
+
+
+class UiElement:
+    """One node of the simulated accessibility tree"""
+    
+    __slots__ = ('type', 'key', 'name', 'label', 'value', 'rect', 'enabled', 'visible', 'selected', 'children')
+    
+    def __init__(self, element_type, key, name=None, label=None, value=None, rect=(0, 0, 0, 0),
+                 enabled=True, visible=True, selected=False, children=()):
+        self.type = element_type
+        self.key = key
+        self.name = name
+        self.label = label
+        self.value = value
+        self.rect = rect
+        self.enabled = enabled
+        self.visible = visible
+        self.selected = selected
+        self.children = list(children)
+    
+    @property
+    def element_id(self):
+        """Stable W3C element id derived from the element's logical key"""
+        digest = hashlib.md5(self.key.encode('utf-8')).hexdigest()
+        return f"{digest[:8]}-{digest[8:12]}-{digest[12:16]}-{digest[16:20]}-{digest[20:32]}"
+    
+    def iter(self):
+        """Yield this element and its descendants in document order"""
+        yield self
+        for child in self.children:
+            yield from child.iter()
+    
+    def rect_dict(self):
+        x, y, width, height = self.rect
+        return {'x': x, 'y': y, 'width': width, 'height': height}
+    
+    def predicate_value(self, name):
+        """Attribute value as seen by NSPredicate queries"""
+        if name in ('type', 'name', 'label', 'value', 'enabled', 'visible', 'selected'):
+            return getattr(self, name)
+        if name == 'accessible':
+            return self.type not in ('XCUIElementTypeOther', 'XCUIElementTypeWindow', 'XCUIElementTypeApplication')
+        if name == 'hittable':
+            return self.visible and self.enabled
+        return None
+    
+    def attribute(self, name):
+        """Attribute value as returned by GET /element/:id/attribute/:name"""
+        if name == 'rect':
+            return self.rect_dict()
+        value = self.predicate_value(name)
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        return value
+    
+    def xml_attributes(self):
+        attributes = {'type': self.type}
+        for name in ('name', 'label', 'value'):
+            value = getattr(self, name)
+            if value is not None:
+                attributes[name] = str(value)
+        for name in ('enabled', 'visible', 'selected'):
+            attributes[name] = 'true' if getattr(self, name) else 'false'
+        for name, value in self.rect_dict().items():
+            attributes[name] = str(value)
+        return attributes
+    
+    def to_xml(self, depth=0):
+        attributes = ' '.join(f"{name}={quoteattr(value)}" for name, value in self.xml_attributes().items())
+        indent = '  ' * depth
+        if not self.children:
+            return f"{indent}<{self.type} {attributes}/>\n"
+        inner = ''.join(child.to_xml(depth + 1) for child in self.children)
+        return f"{indent}<{self.type} {attributes}>\n{inner}{indent}</{self.type}>\n"
+
+
+class FindMyApp:
+    """State machine for the parts of FindMy the page objects drive
+    
+    One instance stands in for one physical device, so every session on a
+    server sees the same app state. delays maps 'launch', 'tab' and
+    'detail' to seconds before that screen's content appears.
+    """
+    
+    bundle_id = 'com.apple.findmy'
+    version = '4.0'
+    
+    def __init__(self, people=None, devices=None, items=None, delays=None, version=None):
+        self.lists = {
+            'People': list(DEFAULT_PEOPLE if people is None else people),
+            'Devices': list(DEFAULT_DEVICES if devices is None else devices),
+            'Items': list(DEFAULT_ITEMS if items is None else items),
+        }
+        self.delays = dict(delays or {})
+        if version is not None:
+            self.version = version
+        self.lock = threading.RLock()
+        self.state = NOT_RUNNING
+        self.tab = 'People'
+        self.detail = None
+        # Index of the first row in the viewport, per list
+        self.first_row = {tab: 0 for tab in self.lists}
+        self.scrolls = 0
+        self.sound_playing = False
+        self.events = []
+        self.launches = 0
+        self._ready_at = {}
+    
+    # App lifecycle
+    
+    def activate(self):
+        with self.lock:
+            if self.state == NOT_RUNNING:
+                self.launches += 1
+                self.tab = 'People'
+                self.detail = None
+                self._delay('launch')
+            self.state = RUNNING_IN_FOREGROUND
+    
+    def terminate(self):
+        with self.lock:
+            was_running = self.state != NOT_RUNNING
+            self.state = NOT_RUNNING
+            self.detail = None
+            return was_running
+    
+    def background(self):
+        with self.lock:
+            if self.state == RUNNING_IN_FOREGROUND:
+                self.state = RUNNING_IN_BACKGROUND
+    
+    # Rendering
+    
+    def tree(self):
+        """Build the accessibility tree for the current state"""
+        with self.lock:
+            window = UiElement('XCUIElementTypeWindow', 'window', rect=(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+            app = UiElement('XCUIElementTypeApplication', 'app', name='Find My', label='Find My',
+                            rect=(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), children=[window])
+            if self.state != RUNNING_IN_FOREGROUND or not self._ready('launch'):
+                return app
+            window.children.append(self._main_content())
+            window.children.append(self._tab_bar())
+            if self.detail is not None:
+                window.children.append(self._detail_card())
+            return app
+    
+    def page_source(self):
+        return '<?xml version="1.0" encoding="UTF-8"?>\n<AppiumAUT>\n' + self.tree().to_xml(1) + '</AppiumAUT>\n'
+    
+    def _main_content(self):
+        title = UiElement('XCUIElementTypeStaticText', 'title', label=self.tab, rect=(16, 60, 200, 41))
+        content = UiElement('XCUIElementTypeOther', 'content', rect=(0, 0, SCREEN_WIDTH, TABLE_BOTTOM),
+                            children=[title])
+        if self.tab == 'Me':
+            content.children.append(UiElement('XCUIElementTypeStaticText', 'me:location', name='My Location',
+                                              label='My Location', rect=(16, 140, 358, 22)))
+            return content
+        table = UiElement('XCUIElementTypeTable', f"table:{self.tab}",
+                          rect=(0, TABLE_TOP, SCREEN_WIDTH, TABLE_BOTTOM - TABLE_TOP))
+        if self._ready('tab'):
+            names = self.lists[self.tab]
+            first = self.first_row[self.tab]
+            for row in range(max(0, first - PREFETCH_ROWS), min(len(names), first + VISIBLE_ROWS + PREFETCH_ROWS)):
+                table.children.append(self._cell(row, names[row]))
+        content.children.append(table)
+        return content
+    
+    def _cell(self, row, name):
+        y = TABLE_TOP + (row - self.first_row[self.tab]) * ROW_HEIGHT
+        key = f"cell:{self.tab}:{name}"
+        visible = TABLE_TOP <= y and y + ROW_HEIGHT <= TABLE_BOTTOM
+        label = f"{name}, {self._subtitle(name)}"
+        title = UiElement('XCUIElementTypeStaticText', f"{key}:title", name=name, label=name,
+                          rect=(72, y + 8, 280, 22), visible=visible)
+        return UiElement('XCUIElementTypeCell', key, label=label, rect=(0, y, SCREEN_WIDTH, 60),
+                         visible=visible, children=[title])
+    
+    def _subtitle(self, name):
+        if self.tab == 'People':
+            return 'Sharing location, Now'
+        if self.tab == 'Items':
+            return 'With You'
+        return 'This iPhone' if name.endswith('iPhone') else 'Home, Now'
+    
+    def _tab_bar(self):
+        buttons = [
+            UiElement('XCUIElementTypeButton', f"tab:{tab}", name=tab, label=tab,
+                      rect=(index * 97, TABLE_BOTTOM, 97, 83), selected=tab == self.tab)
+            for index, tab in enumerate(TABS)
+        ]
+        return UiElement('XCUIElementTypeTabBar', 'tabbar', name='Tab Bar', rect=(0, TABLE_BOTTOM, SCREEN_WIDTH, 83),
+                         children=buttons)
+    
+    def _detail_card(self):
+        kind, name = self.detail
+        key = f"detail:{kind}:{name}"
+        children = []
+        if self._ready('detail'):
+            children.append(UiElement('XCUIElementTypeMap', f"{key}:map", rect=(0, 0, SCREEN_WIDTH, 420)))
+        children.append(UiElement('XCUIElementTypeStaticText', f"{key}:name", name='PrimaryLabel', label=name,
+                                  rect=(16, 440, 300, 30)))
+        children.append(UiElement('XCUIElementTypeButton', f"{key}:close", name='Close', label='Close',
+                                  rect=(334, 440, 40, 40)))
+        if kind == 'People':
+            buttons = ['Contact,Info', 'Directions, ']
+        else:
+            sound = 'Play Sound,On' if self.sound_playing else 'Play Sound,Off'
+            buttons = [sound, 'Directions,', 'Lost Mode, Enable additional protection, Off']
+        for index, label in enumerate(buttons):
+            children.append(UiElement('XCUIElementTypeButton', f"{key}:button:{index}", name=label, label=label,
+                                      rect=(16, 500 + index * 64, 358, 56)))
+        return UiElement('XCUIElementTypeOther', key, name='Card', rect=(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),
+                         children=children)
+    
+    # Interaction
+    
+    def tap(self, element):
+        """Apply a tap on an element of the current tree; False if inert"""
+        with self.lock:
+            key = element.key
+            if key.startswith('tab:'):
+                if self.tab != element.name:
+                    self.tab = element.name
+                    self._delay('tab')
+            elif key.startswith('cell:') and key.count(':') == 2:
+                _, tab, name = key.split(':', 2)
+                self.detail = (tab, name)
+                self.sound_playing = False
+                self._delay('detail')
+            elif key.endswith(':close'):
+                self.detail = None
+            elif element.type == 'XCUIElementTypeButton' and self.detail is not None:
+                action = element.name.split(',')[0]
+                if action == 'Play Sound':
+                    self.sound_playing = True
+                self.events.append((action, self.detail[1]))
+            else:
+                return False
+            return True
+    
+    def scroll(self, direction):
+        """Scroll the current list one page up or down; False at either end"""
+        with self.lock:
+            if self.detail is not None or self.tab not in self.lists or direction not in ('up', 'down'):
+                return False
+            step = VISIBLE_ROWS - 1 if direction == 'down' else 1 - VISIBLE_ROWS
+            last_first = max(0, len(self.lists[self.tab]) - VISIBLE_ROWS)
+            first = min(max(0, self.first_row[self.tab] + step), last_first)
+            moved = first != self.first_row[self.tab]
+            self.first_row[self.tab] = first
+            self.scrolls += 1
+            return moved
+    
+    def scroll_to(self, element):
+        """Scroll the current list until a materialised cell is fully visible"""
+        with self.lock:
+            parts = element.key.split(':')
+            if len(parts) != 3 or parts[0] != 'cell' or parts[1] != self.tab:
+                return False
+            row = self.lists[self.tab].index(parts[2])
+            first = self.first_row[self.tab]
+            if row < first:
+                self.first_row[self.tab] = row
+            elif row >= first + VISIBLE_ROWS:
+                self.first_row[self.tab] = row - VISIBLE_ROWS + 1
+            self.scrolls += 1
+            return True
+    
+    def tap_at(self, x, y):
+        """Tap the front-most element at a point, bubbling up to its ancestors"""
+        with self.lock:
+            hit_path = []
+            
+            def visit(element, path):
+                nonlocal hit_path
+                ex, ey, width, height = element.rect
+                if element.visible and ex <= x < ex + width and ey <= y < ey + height:
+                    hit_path = path + [element]
+                for child in element.children:
+                    visit(child, path + [element])
+            
+            visit(self.tree(), [])
+            for element in reversed(hit_path):
+                if self.tap(element):
+                    return element
+            return None
+    
+    def _delay(self, phase):
+        self._ready_at[phase] = time.monotonic() + self.delays.get(phase, 0)
+    
+    def _ready(self, phase):
+        return time.monotonic() >= self._ready_at.get(phase, 0)
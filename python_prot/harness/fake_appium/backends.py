@@ -0,0 +1,405 @@
+"""
+Backends for the stand-in Appium server: simulate, proxy, record, replay
+"""
+
+import base64
+import gzip
+import http.client
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+from . import queries
+from .app import FindMyApp, NOT_RUNNING, SCREEN_HEIGHT, SCREEN_WIDTH
+from .cassette import Cassette, canonical_body
+from .screenshot import render_png
+
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# W3C error code -> HTTP status
+_ERROR_STATUS = {
+    'invalid session id': 404,
+    'no such element': 404,
+    'stale element reference': 404,
+    'unknown command': 404,
+    'invalid selector': 400,
+    'invalid argument': 400,
+    'unsupported operation': 500,
+}
+
+
+class WebDriverError(Exception):
+    """W3C error returned to the client"""
+    
+    def __init__(self, error, message):
+        super().__init__(message)
+        self.error = error
+        self.status = _ERROR_STATUS.get(error, 500)
+    
+    def response(self):
+        return self.status, {'value': {'error': self.error, 'message': str(self), 'stacktrace': ''}}
+
+
+def element_reference(element):
+    return {ELEMENT_KEY: element.element_id, 'ELEMENT': element.element_id}
+
+
+class SimulatorBackend:
+    """Serves W3C commands against a simulated FindMy app"""
+    
+    def __init__(self, app=None):
+        self.app = app or FindMyApp()
+        self.sessions = {}
+        self.commands = defaultdict(int)
+        self._lock = threading.Lock()
+    
+    def handle(self, command, method, path, params, body):
+        handler = getattr(self, f"cmd_{command}", None) if command else None
+        try:
+            if handler is None:
+                raise WebDriverError('unknown command', f"{method} {path} is not supported by the simulator")
+            with self._lock:
+                self.commands[command] += 1
+            session = None
+            if 'session_id' in params:
+                session = self.sessions.get(params['session_id'])
+                if session is None:
+                    raise WebDriverError('invalid session id', f"Session {params['session_id']} does not exist")
+            return 200, {'value': handler(session, params, body or {})}
+        except WebDriverError as error:
+            return error.response()
+    
+    # Sessions
+    
+    def cmd_getStatus(self, session, params, body):
+        return {'ready': True, 'message': 'Stand-in Appium server', 'build': {'version': 'fake'}}
+    
+    def cmd_newSession(self, session, params, body):
+        capabilities = dict(body.get('capabilities', {}).get('alwaysMatch', {}))
+        first_match = body.get('capabilities', {}).get('firstMatch') or [{}]
+        capabilities.update(first_match[0])
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = {'capabilities': capabilities, 'implicit': 0}
+        if capabilities.get('appium:bundleId', self.app.bundle_id) == self.app.bundle_id:
+            self.app.activate()
+        return {'sessionId': session_id, 'capabilities': capabilities}
+    
+    def cmd_deleteSession(self, session, params, body):
+        self.sessions.pop(params['session_id'], None)
+        return None
+    
+    def cmd_getTimeouts(self, session, params, body):
+        return {'implicit': session['implicit'], 'pageLoad': 300000, 'script': 30000}
+    
+    def cmd_setTimeouts(self, session, params, body):
+        if 'implicit' in body:
+            session['implicit'] = body['implicit']
+        return None
+    
+    # Elements
+    
+    def _find(self, session, params, body):
+        root = self._element(params) if 'element_id' in params else self.app.tree()
+        deadline = time.monotonic() + session['implicit'] / 1000.0
+        while True:
+            try:
+                found = queries.find(root, body.get('using'), body.get('value'))
+            except queries.InvalidSelector as exc:
+                raise WebDriverError('invalid selector', str(exc))
+            if found or time.monotonic() >= deadline:
+                return found
+            time.sleep(0.05)
+            if 'element_id' not in params:
+                root = self.app.tree()
+    
+    def cmd_findElement(self, session, params, body):
+        found = self._find(session, params, body)
+        if not found:
+            raise WebDriverError('no such element', f"No element matches {body.get('using')}={body.get('value')!r}")
+        return element_reference(found[0])
+    
+    def cmd_findElements(self, session, params, body):
+        return [element_reference(element) for element in self._find(session, params, body)]
+    
+    cmd_findChildElement = cmd_findElement
+    cmd_findChildElements = cmd_findElements
+    
+    def _element(self, params):
+        element_id = params['element_id']
+        for element in self.app.tree().iter():
+            if element.element_id == element_id:
+                return element
+        raise WebDriverError('stale element reference', f"Element {element_id} is no longer attached to the tree")
+    
+    def cmd_click(self, session, params, body):
+        self.app.tap(self._element(params))
+        return None
+    
+    def cmd_getAttribute(self, session, params, body):
+        return self._element(params).attribute(params['name'])
+    
+    def cmd_getText(self, session, params, body):
+        element = self._element(params)
+        return element.value if element.value is not None else (element.label or '')
+    
+    def cmd_getName(self, session, params, body):
+        return self._element(params).type
+    
+    def cmd_isDisplayed(self, session, params, body):
+        return self._element(params).visible
+    
+    def cmd_isEnabled(self, session, params, body):
+        return self._element(params).enabled
+    
+    def cmd_isSelected(self, session, params, body):
+        return self._element(params).selected
+    
+    def cmd_getRect(self, session, params, body):
+        return self._element(params).rect_dict()
+    
+    # Screen
+    
+    def cmd_getPageSource(self, session, params, body):
+        return self.app.page_source()
+    
+    def cmd_getScreenshot(self, session, params, body):
+        png = render_png(self.app.tree(), SCREEN_WIDTH, SCREEN_HEIGHT)
+        return base64.b64encode(png).decode('ascii')
+    
+    def cmd_getWindowRect(self, session, params, body):
+        return {'x': 0, 'y': 0, 'width': SCREEN_WIDTH, 'height': SCREEN_HEIGHT}
+    
+    # Gestures
+    
+    def cmd_performActions(self, session, params, body):
+        for source in body.get('actions', []):
+            if source.get('type') != 'pointer':
+                continue
+            x = y = 0
+            down = None
+            for action in source.get('actions', []):
+                kind = action.get('type')
+                if kind == 'pointerMove':
+                    x, y = self._pointer_target(action)
+                elif kind == 'pointerDown':
+                    down = (x, y)
+                elif kind == 'pause' and action.get('duration'):
+                    time.sleep(action['duration'] / 1000.0)
+                elif kind == 'pointerUp' and down is not None:
+                    self._release(down, (x, y))
+                    down = None
+        return None
+    
+    def cmd_releaseActions(self, session, params, body):
+        return None
+    
+    def _pointer_target(self, action):
+        origin = action.get('origin', 'viewport')
+        x, y = action.get('x', 0), action.get('y', 0)
+        if isinstance(origin, dict):
+            element = self._element({'element_id': origin.get(ELEMENT_KEY) or origin.get('ELEMENT')})
+            ex, ey, width, height = element.rect
+            return ex + width / 2 + x, ey + height / 2 + y
+        return x, y
+    
+    def _release(self, start, end):
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        if abs(dx) < 10 and abs(dy) < 10:
+            self.app.tap_at(*end)
+        elif abs(dy) >= 50 and abs(dy) > 2 * abs(dx):
+            # Vertical swipe: the finger moving up scrolls the list down
+            self.app.scroll('down' if dy < 0 else 'up')
+    
+    # Mobile extensions
+    
+    def cmd_execute(self, session, params, body):
+        script = body.get('script', '')
+        args = body.get('args') or [{}]
+        options = args[0] if args and isinstance(args[0], dict) else {}
+        handler = getattr(self, 'mobile_' + script.replace('mobile:', '').strip(), None)
+        if handler is None:
+            raise WebDriverError('unknown command', f"Unsupported script: {script}")
+        return handler(options)
+    
+    def _own_bundle(self, options):
+        bundle_id = options.get('bundleId') or options.get('appId')
+        return bundle_id in (None, self.app.bundle_id)
+    
+    def mobile_activateApp(self, options):
+        if self._own_bundle(options):
+            self.app.activate()
+        else:
+            self.app.background()
+        return None
+    
+    def mobile_terminateApp(self, options):
+        return self.app.terminate() if self._own_bundle(options) else False
+    
+    def mobile_queryAppState(self, options):
+        return self.app.state if self._own_bundle(options) else NOT_RUNNING
+    
+    def mobile_backgroundApp(self, options):
+        self.app.background()
+        seconds = options.get('seconds', -1)
+        if seconds is not None and seconds >= 0:
+            time.sleep(seconds)
+            self.app.activate()
+        return None
+    
+    def mobile_scroll(self, options):
+        if options.get('toVisible') and options.get('elementId'):
+            self.app.scroll_to(self._element({'element_id': options['elementId']}))
+        elif options.get('direction'):
+            self.app.scroll(options['direction'])
+        else:
+            raise WebDriverError('invalid argument', "mobile: scroll needs a direction or toVisible")
+        return None
+    
+    def mobile_swipe(self, options):
+        # Swiping up moves the content up, i.e. scrolls down
+        opposite = {'up': 'down', 'down': 'up'}
+        self.app.scroll(opposite.get(options.get('direction'), ''))
+        return None
+    
+    def mobile_listApps(self, options):
+        info = {'CFBundleIdentifier': self.app.bundle_id, 'CFBundleShortVersionString': self.app.version,
+                'CFBundleVersion': self.app.version, 'CFBundleName': 'Find My'}
+        return {self.app.bundle_id: info} if options.get('applicationType') == 'System' else {}
+    
+    def mobile_deviceInfo(self, options):
+        return {'model': 'iPhone', 'name': 'Stand-in iPhone', 'platformVersion': '17.0'}
+
+
+class ProxyBackend:
+    """Forwards every request to a real Appium server"""
+    
+    def __init__(self, upstream_url, timeout=600):
+        parts = urlsplit(upstream_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.base_path = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+    
+    def handle(self, command, method, path, params, body):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json;charset=UTF-8', 'Accept': 'application/json',
+                   'Accept-Encoding': 'gzip'}
+        try:
+            connection.request(method, self.base_path + path, body=data, headers=headers)
+            response = connection.getresponse()
+            raw = response.read()
+            if response.getheader('Content-Encoding') == 'gzip':
+                raw = gzip.decompress(raw)
+        except (OSError, http.client.HTTPException):
+            self._local.connection = None
+            connection.close()
+            raise
+        return response.status, json.loads(raw) if raw else {'value': None}
+
+
+class Recorder:
+    """Wraps a backend and records every interaction into a cassette"""
+    
+    def __init__(self, backend, cassette=None):
+        self.backend = backend
+        self.cassette = cassette if cassette is not None else Cassette()
+        self._placeholders = {}
+        self._lock = threading.Lock()
+    
+    def handle(self, command, method, path, params, body):
+        started = time.perf_counter()
+        status, payload = self.backend.handle(command, method, path, params, body)
+        duration_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            if command == 'newSession' and status == 200:
+                session_id = _session_id(payload)
+                if session_id:
+                    self._placeholders[session_id] = f"{{s{len(self._placeholders) + 1}}}"
+            self.cassette.add(
+                method,
+                _replace_ids(path, self._placeholders),
+                body,
+                status,
+                json.loads(_replace_ids(json.dumps(payload), self._placeholders)),
+                duration_ms,
+            )
+        return status, payload
+
+
+class ReplayBackend:
+    """Plays a cassette back deterministically
+    
+    Requests are matched on (method, path, body) with session ids mapped
+    to the cassette's placeholders. Matching responses are served in
+    recorded order; once a key's recordings are used up its last response
+    is repeated, so polling loops that run a few extra times still replay.
+    """
+    
+    def __init__(self, cassette, use_recorded_timing=False):
+        self.use_recorded_timing = use_recorded_timing
+        self.misses = []
+        self._queues = defaultdict(deque)
+        self._last = {}
+        self._sessions = deque()
+        self._placeholders = {}
+        self._lock = threading.Lock()
+        for interaction in cassette.interactions:
+            if interaction['m'] == 'POST' and interaction['p'] == '/session':
+                self._sessions.append(interaction)
+            else:
+                key = (interaction['m'], interaction['p'], canonical_body(interaction['b']))
+                self._queues[key].append(interaction)
+    
+    def handle(self, command, method, path, params, body):
+        with self._lock:
+            if command == 'newSession':
+                interaction = self._sessions.popleft() if self._sessions else None
+                if interaction is None:
+                    return self._miss(method, path)
+                placeholder = _session_id(interaction['r'])
+                session_id = uuid.uuid4().hex
+                self._placeholders[session_id] = placeholder
+                payload = json.loads(json.dumps(interaction['r']).replace(placeholder, session_id))
+                return self._serve(interaction, payload)
+            
+            key = (method, _replace_ids(path, self._placeholders), canonical_body(body))
+            queue = self._queues.get(key)
+            if queue:
+                interaction = queue.popleft()
+                self._last[key] = interaction
+            else:
+                interaction = self._last.get(key)
+            if interaction is None:
+                return self._miss(method, path)
+            return self._serve(interaction, interaction['r'])
+    
+    def _serve(self, interaction, payload):
+        if self.use_recorded_timing:
+            time.sleep(interaction.get('t', 0) / 1000.0)
+        return interaction['s'], payload
+    
+    def _miss(self, method, path):
+        self.misses.append((method, path))
+        return WebDriverError('unknown command', f"Cassette has no recording for {method} {path}").response()
+
+
+def _session_id(payload):
+    value = payload.get('value') if isinstance(payload, dict) else None
+    if isinstance(value, dict) and value.get('sessionId'):
+        return value['sessionId']
+    return payload.get('sessionId') if isinstance(payload, dict) else None
+
+
+def _replace_ids(text, mapping):
+    for session_id, placeholder in mapping.items():
+        text = text.replace(session_id, placeholder)
+    return text
@@ -0,0 +1,75 @@
+"""
+Compact cassette format for recorded Appium sessions
+
+A cassette is a JSON-lines file (gzip-compressed when the name ends in
+.gz). Each line is one of:
+    
+    {"blob": "<sha1>", "v": <payload>}          large response, stored once
+    {"m": "GET", "p": "/session/{s1}/source", "b": null,
+     "s": 200, "r": {"$blob": "<sha1>"}, "t": 41.7}
+
+Session ids are replaced by placeholders ({s1}, {s2}, ...) in the order
+the sessions were created, so a cassette replays against new sessions.
+"""
+
+import gzip
+import hashlib
+import json
+
+
+# Responses larger than this are stored once and referenced by hash
+BLOB_THRESHOLD = 1024
+
+
+class Cassette:
+    """Ordered list of recorded HTTP interactions"""
+    
+    def __init__(self, interactions=None):
+        self.interactions = list(interactions or [])
+    
+    def add(self, method, path, body, status, response, duration_ms):
+        self.interactions.append({
+            'm': method, 'p': path, 'b': body, 's': status, 'r': response, 't': round(duration_ms, 1),
+        })
+    
+    def save(self, path):
+        blobs = set()
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as output:
+            for interaction in self.interactions:
+                line = dict(interaction)
+                encoded = json.dumps(line['r'], separators=(',', ':'), sort_keys=True)
+                if len(encoded) > BLOB_THRESHOLD:
+                    digest = hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+                    if digest not in blobs:
+                        blobs.add(digest)
+                        output.write(json.dumps({'blob': digest, 'v': line['r']}, separators=(',', ':')) + '\n')
+                    line['r'] = {'$blob': digest}
+                output.write(json.dumps(line, separators=(',', ':')) + '\n')
+    
+    @classmethod
+    def load(cls, path):
+        blobs = {}
+        interactions = []
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as source:
+            for line in source:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if 'blob' in entry:
+                    blobs[entry['blob']] = entry['v']
+                    continue
+                response = entry['r']
+                if isinstance(response, dict) and set(response) == {'$blob'}:
+                    entry['r'] = blobs[response['$blob']]
+                interactions.append(entry)
+        return cls(interactions)
+    
+    def __len__(self):
+        return len(self.interactions)
+
+
+def canonical_body(body):
+    """Stable string form of a request body, used as part of the replay key"""
+    return json.dumps(body, separators=(',', ':'), sort_keys=True) if body is not None else ''
@@ -0,0 +1,48 @@
+"""
+Latency model for the stand-in Appium server
+"""
+
+import random
+import threading
+
+
+class LatencyModel:
+    """Delay injected before each response, in seconds
+    
+    delay = base + per_command[command] + uniform(-jitter, +jitter)
+            + drift * commands served so far
+            + spike on every spike_every-th command
+    
+    A fixed seed makes the jitter sequence reproducible; a positive drift
+    simulates a device that slows down over a long run, and spikes the
+    occasional stall of a busy WebDriverAgent. bandwidth (bytes per
+    second) adds the time a response body spends on a slow link.
+    """
+    
+    def __init__(self, base=0.0, jitter=0.0, per_command=None, seed=0, drift=0.0, bandwidth=None,
+                 spike=0.0, spike_every=0):
+        self.base = base
+        self.bandwidth = bandwidth
+        self.jitter = jitter
+        self.per_command = dict(per_command or {})
+        self.drift = drift
+        self.spike = spike
+        self.spike_every = spike_every
+        self.served = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def delay(self, command):
+        """Seconds to wait before answering the given command"""
+        with self._lock:
+            self.served += 1
+            noise = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+            served = self.served
+        delay = self.base + self.per_command.get(command, 0.0) + noise + self.drift * served
+        if self.spike_every and served % self.spike_every == 0:
+            delay += self.spike
+        return max(delay, 0.0)
+    
+    def transfer(self, size):
+        """Seconds to send size bytes over the simulated link"""
+        return size / self.bandwidth if self.bandwidth else 0.0
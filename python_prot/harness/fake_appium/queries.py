@@ -0,0 +1,344 @@
+"""
+Locator evaluation for the simulated UI tree
+
+Implements the subset of XCUITest locator strategies the page objects use:
+accessibility id, class name, XPath (ElementTree subset), -ios class chain
+and -ios predicate string.
+"""
+
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+
+
+class InvalidSelector(Exception):
+    """Raised for locators the simulator cannot parse"""
+
+
+# Predicate attribute aliases (WDA accepts both forms)
+_ALIASES = {
+    'elementtype': 'type', 'identifier': 'name', 'isenabled': 'enabled',
+    'isvisible': 'visible', 'isselected': 'selected', 'placeholdervalue': 'placeholderValue',
+}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<op>==|!=|<>|>=|<=|&&|\|\||[=<>!(){},])
+      | (?P<modifier>\[[cdCD]{1,2}\])
+      | (?P<word>[A-Za-z_][\w.]*)
+    )""", re.VERBOSE)
+
+_KEYWORD_OPS = ('CONTAINS', 'BEGINSWITH', 'ENDSWITH', 'LIKE', 'MATCHES', 'IN')
+
+
+def find(root, using, value):
+    """Return matching elements of the tree rooted at root, in document order"""
+    if using in ('accessibility id', 'id', 'name'):
+        return [element for element in root.iter() if element.name == value]
+    if using == 'class name':
+        return [element for element in root.iter() if element.type == value]
+    if using == '-ios predicate string':
+        predicate = parse_predicate(value)
+        return [element for element in root.iter() if predicate(element)]
+    if using == '-ios class chain':
+        return find_class_chain(root, value)
+    if using == 'xpath':
+        return find_xpath(root, value)
+    raise InvalidSelector(f"Unsupported locator strategy: {using}")
+
+
+def find_xpath(root, xpath):
+    """Evaluate XPath with ElementTree's subset against the element tree"""
+    document = ET.Element('AppiumAUT')
+    mapping = {}
+    
+    def build(parent_xml, element):
+        node = ET.SubElement(parent_xml, element.type, element.xml_attributes())
+        mapping[node] = element
+        for child in element.children:
+            build(node, child)
+    
+    build(document, root)
+    path = xpath if xpath.startswith('.') else '.' + xpath
+    try:
+        return [mapping[node] for node in document.findall(path)]
+    except (SyntaxError, KeyError) as exc:
+        raise InvalidSelector(f"Unsupported XPath: {xpath}") from exc
+
+
+def find_class_chain(root, chain):
+    """Evaluate a -ios class chain query
+    
+    The chain starts below the application. An index after a **/ step
+    selects from every match below the context; after a / step it selects
+    among each context's direct children, like WDA.
+    """
+    contexts = [root]
+    descendant = False
+    for part in _split_chain(chain):
+        if part == '**':
+            descendant = True
+            continue
+        match = re.match(r"^(XCUIElementType\w+|\*)(.*)$", part)
+        if match is None:
+            raise InvalidSelector(f"Bad class chain step: {part}")
+        element_type, filters = match.groups()
+        filters = _parse_chain_filters(filters)
+        
+        def type_matches(element):
+            return element_type == '*' or element.type == element_type
+        
+        if descendant:
+            seen = set()
+            candidates = []
+            for context in contexts:
+                for element in context.iter():
+                    if element is not context and id(element) not in seen and type_matches(element):
+                        seen.add(id(element))
+                        candidates.append(element)
+            contexts = _apply_filters(candidates, filters)
+        else:
+            contexts = [
+                element
+                for context in contexts
+                for element in _apply_filters([c for c in context.children if type_matches(c)], filters)
+            ]
+        descendant = False
+    if descendant:
+        raise InvalidSelector(f"Class chain cannot end with **: {chain}")
+    return contexts
+
+
+def _split_chain(chain):
+    parts, current, in_predicate = [], '', False
+    for char in chain:
+        if char == '`':
+            in_predicate = not in_predicate
+        if char == '/' and not in_predicate:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    parts.append(current)
+    if not all(parts):
+        raise InvalidSelector(f"Bad class chain: {chain}")
+    return parts
+
+
+def _parse_chain_filters(text):
+    filters = []
+    for match in re.finditer(r"\[(?:`((?:[^`])*)`|(-?\d+))\]", text):
+        if match.group(1) is not None:
+            filters.append(('predicate', parse_predicate(match.group(1))))
+        else:
+            filters.append(('index', int(match.group(2))))
+    if re.sub(r"\[(?:`(?:[^`])*`|-?\d+)\]", '', text):
+        raise InvalidSelector(f"Bad class chain filter: {text}")
+    return filters
+
+
+def _apply_filters(elements, filters):
+    for kind, value in filters:
+        if kind == 'predicate':
+            elements = [element for element in elements if value(element)]
+        else:
+            position = value - 1 if value > 0 else len(elements) + value
+            elements = [elements[position]] if 0 <= position < len(elements) else []
+    return elements
+
+
+def parse_predicate(text):
+    """Compile an NSPredicate subset into a callable(element) -> bool"""
+    tokens = _tokenize(text)
+    parser = _PredicateParser(tokens, text)
+    predicate = parser.parse_or()
+    if parser.position != len(tokens):
+        raise InvalidSelector(f"Unexpected token in predicate: {text}")
+    return predicate
+
+
+def _tokenize(text):
+    tokens, position = [], 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise InvalidSelector(f"Cannot parse predicate: {text}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _PredicateParser:
+    """Recursive-descent parser for NSPredicate expressions"""
+    
+    def __init__(self, tokens, text):
+        self.tokens = tokens
+        self.text = text
+        self.position = 0
+    
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+    
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+    
+    def is_word(self, *words):
+        kind, value = self.peek()
+        return kind == 'word' and value.upper() in words
+    
+    def is_op(self, *ops):
+        kind, value = self.peek()
+        return kind == 'op' and value in ops
+    
+    def parse_or(self):
+        left = self.parse_and()
+        while self.is_word('OR') or self.is_op('||'):
+            self.take()
+            right = self.parse_and()
+            left = (lambda a, b: lambda e: a(e) or b(e))(left, right)
+        return left
+    
+    def parse_and(self):
+        left = self.parse_not()
+        while self.is_word('AND') or self.is_op('&&'):
+            self.take()
+            right = self.parse_not()
+            left = (lambda a, b: lambda e: a(e) and b(e))(left, right)
+        return left
+    
+    def parse_not(self):
+        if self.is_word('NOT') or self.is_op('!'):
+            self.take()
+            inner = self.parse_not()
+            return lambda e: not inner(e)
+        if self.is_op('('):
+            self.take()
+            inner = self.parse_or()
+            if not self.is_op(')'):
+                raise InvalidSelector(f"Missing ')' in predicate: {self.text}")
+            self.take()
+            return inner
+        if self.is_word('TRUEPREDICATE'):
+            self.take()
+            return lambda e: True
+        if self.is_word('FALSEPREDICATE'):
+            self.take()
+            return lambda e: False
+        return self.parse_comparison()
+    
+    def parse_operand(self):
+        kind, value = self.take()
+        if kind == 'string':
+            return ('literal', _unquote(value))
+        if kind == 'number':
+            return ('literal', float(value) if '.' in value else int(value))
+        if kind == 'word':
+            upper = value.upper()
+            if upper in ('TRUE', 'YES'):
+                return ('literal', True)
+            if upper in ('FALSE', 'NO'):
+                return ('literal', False)
+            if upper in ('NIL', 'NULL'):
+                return ('literal', None)
+            return ('attribute', value)
+        if kind == 'op' and value == '{':
+            items = []
+            while not self.is_op('}'):
+                items.append(self.parse_operand()[1])
+                if self.is_op(','):
+                    self.take()
+            self.take()
+            return ('literal', items)
+        raise InvalidSelector(f"Bad operand in predicate: {self.text}")
+    
+    def parse_comparison(self):
+        left = self.parse_operand()
+        kind, value = self.take()
+        if kind == 'op' and value in ('==', '=', '!=', '<>', '<', '>', '<=', '>='):
+            operator = value
+        elif kind == 'word' and value.upper() in _KEYWORD_OPS:
+            operator = value.upper()
+        else:
+            raise InvalidSelector(f"Missing operator in predicate: {self.text}")
+        flags = ''
+        if self.peek()[0] == 'modifier':
+            flags = self.take()[1][1:-1].lower()
+        right = self.parse_operand()
+        return _comparison(left, operator, flags, right)
+
+
+def _unquote(token):
+    body = token[1:-1]
+    return re.sub(r"\\(.)", r"\1", body)
+
+
+def _resolve(operand, element):
+    kind, value = operand
+    if kind == 'literal':
+        return value
+    name = value[2].lower() + value[3:] if value.startswith('wd') and len(value) > 2 else value
+    name = _ALIASES.get(name.lower(), name)
+    return element.predicate_value(name)
+
+
+def _fold(value, flags):
+    if not isinstance(value, str):
+        return value
+    if 'd' in flags:
+        value = ''.join(c for c in unicodedata.normalize('NFD', value) if not unicodedata.combining(c))
+    if 'c' in flags:
+        value = value.lower()
+    return value
+
+
+def _coerce(left, right):
+    # Booleans compare equal to 1/0 and "true"/"false", like NSNumber
+    if isinstance(left, bool) and not isinstance(right, bool):
+        left = int(left) if isinstance(right, (int, float)) else str(left).lower()
+    if isinstance(right, bool) and not isinstance(left, bool):
+        right = int(right) if isinstance(left, (int, float)) else str(right).lower()
+    return left, right
+
+
+def _comparison(left_operand, operator, flags, right_operand):
+    def evaluate(element):
+        left = _resolve(left_operand, element)
+        right = _resolve(right_operand, element)
+        if operator == 'IN':
+            options = right if isinstance(right, list) else [right]
+            return _fold(left, flags) in [_fold(option, flags) for option in options]
+        left, right = _coerce(_fold(left, flags), _fold(right, flags))
+        if operator in ('==', '='):
+            return left == right
+        if operator in ('!=', '<>'):
+            return left != right
+        if operator in ('<', '>', '<=', '>='):
+            try:
+                return {'<': left < right, '>': left > right, '<=': left <= right, '>=': left >= right}[operator]
+            except TypeError:
+                return False
+        if not isinstance(left, str) or not isinstance(right, str):
+            return False
+        if operator == 'CONTAINS':
+            return right in left
+        if operator == 'BEGINSWITH':
+            return left.startswith(right)
+        if operator == 'ENDSWITH':
+            return left.endswith(right)
+        if operator == 'LIKE':
+            pattern = ''.join('.*' if c == '*' else '.' if c == '?' else re.escape(c) for c in right)
+            return re.fullmatch(pattern, left, re.S) is not None
+        if operator == 'MATCHES':
+            try:
+                return re.fullmatch(right, left, re.S | (re.I if 'c' in flags else 0)) is not None
+            except re.error as exc:
+                raise InvalidSelector(f"Bad MATCHES pattern: {right}") from exc
+        return False
+    
+    return evaluate
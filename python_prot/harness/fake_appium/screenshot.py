@@ -0,0 +1,60 @@
+"""
+Minimal PNG renderer for simulated screens
+"""
+
+import hashlib
+import struct
+import zlib
+
+
+# Fill colours per element type (RGB)
+_COLOURS = {
+    'XCUIElementTypeWindow': (242, 242, 247),
+    'XCUIElementTypeOther': (255, 255, 255),
+    'XCUIElementTypeMap': (170, 211, 160),
+    'XCUIElementTypeTable': (255, 255, 255),
+    'XCUIElementTypeCell': (236, 236, 240),
+    'XCUIElementTypeTabBar': (248, 248, 248),
+    'XCUIElementTypeButton': (0, 122, 255),
+    'XCUIElementTypeStaticText': (60, 60, 67),
+}
+
+
+def render_png(root, width, height):
+    """Paint every visible element's frame and return PNG bytes
+    
+    Text is drawn as a bar whose shade depends on the label, so screens
+    with different content produce different images.
+    """
+    rows = [bytearray(b'\xff' * (width * 3)) for _ in range(height)]
+    for element in root.iter():
+        colour = _COLOURS.get(element.type)
+        if colour is None or not element.visible:
+            continue
+        if element.type == 'XCUIElementTypeStaticText' and element.label:
+            shade = hashlib.md5(element.label.encode('utf-8')).digest()[0] // 2
+            colour = (shade, shade, shade + 60)
+        _fill(rows, width, height, element.rect, bytes(colour))
+    return encode_png(rows, width, height)
+
+
+def _fill(rows, width, height, rect, colour):
+    x, y, w, h = (int(v) for v in rect)
+    left, right = max(x, 0), min(x + w, width)
+    top, bottom = max(y, 0), min(y + h, height)
+    if left >= right or top >= bottom:
+        return
+    span = colour * (right - left)
+    for row in rows[top:bottom]:
+        row[left * 3:right * 3] = span
+
+
+def encode_png(rows, width, height):
+    """Encode 8-bit RGB rows as a PNG"""
+    raw = b''.join(b'\x00' + bytes(row) for row in rows)
+    
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+    
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b'')
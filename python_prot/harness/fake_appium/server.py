@@ -0,0 +1,159 @@
+"""
+HTTP front end of the stand-in Appium server
+"""
+
+import gzip
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .latency import LatencyModel
+
+
+_SESSION = r'/session/(?P<session_id>[^/]+)'
+_ELEMENT = _SESSION + r'/element/(?P<element_id>[^/]+)'
+
+# (HTTP method, path pattern, command name) for the W3C/Appium endpoints served
+ROUTES = [
+    ('GET', r'/status', 'getStatus'),
+    ('POST', r'/session', 'newSession'),
+    ('DELETE', _SESSION, 'deleteSession'),
+    ('GET', _SESSION + r'/timeouts', 'getTimeouts'),
+    ('POST', _SESSION + r'/timeouts', 'setTimeouts'),
+    ('POST', _SESSION + r'/element', 'findElement'),
+    ('POST', _SESSION + r'/elements', 'findElements'),
+    ('POST', _ELEMENT + r'/element', 'findChildElement'),
+    ('POST', _ELEMENT + r'/elements', 'findChildElements'),
+    ('POST', _ELEMENT + r'/click', 'click'),
+    ('GET', _ELEMENT + r'/attribute/(?P<name>[^/]+)', 'getAttribute'),
+    ('GET', _ELEMENT + r'/text', 'getText'),
+    ('GET', _ELEMENT + r'/name', 'getName'),
+    ('GET', _ELEMENT + r'/displayed', 'isDisplayed'),
+    ('GET', _ELEMENT + r'/enabled', 'isEnabled'),
+    ('GET', _ELEMENT + r'/selected', 'isSelected'),
+    ('GET', _ELEMENT + r'/rect', 'getRect'),
+    ('GET', _SESSION + r'/source', 'getPageSource'),
+    ('GET', _SESSION + r'/screenshot', 'getScreenshot'),
+    ('GET', _SESSION + r'/window/rect', 'getWindowRect'),
+    ('POST', _SESSION + r'/execute/sync', 'execute'),
+    ('POST', _SESSION + r'/actions', 'performActions'),
+    ('DELETE', _SESSION + r'/actions', 'releaseActions'),
+]
+# Responses at least this large are gzipped when the client accepts it
+GZIP_MIN_SIZE = 1024
+
+_COMPILED_ROUTES = [(method, re.compile(pattern + r'/?$'), name) for method, pattern, name in ROUTES]
+
+
+def route(method, path):
+    """Map a request to (command name, path parameters)"""
+    for route_method, pattern, name in _COMPILED_ROUTES:
+        if route_method == method:
+            match = pattern.match(path)
+            if match:
+                return name, match.groupdict()
+    return None, {}
+
+
+class FakeAppiumServer:
+    """Local stand-in for an Appium server
+    
+    The backend decides what is served: SimulatorBackend drives a
+    simulated FindMy app, ReplayBackend plays a cassette back, and
+    Recorder wraps either of those (or a ProxyBackend in front of a real
+    server) to record a cassette. The optional LatencyModel delays every
+    response so timings resemble a real device.
+        
+        with FakeAppiumServer(SimulatorBackend()) as server:
+            driver = webdriver.Remote(server.url, options=build_options())
+    """
+    
+    def __init__(self, backend, host='127.0.0.1', port=0, latency=None):
+        self.backend = backend
+        self.latency = latency or LatencyModel()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake_server = self
+        self._thread = None
+    
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-appium', daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def serve_forever(self):
+        """Serve in the calling thread (used by the command line)"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+    
+    def handle(self, method, path, body):
+        command, params = route(method, path)
+        delay = self.latency.delay(command or 'unknown')
+        if delay:
+            time.sleep(delay)
+        return self.backend.handle(command, method, path, params, body)
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        self._dispatch()
+    
+    def do_POST(self):
+        self._dispatch()
+    
+    def do_DELETE(self):
+        self._dispatch()
+    
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw.strip() else None
+        except ValueError:
+            body = None
+        path = self.path.split('?', 1)[0]
+        if path.startswith('/wd/hub/'):
+            path = path[len('/wd/hub'):]
+        status, payload = self.server.fake_server.handle(self.command, path, body)
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if len(data) >= GZIP_MIN_SIZE and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            data = gzip.compress(data, compresslevel=5)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        delay = self.server.fake_server.latency.transfer(len(data))
+        if delay:
+            time.sleep(delay)
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
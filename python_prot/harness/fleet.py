@@ -0,0 +1,220 @@
+"""
+Fleet actions: run a page-object action on every handset of an inventory
+    
+    python -m harness.fleet --inventory devices.json list-devices
+    python -m harness.fleet --inventory devices.json play-sound --match "Chi's Laptop*" --per-host 2 --rate 1
+    python -m harness.fleet --fake 3 play-sound --match "*iPad*"     # three stand-in servers
+
+Handsets are driven concurrently (--concurrency). At most --per-host
+actions run at a time against one Appium host, and at most --rate actions
+start per second overall. The actions of one handset run one after the
+other on one pooled session. play-sound first lists the handset's devices
+and then plays a sound on each list label matching --match (fnmatch,
+case-insensitive).
+
+Every finished action is written to stdout as one JSON line, e.g.
+    {"handset": "iphone-13", "action": "play-sound", "target": "Chi's Laptop, Home, Now", "ok": true, "seconds": 1.84}
+Progress and the summary go to stderr.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from harness.inventory import device_capabilities, load_inventory, validate_inventory
+from harness.session_pool import SessionPool
+from page_objects import FindMyMainPage
+
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST = 4
+
+
+def list_devices(main_page, target):
+    return {'devices': main_page.tap_devices_tab().get_all_device_names()}
+
+
+def play_sound(main_page, target):
+    detail = main_page.tap_devices_tab().tap_device_by_name(target)
+    detail.tap_play_sound_button()
+    detail.tap_close_button()
+    return {}
+
+
+# name -> action(main page, target) returning extra result fields
+ACTIONS = {
+    'list-devices': list_devices,
+    'play-sound': play_sound,
+}
+
+# Actions that run once per device name matching --match
+TARGETED = {'play-sound'}
+
+
+def host_of(server_url):
+    """Appium host a server URL runs on (several servers may share one Mac)"""
+    return urlparse(server_url).hostname or server_url
+
+
+def _error(exc):
+    lines = str(exc).strip().splitlines()
+    message = lines[0].removeprefix('Message: ') if lines else ''
+    return f"{type(exc).__name__}: {message}" if message else type(exc).__name__
+
+
+class RateLimiter:
+    """Spaces calls to wait() at least 1/rate seconds apart (rate 0 = unlimited)"""
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class FleetRunner:
+    """Runs one action across handsets within concurrency, per-host and rate limits
+    
+    runner = FleetRunner(pool, load_inventory("devices.json"), per_host=2, rate=1)
+    records = runner.run("play-sound", match="Chi's*")
+    """
+    
+    def __init__(self, pool, handsets, concurrency=DEFAULT_CONCURRENCY, per_host=DEFAULT_PER_HOST, rate=0.0,
+                 output=None):
+        self.pool = pool
+        self.handsets = list(handsets)
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate)
+        self.output = output
+        hosts = {host_of(handset['server_url']) for handset in self.handsets}
+        self._host_slots = {host: threading.BoundedSemaphore(per_host) for host in hosts}
+        self.active = dict.fromkeys(hosts, 0)
+        self.peak = dict.fromkeys(hosts, 0)
+        self.records = []
+        self._lock = threading.Lock()
+    
+    def run(self, action, match='*'):
+        """Run action on every handset; returns the records in finishing order"""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action {action!r}; expected one of {', '.join(ACTIONS)}")
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='fleet') as executor:
+            for future in [executor.submit(self._run_handset, handset, action, match) for handset in self.handsets]:
+                future.result()
+        return self.records
+    
+    def _run_handset(self, handset, action, match):
+        if action not in TARGETED:
+            self.act(handset, action)
+            return
+        listing = self.act(handset, 'list-devices')
+        pattern = match.lower()
+        for name in listing.get('devices', []):
+            if fnmatch.fnmatchcase(name.lower(), pattern):
+                self.act(handset, action, name)
+    
+    def act(self, handset, action, target=None):
+        """One action on one handset's pooled session; the record is emitted when it finishes"""
+        host = host_of(handset['server_url'])
+        record = {'handset': handset['name'], 'action': action}
+        if target is not None:
+            record['target'] = target
+        self.limiter.wait()
+        with self._host_slots[host]:
+            with self._lock:
+                self.active[host] += 1
+                self.peak[host] = max(self.peak[host], self.active[host])
+            started = time.monotonic()
+            try:
+                driver = self.pool.acquire(handset['server_url'], **device_capabilities(handset))
+                try:
+                    record.update(ACTIONS[action](FindMyMainPage(driver), target))
+                    record['ok'] = True
+                finally:
+                    self.pool.release(driver)
+            except Exception as exc:
+                record.update(ok=False, error=_error(exc))
+            record['seconds'] = round(time.monotonic() - started, 3)
+            with self._lock:
+                self.active[host] -= 1
+        self._emit(record)
+        return record
+    
+    def _emit(self, record):
+        with self._lock:
+            self.records.append(record)
+            if self.output is not None:
+                self.output.write(json.dumps(record, ensure_ascii=False) + '\n')
+                self.output.flush()
+
+
+def fake_inventory(server_urls):
+    """One inventory entry per stand-in server"""
+    return validate_inventory([
+        {'name': f"fake-{index}", 'udid': f"0000-FAKE-{index}", 'server_url': url,
+         'wda_local_port': 8100 + index, 'updated_wda_bundle_id': 'com.example.WebDriverAgentRunner'}
+        for index, url in enumerate(server_urls, 1)
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harness.fleet', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('action', choices=list(ACTIONS))
+    parser.add_argument('--match', default='*', help='play-sound: device names to act on (fnmatch)')
+    parser.add_argument('--inventory', help='JSON device inventory (see harness/inventory.py)')
+    parser.add_argument('--handsets', default='*', help='inventory names to include (fnmatch)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='handsets driven at once')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST,
+                        help='actions at once against one Appium host')
+    parser.add_argument('--rate', type=float, default=0.0, help='action starts per second (0 = unlimited)')
+    parser.add_argument('--fake', type=int, default=0, metavar='N', help='run against N stand-in servers')
+    parser.add_argument('--fake-latency-ms', type=float, default=0.0)
+    args = parser.parse_args(argv)
+    if not args.inventory and not args.fake:
+        parser.error('--inventory or --fake is required')
+    
+    with contextlib.ExitStack() as stack:
+        if args.fake:
+            from harness.fake_appium import FakeAppiumServer, LatencyModel, SimulatorBackend
+            latency = LatencyModel(base=args.fake_latency_ms / 1000.0)
+            servers = [stack.enter_context(FakeAppiumServer(SimulatorBackend(), latency=latency))
+                       for _ in range(args.fake)]
+            handsets = fake_inventory([server.url for server in servers])
+        else:
+            handsets = load_inventory(args.inventory)
+        handsets = [handset for handset in handsets if fnmatch.fnmatch(handset['name'], args.handsets)]
+        if not handsets:
+            parser.error(f"no handset matches {args.handsets!r}")
+        
+        pool = SessionPool(reset=lambda driver: FindMyMainPage(driver).return_to_main_screen())
+        stack.callback(pool.close_all)
+        runner = FleetRunner(pool, handsets, concurrency=args.concurrency, per_host=args.per_host,
+                             rate=args.rate, output=sys.stdout)
+        print(f"📡 {args.action} on {len(handsets)} handsets", file=sys.stderr)
+        started = time.monotonic()
+        records = runner.run(args.action, match=args.match)
+        elapsed = time.monotonic() - started
+    
+    failed = [record for record in records if not record['ok']]
+    print(f"📡 {len(records)} actions, {len(records) - len(failed)} ok, {len(failed)} failed in {elapsed:.1f} s "
+          f"({pool.created} sessions created, {pool.reused} reused)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
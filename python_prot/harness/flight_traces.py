@@ -0,0 +1,94 @@
+"""
+Trace timelines of failing tests from the in-process flight recorder
+    
+    pytest tests/ --fake-appium                           # failures -> flight_traces/<test>.trace.json
+    pytest tests/ --fake-appium --flight-traces all       # plus the whole buffer at the end of the run
+    pytest tests/ --fake-appium -s --echo-events          # page-object messages on the console again
+
+Each test and its setup/call/teardown phases are recorded as spans around
+the page-method, wait and command spans the page objects already record.
+A failing test's report writes the ring buffer (the failing test and the
+tests before it, up to its capacity) as a Chrome trace-event file; open it
+in https://ui.perfetto.dev or chrome://tracing.
+"""
+
+import os
+import re
+import time
+
+import pytest
+
+from page_objects import flight_recorder
+from page_objects.flight_recorder import TEST, now
+
+
+OFF = 'off'
+FAILURES = 'failures'  # one timeline per failing test
+ALL = 'all'            # failures plus the buffer at the end of the run
+MODES = (OFF, FAILURES, ALL)
+
+DEFAULT_DIRECTORY = 'flight_traces'
+
+
+def trace_filename(nodeid):
+    """'tests/test_device.py::test_play[x]' -> 'tests_test_device.py_test_play_x.trace.json'"""
+    return re.sub(r'[^\w.-]+', '_', nodeid).strip('_') + '.trace.json'
+
+
+class FlightTraces:
+    """pytest plugin: test and phase spans, and trace export on failure"""
+    
+    def __init__(self, directory=DEFAULT_DIRECTORY, mode=FAILURES, recorder=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown flight trace mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.directory = directory
+        self.mode = mode
+        self.recorder = recorder or flight_recorder.recorder
+        self.written = []
+        self._outcome = None
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        started = now()
+        self._outcome = 'passed'
+        yield
+        self.recorder.complete(TEST, item.nodeid, started, {'outcome': self._outcome})
+        if self._outcome == 'failed' and self.mode != OFF:
+            path = os.path.join(self.directory, trace_filename(item.nodeid))
+            self.written.append(self.recorder.export(path, test=item.nodeid))
+    
+    def _phase(self, name):
+        started = now()
+        yield
+        self.recorder.complete(TEST, name, started)
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._phase('setup')
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._phase('call')
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        yield from self._phase('teardown')
+    
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            self._outcome = 'failed'
+        elif report.skipped and self._outcome == 'passed':
+            self._outcome = 'skipped'
+    
+    def pytest_sessionfinish(self, session):
+        if self.mode == ALL and len(self.recorder):
+            path = os.path.join(self.directory, time.strftime('run-%Y%m%d-%H%M%S.trace.json'))
+            self.written.append(self.recorder.export(path))
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.written:
+            dropped = f", {self.recorder.dropped} older events dropped" if self.recorder.dropped else ""
+            terminalreporter.write_line(
+                f"🛩️  Flight recorder: {len(self.written)} trace timelines{dropped} -> {self.directory}/ "
+                f"(open in https://ui.perfetto.dev)"
+            )
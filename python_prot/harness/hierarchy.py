@@ -0,0 +1,299 @@
+"""
+Streaming page-source parser and a deduplicated, compressed hierarchy archive
+
+Page sources are parsed with iterparse: each XML element is discarded as
+soon as it has been turned into a small __slots__ node, so only the kept
+attributes stay in memory. Snapshots are archived per step in SQLite,
+zlib-compressed and stored once per distinct source.
+"""
+
+import argparse
+import hashlib
+import io
+import sqlite3
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zlib
+
+
+# Streaming granularity when reading an archived source back (bytes)
+CHUNK_SIZE = 64 * 1024
+
+COMPRESSION_LEVEL = 6
+
+
+class HierarchyNode:
+    """One element of a page source, reduced to the attributes tests look at"""
+    
+    __slots__ = ('type', 'name', 'label', 'value', 'rect', 'visible', 'selected', 'depth', 'children')
+    
+    def __init__(self, attrib, element_type, depth):
+        self.type = element_type
+        self.name = attrib.get('name')
+        self.label = attrib.get('label')
+        self.value = attrib.get('value')
+        self.rect = tuple(int(float(attrib.get(key, 0))) for key in ('x', 'y', 'width', 'height'))
+        self.visible = attrib.get('visible') != 'false'
+        self.selected = attrib.get('selected') == 'true'
+        self.depth = depth
+        self.children = []
+    
+    @property
+    def short_type(self):
+        return self.type.replace('XCUIElementType', '')
+    
+    def iter(self):
+        """This node and every descendant, in document order"""
+        yield self
+        for child in self.children:
+            yield from child.iter()
+    
+    def describe(self):
+        """One outline line: Cell "Chi's Laptop" (0,120 390x60)"""
+        text = self.label or self.name
+        parts = [self.short_type]
+        if text:
+            parts.append(f'"{text}"')
+        if self.value:
+            parts.append(f"= {self.value!r}")
+        x, y, width, height = self.rect
+        parts.append(f"({x},{y} {width}x{height})")
+        if self.selected:
+            parts.append("selected")
+        if not self.visible:
+            parts.append("hidden")
+        return ' '.join(parts)
+    
+    def __repr__(self):
+        return f"<{self.describe()}>"
+
+
+def _events(chunks):
+    """(event, element) pairs from an iterable of XML byte chunks"""
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _as_chunks(source):
+    if isinstance(source, str):
+        source = source.encode('utf-8')
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return iter(lambda: source.read(CHUNK_SIZE), b'')
+
+
+def iter_nodes(source):
+    """Stream HierarchyNodes (without children) in document order
+    
+    source is a str, bytes, a binary file, or an iterable of byte chunks.
+    Memory stays bounded by the depth of the tree, not its size.
+    """
+    if isinstance(source, (str, bytes)) or hasattr(source, 'read'):
+        source = _as_chunks(source)
+    open_elements = []
+    depth = -1
+    for event, element in _events(source):
+        # <AppiumAUT> is WDA's wrapper around the tree, not an element
+        wrapper = element.tag == 'AppiumAUT'
+        if event == 'start':
+            open_elements.append(element)
+            if not wrapper:
+                depth += 1
+                yield HierarchyNode(element.attrib, element.tag, depth)
+            continue
+        open_elements.pop()
+        if not wrapper:
+            depth -= 1
+        # A finished element is its parent's last child: drop it right away
+        if open_elements:
+            del open_elements[-1][-1]
+
+
+def parse(source):
+    """Parse a page source into a tree of HierarchyNodes; returns the root"""
+    root = None
+    stack = []
+    for node in iter_nodes(source):
+        del stack[node.depth:]
+        if stack:
+            stack[-1].children.append(node)
+        else:
+            root = node
+        stack.append(node)
+    return root
+
+
+def outline(nodes, max_depth=None, element_type=None):
+    """Indented text outline of streamed nodes, for logs instead of raw XML"""
+    lines = []
+    for node in nodes:
+        if max_depth is not None and node.depth > max_depth:
+            continue
+        if element_type is not None and node.type != element_type:
+            continue
+        lines.append('  ' * node.depth + node.describe())
+    return '\n'.join(lines)
+
+
+def summarize(source):
+    """One line: element count and the most common types"""
+    counts = {}
+    total = 0
+    for node in iter_nodes(source):
+        total += 1
+        counts[node.short_type] = counts.get(node.short_type, 0) + 1
+    common = sorted(counts.items(), key=lambda item: -item[1])[:4]
+    return f"{total} elements (" + ', '.join(f"{count} {name}" for name, count in common) + ")"
+
+
+class HierarchyArchive:
+    """Page sources per run and step, each distinct source stored once (zlib)
+    
+    archive = HierarchyArchive("hierarchy.sqlite")
+    archive.record(driver.page_source, "after tapping Devices", run="test_device")
+    archive.outline(7, run="test_device", element_type="XCUIElementTypeCell")
+    
+    record() files steps under current_run unless a run is given.
+    
+    Reads stream one source out of SQLite and decompress it chunk by
+    chunk into the iterparse pipeline; nothing else is loaded.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.current_run = 'session'
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS sources (
+                digest TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS steps (
+                run TEXT NOT NULL,
+                step INTEGER NOT NULL,
+                label TEXT,
+                digest TEXT NOT NULL REFERENCES sources (digest),
+                captured_at REAL,
+                PRIMARY KEY (run, step)
+            );
+        """)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+    
+    def record(self, source, label=None, run=None):
+        """Store one snapshot as the next step of run; returns the step number"""
+        run = run or self.current_run
+        data = source.encode('utf-8') if isinstance(source, str) else source
+        digest = hashlib.sha1(data).hexdigest()
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM sources WHERE digest = ?", (digest,)).fetchone() is None:
+                self._db.execute("INSERT INTO sources VALUES (?, ?, ?)",
+                                 (digest, zlib.compress(data, COMPRESSION_LEVEL), len(data)))
+            step = self._db.execute("SELECT COALESCE(MAX(step), 0) + 1 FROM steps WHERE run = ?",
+                                    (run,)).fetchone()[0]
+            self._db.execute("INSERT INTO steps VALUES (?, ?, ?, ?, ?)", (run, step, label, digest, time.time()))
+            self._db.commit()
+        return step
+    
+    def runs(self):
+        return [run for run, in self._db.execute("SELECT DISTINCT run FROM steps ORDER BY run")]
+    
+    def steps(self, run='session'):
+        """[(step, label)] of a run"""
+        return self._db.execute("SELECT step, label FROM steps WHERE run = ? ORDER BY step", (run,)).fetchall()
+    
+    def _chunks(self, step, run):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sources.rowid FROM steps JOIN sources USING (digest) WHERE run = ? AND step = ?",
+                (run, step),
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"No step {step} in run {run!r}")
+        decompressor = zlib.decompressobj()
+        offset = 1
+        while True:
+            # substr() on a BLOB reads a byte range without loading the rest
+            with self._lock:
+                compressed, = self._db.execute("SELECT substr(data, ?, ?) FROM sources WHERE rowid = ?",
+                                               (offset, CHUNK_SIZE, row[0])).fetchone()
+            if not compressed:
+                break
+            offset += len(compressed)
+            chunk = decompressor.decompress(compressed)
+            if chunk:
+                yield chunk
+        yield decompressor.flush()
+    
+    def source(self, step, run='session'):
+        """The full page source of a step"""
+        return b''.join(self._chunks(step, run)).decode('utf-8')
+    
+    def nodes(self, step, run='session'):
+        """Stream the nodes of a step without materialising its source"""
+        return iter_nodes(self._chunks(step, run))
+    
+    def find(self, step, run='session', element_type=None, text=None):
+        """Nodes of a step by type and/or label/name substring"""
+        text = text.lower() if text else None
+        return [
+            node for node in self.nodes(step, run)
+            if (element_type is None or node.type == element_type)
+            and (text is None or text in (node.label or node.name or '').lower())
+        ]
+    
+    def outline(self, step, run='session', max_depth=None, element_type=None):
+        return outline(self.nodes(step, run), max_depth, element_type)
+    
+    def stats(self):
+        """Steps recorded, distinct sources, raw and stored bytes"""
+        steps, = self._db.execute("SELECT COUNT(*) FROM steps").fetchone()
+        sources, raw, stored = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM sources"
+        ).fetchone()
+        return {'steps': steps, 'sources': sources, 'raw_bytes': raw, 'stored_bytes': stored}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harness.hierarchy',
+                                     description='Query a hierarchy archive')
+    parser.add_argument('archive', help='archive written with --hierarchy-archive')
+    parser.add_argument('--run', help='test node id (default: list runs)')
+    parser.add_argument('--step', type=int, help='step to show (default: list steps)')
+    parser.add_argument('--type', help='only elements of this type, e.g. Cell')
+    parser.add_argument('--depth', type=int, help='outline depth limit')
+    args = parser.parse_args(argv)
+    
+    with HierarchyArchive(args.archive) as archive:
+        if args.run is None:
+            print('\n'.join(archive.runs()))
+        elif args.step is None:
+            for step, label in archive.steps(args.run):
+                print(f"{step:4d}  {label or ''}")
+        else:
+            element_type = args.type and 'XCUIElementType' + args.type.replace('XCUIElementType', '')
+            print(archive.outline(args.step, args.run, args.depth, element_type))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Per-command latency instrumentation for WebDriver sessions
+"""
+
+import json
+import math
+import threading
+import time
+
+from page_objects.tracing import page_method_stack
+
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Label for commands issued outside any page-object method
+TEST_CODE = '(test code)'
+
+
+class CommandSample:
+    """One timed WebDriver command"""
+    
+    __slots__ = ('command', 'method', 'path', 'started', 'duration_ms', 'bytes_sent', 'bytes_received')
+    
+    def __init__(self, command, method, path, started, duration_ms, bytes_sent, bytes_received):
+        self.command = command
+        self.method = method
+        self.path = path
+        self.started = started
+        self.duration_ms = duration_ms
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+
+
+class CommandRecorder:
+    """Timestamps every WebDriver command of the drivers it is attached to
+    
+    Each sample records the command (e.g. findElement), the outermost
+    page-object method it ran inside (e.g. FindMyMainPage.tap_device_by_name),
+    the full page-method path and the bytes sent and received over HTTP.
+    write_report() aggregates them into per-method and per-command
+    latency histograms with p50/p95/p99.
+    """
+    
+    def __init__(self):
+        self.samples = []
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def attach(self, driver):
+        """Hook the driver's command execution and HTTP connection"""
+        execute = driver.execute
+        
+        def timed_execute(driver_command, params=None):
+            self._local.sent = self._local.received = 0
+            started = time.time()
+            clock = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.record(
+                    driver_command,
+                    page_method_stack(),
+                    started,
+                    (time.perf_counter() - clock) * 1000,
+                    self._local.sent,
+                    self._local.received,
+                )
+        
+        driver.execute = timed_execute
+        
+        connection = getattr(driver.command_executor, '_conn', None)
+        if connection is not None:
+            request = connection.request
+            
+            def counted_request(method, url, body=None, **kwargs):
+                response = request(method, url, body=body, **kwargs)
+                self._local.sent = getattr(self._local, 'sent', 0) + len(body or b'')
+                length = response.headers.get('Content-Length')
+                self._local.received = getattr(self._local, 'received', 0) + (
+                    int(length) if length is not None else len(response.data)
+                )
+                return response
+            
+            connection.request = counted_request
+        return driver
+    
+    def record(self, command, stack, started, duration_ms, bytes_sent=0, bytes_received=0):
+        sample = CommandSample(
+            command,
+            stack[0] if stack else TEST_CODE,
+            ' > '.join(stack) if stack else TEST_CODE,
+            started,
+            duration_ms,
+            bytes_sent,
+            bytes_received,
+        )
+        with self._lock:
+            self.samples.append(sample)
+        for listener in self.listeners:
+            listener(sample)
+        return sample
+    
+    def count(self):
+        """Number of commands recorded so far"""
+        return len(self.samples)
+    
+    def report(self):
+        """Latency statistics grouped by command, page method and call path"""
+        with self._lock:
+            samples = list(self.samples)
+        return {
+            'total_commands': len(samples),
+            'total_ms': round(sum(sample.duration_ms for sample in samples), 3),
+            'commands': _group(samples, lambda sample: sample.command),
+            'methods': _group(samples, lambda sample: sample.method, breakdown=True),
+            'call_paths': _group(samples, lambda sample: sample.path),
+        }
+    
+    def write_report(self, path):
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(self.report(), output, indent=2, sort_keys=True)
+        return path
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def latency_stats(durations_ms):
+    """count/total/p50/p95/p99/max plus a bucketed histogram"""
+    values = sorted(durations_ms)
+    histogram = {}
+    for value in values:
+        bucket = next((f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS if value <= bound),
+                      f">{HISTOGRAM_BUCKETS_MS[-1]}ms")
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    return {
+        'count': len(values),
+        'total_ms': round(sum(values), 3),
+        'p50_ms': round(percentile(values, 0.50), 3),
+        'p95_ms': round(percentile(values, 0.95), 3),
+        'p99_ms': round(percentile(values, 0.99), 3),
+        'max_ms': round(values[-1], 3) if values else 0.0,
+        'histogram': histogram,
+    }
+
+
+def _group(samples, key, breakdown=False):
+    groups = {}
+    for sample in samples:
+        groups.setdefault(key(sample), []).append(sample)
+    result = {}
+    for name, members in groups.items():
+        stats = latency_stats([sample.duration_ms for sample in members])
+        stats['bytes_sent'] = sum(sample.bytes_sent for sample in members)
+        stats['bytes_received'] = sum(sample.bytes_received for sample in members)
+        if breakdown:
+            commands = {}
+            for sample in members:
+                commands[sample.command] = commands.get(sample.command, 0) + 1
+            stats['commands'] = commands
+        result[name] = stats
+    return result
@@ -0,0 +1,68 @@
+"""
+Device inventory for multi-device runs
+"""
+
+import json
+
+
+# Keys every inventory entry must have
+REQUIRED_KEYS = ('name', 'udid', 'server_url', 'wda_local_port', 'updated_wda_bundle_id')
+
+
+def load_inventory(path):
+    """Load and validate a JSON device inventory
+    
+    [
+        {"name": "iphone-13", "udid": "00008110-...", "server_url": "http://127.0.0.1:4723",
+         "wda_local_port": 8100, "updated_wda_bundle_id": "com.example.WebDriverAgentRunner"},
+        ...
+    ]
+    
+    An optional "device_name" is passed on as the deviceName capability.
+    """
+    with open(path, encoding='utf-8') as source:
+        devices = json.load(source)
+    if isinstance(devices, dict):
+        devices = devices.get('devices', [])
+    return validate_inventory(devices)
+
+
+def validate_inventory(devices):
+    """Check required keys and that no two devices share a UDID or WDA port"""
+    if not devices:
+        raise ValueError("Device inventory is empty")
+    for unique_key in ('name', 'udid', 'wda_local_port'):
+        values = [device.get(unique_key) for device in devices]
+        duplicates = {value for value in values if values.count(value) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate {unique_key} in device inventory: {sorted(map(str, duplicates))}")
+    for device in devices:
+        missing = [key for key in REQUIRED_KEYS if device.get(key) in (None, '')]
+        if missing:
+            raise ValueError(f"Device {device.get('name', '?')} is missing {', '.join(missing)}")
+    return devices
+
+
+def device_environment(device):
+    """Environment variables that point harness.capabilities at a device"""
+    environment = {
+        'APPIUM_SERVER_URL': device['server_url'],
+        'DEVICE_UDID': device['udid'],
+        'WDA_LOCAL_PORT': str(device['wda_local_port']),
+        'WDA_BUNDLE_ID': device['updated_wda_bundle_id'],
+    }
+    if device.get('device_name'):
+        environment['DEVICE_NAME'] = device['device_name']
+    return environment
+
+
+def device_capabilities(device):
+    """build_options() / SessionPool.acquire() overrides for a device"""
+    capabilities = {
+        'udid': device['udid'],
+        'wda_local_port': int(device['wda_local_port']),
+        'updated_wda_bundle_id': device['updated_wda_bundle_id'],
+    }
+    if device.get('device_name'):
+        capabilities['device_name'] = device['device_name']
+    return capabilities
@@ -0,0 +1,268 @@
+"""
+Test ordering that minimises screen transitions and session restarts
+
+Tests that use the pooled session declare where they start and what they
+visit:
+    
+    @pytest.mark.screens(DEVICES, DEVICE_DETAIL)
+    @pytest.mark.screens(PEOPLE, session="es-locale")
+    @pytest.mark.order_after("test_play_sound_on_chis_laptop")
+
+With --optimize-order the app tests are reordered so that each one starts
+where the previous one left the session, and tests that need the same
+session run together. Every other test keeps its place.
+"""
+
+import statistics
+
+from harness.scheduler import DEFAULT_DURATIONS_PATH, load_durations
+from page_objects.navigation import DETAIL_SCREENS, PEOPLE, TAB_SCREENS, findmy_transitions, shortest_route
+
+
+# Screen a new session starts on
+LAUNCH_SCREEN = PEOPLE
+
+DEFAULT_SESSION = "default"
+
+# Seconds per unit of transition cost when durations cannot tell
+DEFAULT_TRANSITION_SECONDS = 0.75
+# Bounds for the estimate from recorded durations (sleeps and assertions
+# inflate a test's duration, so a wild ratio is clamped)
+MIN_TRANSITION_SECONDS = 0.1
+MAX_TRANSITION_SECONDS = 5.0
+
+# Creating an XCUITest session (WebDriverAgent launch and app start)
+DEFAULT_SESSION_SETUP_SECONDS = 15.0
+
+# Fixtures that check out the pooled session
+APP_FIXTURES = ("driver", "navigator")
+
+# Tab a detail screen is closed back to when the pool resets the session
+_DETAIL_PARENTS = {
+    detail: screen
+    for screen, button in TAB_SCREENS.items()
+    for tab, detail in DETAIL_SCREENS.items() if tab == button
+}
+
+
+class ScreenProfile:
+    """Screens, session and ordering constraints of one app test"""
+    
+    __slots__ = ('index', 'nodeid', 'name', 'start', 'visits', 'end', 'session', 'after', 'duration')
+    
+    def __init__(self, index, nodeid, start=None, visits=(), end=None, session=DEFAULT_SESSION,
+                 after=(), duration=None):
+        self.index = index
+        self.nodeid = nodeid
+        self.name = nodeid.rsplit("::", 1)[-1]
+        self.start = start
+        self.visits = tuple(visits)
+        # The pool reset closes detail pages, so a test ends on a tab
+        last = (self.visits or (start,))[-1]
+        self.end = end or _DETAIL_PARENTS.get(last, last)
+        self.session = session
+        self.after = tuple(after)
+        self.duration = duration
+    
+    @classmethod
+    def from_item(cls, index, item, durations):
+        """Profile of a collected pytest item (markers screens and order_after)"""
+        marker = item.get_closest_marker("screens")
+        screens = marker.args if marker else ()
+        options = marker.kwargs if marker else {}
+        after = [name for mark in item.iter_markers("order_after") for name in mark.args]
+        return cls(
+            index, item.nodeid,
+            start=screens[0] if screens else None,
+            visits=screens[1:],
+            end=options.get("end"),
+            session=options.get("session", DEFAULT_SESSION),
+            after=after,
+            duration=durations.get(item.nodeid),
+        )
+    
+    def matches(self, reference):
+        """True when an order_after reference names this test"""
+        return reference in (self.name, self.nodeid) or self.nodeid.endswith(("::" + reference, "/" + reference))
+    
+    def __repr__(self):
+        return f"<ScreenProfile {self.name} {self.start}→{self.end} ({self.session})>"
+
+
+class CostModel:
+    """Seconds of navigation and session setup between consecutive tests"""
+    
+    def __init__(self, transition_seconds=DEFAULT_TRANSITION_SECONDS,
+                 session_setup_seconds=DEFAULT_SESSION_SETUP_SECONDS, transitions=None):
+        self.transition_seconds = transition_seconds
+        self.session_setup_seconds = session_setup_seconds
+        self.transitions = transitions if transitions is not None else findmy_transitions()
+        self._routes = {}
+    
+    def route_cost(self, source, destination):
+        """Cost units of the shortest route, cached per screen pair"""
+        if source is None or destination is None:
+            return 0 if destination is None else max(
+                self.route_cost(screen, destination) for screen in (*TAB_SCREENS, *_DETAIL_PARENTS)
+            )
+        key = (source, destination)
+        if key not in self._routes:
+            route = shortest_route(self.transitions, source, destination, start_satisfies=True)
+            self._routes[key] = sum(transition.cost for transition in route)
+        return self._routes[key]
+    
+    def between(self, previous, test):
+        """(seconds, session setups) to get from previous (None: nothing ran yet) to test"""
+        if previous is None or previous.session != test.session:
+            return (self.session_setup_seconds
+                    + self.route_cost(LAUNCH_SCREEN, test.start) * self.transition_seconds, 1)
+        # An unmarked test leaves the session on a screen nobody knows
+        source = previous.end if previous.start is not None else None
+        return self.route_cost(source, test.start) * self.transition_seconds, 0
+    
+    def total(self, order):
+        """(seconds, session setups) of running the tests in order"""
+        seconds = setups = 0
+        previous = None
+        for test in order:
+            cost, setup = self.between(previous, test)
+            seconds += cost
+            setups += setup
+            previous = test
+        return seconds, setups
+    
+    def estimate_transition_seconds(self, profiles):
+        """Seconds per cost unit from recorded durations of marked tests
+        
+        Median of duration / own navigation cost; the default when fewer
+        than three tests have both.
+        """
+        ratios = []
+        for test in profiles:
+            if test.duration is None or test.start is None:
+                continue
+            cost = 0
+            screen = test.start
+            for visit in test.visits:
+                cost += self.route_cost(screen, visit)
+                screen = visit
+            if cost:
+                ratios.append(test.duration / cost)
+        if len(ratios) < 3:
+            return DEFAULT_TRANSITION_SECONDS
+        return min(max(statistics.median(ratios), MIN_TRANSITION_SECONDS), MAX_TRANSITION_SECONDS)
+
+
+def _predecessors(profiles):
+    """{index: indexes that must run first}; unknown references are ignored"""
+    required = {}
+    for test in profiles:
+        required[test.index] = {
+            other.index for reference in test.after for other in profiles
+            if other is not test and other.matches(reference)
+        }
+    return required
+
+
+def optimize(profiles, model):
+    """Order profiles for the lowest total cost, respecting order_after
+    
+    Nearest neighbour (ties keep file order), then moves of single tests
+    to a cheaper position until none helps.
+    """
+    required = _predecessors(profiles)
+    remaining = list(profiles)
+    placed = set()
+    order = []
+    while remaining:
+        ready = [test for test in remaining if required[test.index] <= placed]
+        if not ready:
+            raise ValueError("order_after constraints form a cycle: "
+                             + ", ".join(test.name for test in remaining))
+        previous = order[-1] if order else None
+        chosen = min(ready, key=lambda test: (model.between(previous, test)[0], test.index))
+        order.append(chosen)
+        placed.add(chosen.index)
+        remaining.remove(chosen)
+    return _improve(order, model, required)
+
+
+def _cost(model, previous, test):
+    return model.between(previous, test)[0] if test is not None else 0.0
+
+
+def _movable(rest, test, source, destination, required):
+    """True when inserting test at rest[destination] keeps every order_after"""
+    if destination < source:
+        return not any(other.index in required[test.index] for other in rest[destination:source])
+    return not any(test.index in required[other.index] for other in rest[source:destination])
+
+
+def _improve(order, model, required):
+    improved = True
+    while improved:
+        improved = False
+        for source in range(len(order)):
+            test = order[source]
+            rest = order[:source] + order[source + 1:]
+            previous = order[source - 1] if source else None
+            following = order[source + 1] if source + 1 < len(order) else None
+            # Only the edges around the old and the new position change
+            removal = (_cost(model, previous, following)
+                       - _cost(model, previous, test) - _cost(model, test, following))
+            for destination in range(len(rest) + 1):
+                if destination == source:
+                    continue
+                before = rest[destination - 1] if destination else None
+                after = rest[destination] if destination < len(rest) else None
+                delta = (removal + _cost(model, before, test) + _cost(model, test, after)
+                         - _cost(model, before, after))
+                if delta < -1e-9 and _movable(rest, test, source, destination, required):
+                    order = rest[:destination] + [test] + rest[destination:]
+                    improved = True
+                    break
+    return order
+
+
+class OrderOptimizer:
+    """pytest plugin: reorders the app tests of a run and reports the saving"""
+    
+    def __init__(self, durations_path=DEFAULT_DURATIONS_PATH, transition_seconds=None,
+                 session_setup_seconds=DEFAULT_SESSION_SETUP_SECONDS):
+        self.durations_path = durations_path
+        self.transition_seconds = transition_seconds
+        self.session_setup_seconds = session_setup_seconds
+        self.model = None
+        self.file_order = None
+        self.order = None
+    
+    def pytest_collection_modifyitems(self, session, config, items):
+        durations = load_durations(self.durations_path)
+        slots = [index for index, item in enumerate(items)
+                 if any(name in getattr(item, "fixturenames", ()) for name in APP_FIXTURES)]
+        profiles = [ScreenProfile.from_item(index, items[index], durations) for index in slots]
+        self.model = CostModel(session_setup_seconds=self.session_setup_seconds)
+        self.model.transition_seconds = self.transition_seconds or self.model.estimate_transition_seconds(profiles)
+        
+        self.file_order = profiles
+        self.order = optimize(profiles, self.model)
+        # App tests take the optimised order; the other tests keep their slots
+        reordered = [items[test.index] for test in self.order]
+        for slot, item in zip(slots, reordered):
+            items[slot] = item
+    
+    def report(self):
+        """(file order seconds, optimised seconds, file order setups, optimised setups)"""
+        before, setups_before = self.model.total(self.file_order)
+        after, setups_after = self.model.total(self.order)
+        return before, after, setups_before, setups_after
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.order:
+            return
+        before, after, setups_before, setups_after = self.report()
+        terminalreporter.write_line(
+            f"🧭 Test order: {len(self.order)} app tests, {setups_after} session setups (file order {setups_before}), "
+            f"navigation ~{after:.1f} s instead of ~{before:.1f} s, saved ~{before - after:.1f} s "
+            f"({self.model.transition_seconds:.2f} s per transition step)"
+        )
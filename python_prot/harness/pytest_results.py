@@ -0,0 +1,52 @@
+"""
+pytest plugin that writes per-test outcomes and durations as JSON
+
+Loaded by the parallel scheduler in every worker:
+    pytest -p harness.pytest_results --results-json worker.json ...
+
+and in its collection run, to learn which arguments pytest took as test paths:
+    pytest -p harness.pytest_results --collect-only --test-paths-json paths.json ...
+"""
+
+import json
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--results-json", metavar="PATH",
+                     help="write {nodeid: {outcome, duration}} for every test to PATH")
+    parser.addoption("--test-paths-json", metavar="PATH",
+                     help="write the positional arguments (test paths and node ids) pytest parsed to PATH")
+
+
+def pytest_configure(config):
+    path = config.getoption("--results-json")
+    if path:
+        config.pluginmanager.register(ResultsWriter(path), "results-json-writer")
+    path = config.getoption("--test-paths-json")
+    if path:
+        # Paths from testpaths or the invocation directory were not on the command line
+        test_paths = config.args if config.args_source == pytest.Config.ArgsSource.ARGS else []
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(test_paths, output)
+
+
+class ResultsWriter:
+    """Sum setup, call and teardown time per test and keep the worst outcome"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+    
+    def pytest_runtest_logreport(self, report):
+        entry = self.results.setdefault(report.nodeid, {"outcome": "passed", "duration": 0.0})
+        entry["duration"] = round(entry["duration"] + report.duration, 4)
+        if report.failed:
+            entry["outcome"] = "failed" if report.when == "call" else "error"
+        elif report.skipped and entry["outcome"] == "passed":
+            entry["outcome"] = "skipped"
+    
+    def pytest_sessionfinish(self, session):
+        with open(self.path, "w", encoding="utf-8") as output:
+            json.dump(self.results, output, indent=2, sort_keys=True)
@@ -0,0 +1,243 @@
+"""
+Parallel test scheduler: one pytest worker per device in an inventory
+    
+    python -m harness.scheduler --inventory devices.json -- tests/test_findmy_navigation.py
+
+Tests are split across devices by their historical duration (longest
+first onto the least loaded worker), every worker runs in its own pytest
+process pointed at its device through environment variables, and the
+per-worker results are merged into one JSON report and one JUnit XML file.
+"""
+
+import argparse
+import collections
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from harness.inventory import device_environment, load_inventory
+
+
+DEFAULT_DURATIONS_PATH = '.test_durations.json'
+DEFAULT_REPORT_PATH = 'parallel_report.json'
+
+# Duration assumed for tests that have never run
+FALLBACK_DURATION = 1.0
+
+
+def collect_tests(pytest_args, cwd=None):
+    """Node ids pytest would run for pytest_args, and the arguments it parsed as test paths"""
+    with tempfile.TemporaryDirectory(prefix='findmy-collect-') as directory:
+        paths_file = os.path.join(directory, 'test_paths.json')
+        completed = subprocess.run(
+            [sys.executable, '-m', 'pytest', '--collect-only', '-q', '-p', 'no:cacheprovider',
+             '-p', 'harness.pytest_results', '--test-paths-json', paths_file, *pytest_args],
+            cwd=cwd, capture_output=True, text=True,
+        )
+        if completed.returncode not in (0, 5):  # 5: no tests collected
+            raise RuntimeError(f"Test collection failed:\n{completed.stdout}{completed.stderr}")
+        with open(paths_file, encoding='utf-8') as source:
+            test_paths = json.load(source)
+    node_ids = [line.strip() for line in completed.stdout.splitlines() if '::' in line]
+    return (node_ids if completed.returncode == 0 else []), test_paths
+
+
+def load_durations(path):
+    """Historical {nodeid: seconds}, empty when there is no history yet"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as source:
+        return json.load(source)
+
+
+def save_durations(path, durations, results):
+    """Fold the durations of this run into the history file"""
+    updated = dict(durations)
+    for node_id, result in results.items():
+        if result['outcome'] != 'skipped':
+            updated[node_id] = result['duration']
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(updated, output, indent=2, sort_keys=True)
+
+
+def partition(node_ids, durations, workers):
+    """Split node ids into workers buckets of roughly equal total duration
+    
+    Longest-processing-time first: tests are sorted by expected duration
+    and each goes to the currently least loaded bucket. Tests without
+    history are assumed to take the median known duration.
+    """
+    known = [durations[node_id] for node_id in node_ids if node_id in durations]
+    default = statistics.median(known) if known else FALLBACK_DURATION
+    expected = {node_id: durations.get(node_id, default) for node_id in node_ids}
+    
+    buckets = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for node_id in sorted(node_ids, key=lambda node_id: (-expected[node_id], node_id)):
+        lightest = loads.index(min(loads))
+        buckets[lightest].append(node_id)
+        loads[lightest] += expected[node_id]
+    # Keep file order inside a bucket so module fixtures are shared
+    order = {node_id: position for position, node_id in enumerate(node_ids)}
+    return [sorted(bucket, key=order.get) for bucket in buckets], loads
+
+
+def run_workers(devices, buckets, pytest_args=(), cwd=None, output_dir=None):
+    """Run one pytest process per device and wait for all of them"""
+    output_dir = output_dir or tempfile.mkdtemp(prefix='findmy-workers-')
+    workers = []
+    for device, node_ids in zip(devices, buckets):
+        if not node_ids:
+            continue
+        results_path = os.path.join(output_dir, f"{device['name']}.json")
+        junit_path = os.path.join(output_dir, f"{device['name']}.xml")
+        log_path = os.path.join(output_dir, f"{device['name']}.log")
+        environment = {**os.environ, **device_environment(device)}
+        command = [
+            sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+            '-p', 'harness.pytest_results', '--results-json', results_path,
+            '--junitxml', junit_path, *pytest_args, *node_ids,
+        ]
+        log = open(log_path, 'w', encoding='utf-8')
+        print(f"🚀 {device['name']}: {len(node_ids)} tests on {device['server_url']} (WDA port {device['wda_local_port']})")
+        process = subprocess.Popen(command, cwd=cwd, env=environment, stdout=log, stderr=subprocess.STDOUT)
+        workers.append({
+            'device': device, 'process': process, 'log': log, 'tests': node_ids,
+            'results_path': results_path, 'junit_path': junit_path, 'log_path': log_path,
+            'started': time.monotonic(),
+        })
+    
+    for worker in workers:
+        worker['returncode'] = worker['process'].wait()
+        worker['elapsed_s'] = round(time.monotonic() - worker['started'], 3)
+        worker['log'].close()
+    return workers
+
+
+def merge_results(workers):
+    """Combine the per-worker JSON results into one report"""
+    tests = {}
+    summary = {'passed': 0, 'failed': 0, 'error': 0, 'skipped': 0}
+    report_workers = []
+    for worker in workers:
+        name = worker['device']['name']
+        results = {}
+        if os.path.exists(worker['results_path']):
+            with open(worker['results_path'], encoding='utf-8') as source:
+                results = json.load(source)
+        # A worker that died before running a test still owes a result for it
+        for node_id in worker['tests']:
+            results.setdefault(node_id, {'outcome': 'error', 'duration': 0.0})
+        for node_id, result in results.items():
+            tests[node_id] = {**result, 'device': name}
+            summary[result['outcome']] = summary.get(result['outcome'], 0) + 1
+        report_workers.append({
+            'device': name,
+            'udid': worker['device']['udid'],
+            'server_url': worker['device']['server_url'],
+            'tests': len(worker['tests']),
+            'returncode': worker['returncode'],
+            'elapsed_s': worker['elapsed_s'],
+            'log': worker['log_path'],
+        })
+    return {
+        'summary': summary,
+        'wall_s': max((worker['elapsed_s'] for worker in workers), default=0.0),
+        'serial_s': round(sum(test['duration'] for test in tests.values()), 3),
+        'workers': report_workers,
+        'tests': dict(sorted(tests.items())),
+    }
+
+
+def merge_junit(workers, path):
+    """Write one JUnit XML file with a <testsuite> per worker"""
+    merged = ET.Element('testsuites', name='findmy-parallel')
+    totals = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0}
+    elapsed = 0.0
+    for worker in workers:
+        if not os.path.exists(worker['junit_path']):
+            continue
+        root = ET.parse(worker['junit_path']).getroot()
+        suites = [root] if root.tag == 'testsuite' else root.findall('testsuite')
+        for suite in suites:
+            suite.set('name', worker['device']['name'])
+            suite.set('hostname', worker['device']['udid'])
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            elapsed += float(suite.get('time', 0))
+            merged.append(suite)
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    merged.set('time', f"{elapsed:.3f}")
+    ET.ElementTree(merged).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def run(inventory_path, pytest_args=(), durations_path=DEFAULT_DURATIONS_PATH,
+        report_path=DEFAULT_REPORT_PATH, junit_path=None, cwd=None):
+    """Schedule, run and merge; returns the merged report"""
+    devices = load_inventory(inventory_path)
+    node_ids, test_paths = collect_tests(pytest_args, cwd=cwd)
+    durations = load_durations(durations_path)
+    buckets, loads = partition(node_ids, durations, len(devices))
+    for device, bucket, load in zip(devices, buckets, loads):
+        print(f"📋 {device['name']}: {len(bucket)} tests, ~{load:.1f}s expected")
+    
+    workers = run_workers(devices, buckets, pytest_args=options_only(pytest_args, test_paths), cwd=cwd)
+    report = merge_results(workers)
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+    if junit_path:
+        merge_junit(workers, junit_path)
+    if durations_path:
+        save_durations(durations_path, durations, report['tests'])
+    
+    summary = report['summary']
+    print(f"✅ {summary['passed']} passed, ❌ {summary['failed']} failed, "
+          f"{summary['error']} errors, {summary['skipped']} skipped "
+          f"in {report['wall_s']:.1f}s ({report['serial_s']:.1f}s of test time)")
+    return report
+
+
+def options_only(pytest_args, test_paths):
+    """pytest_args without test_paths, which the workers get as node ids instead
+    
+    test_paths are the positional arguments pytest parsed (collect_tests), so
+    option values are never mistaken for them. An argument equal to a test
+    path right after an option is taken as that option's value when the path
+    also appears later on its own.
+    """
+    needed = collections.Counter(test_paths)
+    options = []
+    for index, argument in enumerate(pytest_args):
+        previous = pytest_args[index - 1] if index else ''
+        after_option = previous.startswith('-') and '=' not in previous
+        if needed[argument] and not (after_option and pytest_args[index:].count(argument) > needed[argument]):
+            needed[argument] -= 1
+        else:
+            options.append(argument)
+    return options
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harness.scheduler', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--inventory', required=True, help='JSON device inventory')
+    parser.add_argument('--durations', default=DEFAULT_DURATIONS_PATH, help='historical test durations (updated after the run)')
+    parser.add_argument('--report', default=DEFAULT_REPORT_PATH, help='merged JSON report')
+    parser.add_argument('--junitxml', help='merged JUnit XML report')
+    parser.add_argument('pytest_args', nargs='*', help='test paths and pytest options (after --)')
+    args = parser.parse_args(argv)
+    
+    report = run(args.inventory, args.pytest_args or ['tests'], durations_path=args.durations,
+                 report_path=args.report, junit_path=args.junitxml)
+    failed = report['summary']['failed'] + report['summary']['error']
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
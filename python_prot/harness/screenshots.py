@@ -0,0 +1,199 @@
+"""
+Asynchronous screenshot capture with perceptual deduplication
+
+The test thread only pays for the screenshot round-trip; decoding,
+hashing and writing happen on a background thread pool. Captures go into
+one zip archive per run with an index.json by test and step.
+"""
+
+import base64
+import io
+import json
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+
+# Capture modes
+OFF = 'off'
+FAILURES = 'failures'  # only capture_failure() takes a screenshot
+ALL = 'all'
+MODES = (OFF, FAILURES, ALL)
+
+# Frames whose 128-bit dHashes differ in at most this many bits count as the same screen
+DEFAULT_THRESHOLD = 6
+
+
+def dhash(png, size=8):
+    """Difference hash: brightness gradients of a grayscale thumbnail
+
+    size*size bits compare horizontal neighbours and size*size bits vertical
+    neighbours (128 bits by default), so both full-width bars and columns
+    move the hash. Compression noise and tiny changes do not.
+    """
+    with Image.open(io.BytesIO(png)) as image:
+        gray = image.convert('L')
+        wide = gray.resize((size + 1, size), Image.BILINEAR).tobytes()
+        tall = gray.resize((size, size + 1), Image.BILINEAR).tobytes()
+    value = 0
+    for row in range(size):
+        for column in range(size):
+            value = value << 1 | (wide[row * (size + 1) + column] > wide[row * (size + 1) + column + 1])
+    for row in range(size):
+        for column in range(size):
+            value = value << 1 | (tall[row * size + column] > tall[(row + 1) * size + column])
+    return value
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def _slug(text):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', text).strip('_')[:80] or 'capture'
+
+
+class ScreenshotArchive:
+    """Zip archive of PNG captures plus an index.json written on close
+    
+    PNGs are stored without recompression (they are already deflated);
+    near-duplicate frames are not stored at all, their index entry points
+    at the frame they duplicate.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.entries = []
+        self._zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED)
+        self._lock = threading.Lock()
+    
+    def add(self, test, step, png, image_hash, duplicate_of=None, captured_at=None):
+        with self._lock:
+            number = len(self.entries) + 1
+            entry = {
+                'number': number,
+                'test': test,
+                'step': step,
+                'hash': f"{image_hash:032x}",
+                'captured_at': captured_at,
+                'file': None,
+                'duplicate_of': duplicate_of,
+                'bytes': len(png),
+            }
+            if duplicate_of is None:
+                entry['file'] = f"{number:04d}-{_slug(test)}-{_slug(step)}.png"
+                self._zip.writestr(entry['file'], png)
+            self.entries.append(entry)
+            return entry
+    
+    def close(self):
+        with self._lock:
+            if self._zip is None:
+                return
+            # Workers finish out of order; the index lists captures in the order taken
+            entries = sorted(self.entries, key=lambda entry: entry['captured_at'] or 0)
+            self._zip.writestr('index.json', json.dumps(entries, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+            self._zip.close()
+            self._zip = None
+    
+    @staticmethod
+    def read_index(path):
+        with zipfile.ZipFile(path) as archive:
+            return json.loads(archive.read('index.json'))
+
+
+class ScreenshotPipeline:
+    """Captures on the test thread, decodes/dedups/writes on worker threads
+    
+    pipeline = ScreenshotPipeline("screenshots/run.zip", mode=ALL)
+    pipeline.capture(driver, "after login", test="test_login")
+    pipeline.close()   # waits for pending writes and writes the index
+    """
+    
+    def __init__(self, archive_path, mode=ALL, workers=2, threshold=DEFAULT_THRESHOLD):
+        if mode not in MODES:
+            raise ValueError(f"Unknown screenshot mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.threshold = threshold
+        self.current_test = None
+        self.captured = 0
+        self.stored = 0
+        self.skipped = 0
+        self._archive = ScreenshotArchive(archive_path) if mode != OFF else None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screenshots')
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._pending = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @property
+    def path(self):
+        return self._archive.path if self._archive else None
+    
+    def capture(self, driver, step, test=None):
+        """Step capture: taken in ALL mode only; returns a future or None"""
+        if self.mode != ALL:
+            return None
+        return self._capture(driver, step, test)
+    
+    def capture_failure(self, driver, test=None):
+        """Failure capture: taken in ALL and FAILURES mode"""
+        if self.mode == OFF:
+            return None
+        return self._capture(driver, 'failure', test)
+    
+    def _capture(self, driver, step, test):
+        # The only work on the calling thread: one screenshot round-trip
+        encoded = driver.get_screenshot_as_base64()
+        test = test or self.current_test or 'session'
+        self.captured += 1
+        future = self._executor.submit(self._store, test, step, encoded, time.time())
+        with self._lock:
+            self._pending.append(future)
+        return future
+    
+    def _store(self, test, step, encoded, captured_at):
+        png = base64.b64decode(encoded)
+        image_hash = dhash(png)
+        with self._lock:
+            kept = self._hashes.setdefault(test, [])
+            duplicate_of = next(
+                (number for number, kept_hash in kept if hamming(kept_hash, image_hash) <= self.threshold),
+                None,
+            )
+            # Reserve the entry under the lock so a concurrent near-identical
+            # frame of the same test is compared against this one
+            entry = self._archive.add(test, step, png, image_hash, duplicate_of, captured_at)
+            if duplicate_of is None:
+                kept.append((entry['number'], image_hash))
+                self.stored += 1
+            else:
+                self.skipped += 1
+        return entry
+    
+    def flush(self):
+        """Wait for every pending capture; re-raises the first worker error"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+    
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            if self._archive is not None:
+                self._archive.close()
+    
+    def stats(self):
+        return {'captured': self.captured, 'stored': self.stored, 'skipped': self.skipped}
@@ -0,0 +1,462 @@
+"""
+Change-aware test selection from recorded page-object dependencies
+    
+    pytest tests/ --record-deps          # record what every test uses
+    pytest tests/ --changed-only         # later: only tests affected by the git diff
+    pytest tests/ --changed-only --full-run
+
+While recording, every page-object method a test calls and every locator
+constant it reads (e.g. DeviceDetailPage.PLAY_SOUND_BUTTON) is stored per
+test in .test_dependencies.json together with the commit. A later run
+diffs that commit against the working tree, compares the changed
+page-object files class member by class member (ast, so formatting and
+docstrings do not count) and keeps only the tests that used a changed
+member. Members other classes read under their own name
+(AsyncFindMyMainPage.PEOPLE_TAB = FindMyMainPage.PEOPLE_TAB) and module
+code other page-object modules import are followed through the source.
+Changes the map cannot attribute (harness, conftest, navigation code)
+select everything.
+"""
+
+import ast
+import fnmatch
+import json
+import os
+import subprocess
+
+import pytest
+
+import page_objects
+from page_objects import BasePage
+from page_objects.aio.base_page import AsyncBasePage
+from page_objects.tracing import add_listener, remove_listener
+
+
+DEFAULT_DEPENDENCIES_PATH = '.test_dependencies.json'
+
+PAGE_OBJECTS_PACKAGE = 'page_objects'
+
+# Changed files that cannot change what a test does
+IGNORED_PATTERNS = ('*.md', 'benchmarks/*', '.gitignore')
+
+# Page-object bases whose subclasses are recorded
+PAGE_BASES = (BasePage, AsyncBasePage)
+
+
+def _symbol(cls, member=None):
+    """'page_objects.device_detail_page:DeviceDetailPage.PLAY_SOUND_BUTTON'"""
+    name = f"{cls.__module__}:{cls.__qualname__}"
+    return f"{name}.{member}" if member else name
+
+
+def _is_page_class(cls):
+    return cls.__module__.split('.')[0] == PAGE_OBJECTS_PACKAGE and any(
+        issubclass(cls, base) for base in PAGE_BASES)
+
+
+def page_classes():
+    """Symbols of every page-object class currently imported"""
+    found = set()
+    pending = list(PAGE_BASES)
+    while pending:
+        cls = pending.pop()
+        if _is_page_class(cls):
+            found.add(_symbol(cls))
+        pending.extend(cls.__subclasses__())
+    return found
+
+
+class DependencyRecorder:
+    """Collects the page-object methods, classes and constants used between start() and stop()"""
+    
+    def __init__(self):
+        self.used = None
+    
+    def start(self):
+        self.used = set()
+        add_listener(self._method_called)
+        recorder = self
+        
+        def getattribute(page, name):
+            value = object.__getattribute__(page, name)
+            if recorder.used is not None and name.isupper():
+                for cls in type(page).__mro__:
+                    if name in cls.__dict__:
+                        recorder.used.add(_symbol(cls, name))
+                        break
+            return value
+        
+        for base in PAGE_BASES:
+            base.__getattribute__ = getattribute
+    
+    def stop(self):
+        """Stop recording; returns the sorted symbols used"""
+        for base in PAGE_BASES:
+            del base.__getattribute__
+        remove_listener(self._method_called)
+        used, self.used = self.used, None
+        return sorted(used)
+    
+    def _method_called(self, page_class, func):
+        self.used.add(f"{func.__module__}:{func.__qualname__}")
+        # Inherited members resolve through every class of the MRO
+        for cls in page_class.__mro__:
+            if _is_page_class(cls):
+                self.used.add(_symbol(cls))
+
+
+def _body(nodes):
+    """Statements without a leading docstring"""
+    if nodes and isinstance(nodes[0], ast.Expr) and isinstance(getattr(nodes[0], 'value', None), ast.Constant) \
+            and isinstance(nodes[0].value.value, str):
+        return nodes[1:]
+    return nodes
+
+
+def _member_targets(item):
+    """Names a class-body statement defines as members (as fingerprints() splits them), else None"""
+    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return [item.name]
+    targets = item.targets if isinstance(item, ast.Assign) else [getattr(item, 'target', None)]
+    if isinstance(item, (ast.Assign, ast.AnnAssign)) and all(isinstance(target, ast.Name) for target in targets):
+        return [target.id for target in targets]
+    return None
+
+
+def fingerprints(source, module):
+    """{symbol: ast dump} for each class member, each class header and the module's other code
+    
+    Symbols are 'module:Class.member', 'module:Class' (bases, decorators,
+    other class statements) and 'module:' (everything outside classes).
+    """
+    prints = {}
+    rest = []
+    for node in _body(ast.parse(source).body):
+        if not isinstance(node, ast.ClassDef):
+            rest.append(ast.dump(node))
+            continue
+        header = [ast.dump(item) for item in (*node.bases, *node.keywords, *node.decorator_list)]
+        for item in _body(node.body):
+            members = _member_targets(item)
+            if members is None:
+                header.append(ast.dump(item))
+            elif isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                item.body = _body(item.body) or [ast.Pass()]
+                prints[f"{module}:{node.name}.{item.name}"] = ast.dump(item)
+            else:
+                for name in members:
+                    prints[f"{module}:{node.name}.{name}"] = ast.dump(item.value) if item.value else ''
+        prints[f"{module}:{node.name}"] = '\n'.join(header)
+    prints[f"{module}:"] = '\n'.join(rest)
+    return prints
+
+
+def changed_symbols(old_source, new_source, module):
+    """(symbols whose code or value differs, the subset that is new)"""
+    old = fingerprints(old_source, module) if old_source is not None else {}
+    new = fingerprints(new_source, module) if new_source is not None else {}
+    changed = {symbol for symbol in old.keys() | new.keys() if old.get(symbol) != new.get(symbol)}
+    return changed, new.keys() - old.keys()
+
+
+def _imported_module(name, level, module, modules):
+    """Module an import in module refers to, if it is one of modules ('page_objects' -> its __init__)"""
+    if level:
+        package = module.split('.')[:-1]
+        package = package[:len(package) - level + 1]
+        name = '.'.join(package + ([name] if name else []))
+    for candidate in (name, f"{name}.__init__"):
+        if candidate in modules:
+            return candidate
+    return None
+
+
+def references(source, module, modules):
+    """(modules imported from, {'module:Class.member': symbols of the code that reads it})
+    
+    A read is Class.MEMBER where Class is defined in module or imported
+    from one of modules; the reader is the class member, the class header
+    or 'module:' for code outside classes.
+    """
+    tree = ast.parse(source)
+    names = {}
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            target = _imported_module(node.module, node.level, module, modules)
+            for alias in node.names:
+                submodule = _imported_module(f"{node.module or ''}.{alias.name}".lstrip('.'), node.level, module,
+                                             modules)
+                if submodule:
+                    imported.add(submodule)
+                elif target:
+                    names[alias.asname or alias.name] = f"{target}:{alias.name}"
+            if target:
+                imported.add(target)
+        elif isinstance(node, ast.Import):
+            imported.update(filter(None, (_imported_module(alias.name, 0, module, modules) for alias in node.names)))
+    names.update({node.name: f"{module}:{node.name}" for node in tree.body if isinstance(node, ast.ClassDef)})
+    
+    readers = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            readers.append((f"{module}:", node))
+            continue
+        readers.extend((f"{module}:{node.name}", item) for item in (*node.bases, *node.keywords, *node.decorator_list))
+        for item in node.body:
+            members = _member_targets(item)
+            if members is None:
+                readers.append((f"{module}:{node.name}", item))
+            else:
+                readers.extend((f"{module}:{node.name}.{name}", item) for name in members)
+    
+    reads = {}
+    for reader, node in readers:
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Attribute) and isinstance(sub.value, ast.Name) and sub.value.id in names:
+                reads.setdefault(f"{names[sub.value.id]}.{sub.attr}", set()).add(reader)
+    return imported, reads
+
+
+def page_object_graph(root):
+    """({module: modules importing from it}, {member: readers}) over the page-object sources under root"""
+    sources = {}
+    for directory, subdirectories, files in os.walk(os.path.join(root, PAGE_OBJECTS_PACKAGE)):
+        subdirectories[:] = [name for name in subdirectories if not name.startswith(('.', '__'))]
+        for name in files:
+            if name.endswith('.py'):
+                path = os.path.join(directory, name)
+                sources[os.path.relpath(path, root)[:-3].replace(os.sep, '.')] = path
+    importers, reads = {}, {}
+    for module, path in sources.items():
+        with open(path, encoding='utf-8') as source:
+            try:
+                imported, module_reads = references(source.read(), module, sources)
+            except SyntaxError:
+                continue
+        for target in imported:
+            importers.setdefault(target, set()).add(module)
+        for member, readers in module_reads.items():
+            reads.setdefault(member, set()).update(readers)
+    return importers, reads
+
+
+class ChangeSet:
+    """What changed since the recorded commit, in terms a dependency map understands
+    
+    root is the tree whose page-object sources say which modules import
+    which and which classes copy each other's members (default: the
+    page_objects package in use).
+    """
+    
+    def __init__(self, symbols=(), added=(), test_files=(), full_run_reason=None, files=(), root=None):
+        self.symbols = set(symbols)
+        self.added = set(added)
+        self.test_files = set(test_files)
+        self.full_run_reason = full_run_reason
+        self.files = list(files)
+        self.root = root or os.path.dirname(os.path.dirname(os.path.abspath(page_objects.__file__)))
+
+
+def _git(cwd, *args):
+    return subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+def analyze_changes(base, cwd):
+    """ChangeSet between commit base and the working tree of cwd (paths relative to cwd)"""
+    try:
+        files = _git(cwd, 'diff', '--name-only', '--relative', base, '--').split()
+        files += _git(cwd, 'ls-files', '--others', '--exclude-standard').split()
+    except (OSError, subprocess.CalledProcessError) as exc:
+        return ChangeSet(full_run_reason=f"cannot diff against {base}: {exc}")
+    
+    changes = ChangeSet(files=files, root=cwd)
+    for path in files:
+        if any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_PATTERNS):
+            continue
+        directory, name = os.path.split(path)
+        if directory == 'tests' and name.startswith('test_') and name.endswith('.py'):
+            changes.test_files.add(path)
+            continue
+        if directory.split('/')[0] != PAGE_OBJECTS_PACKAGE or not name.endswith('.py'):
+            changes.full_run_reason = f"{path} changed"
+            return changes
+        module = path[:-3].replace('/', '.')
+        try:
+            old = _git(cwd, 'show', f"{base}:./{path}")
+        except subprocess.CalledProcessError:
+            old = None
+        new_path = os.path.join(cwd, path)
+        new = open(new_path, encoding='utf-8').read() if os.path.exists(new_path) else None
+        try:
+            changed, added = changed_symbols(old, new, module)
+        except SyntaxError as exc:
+            changes.full_run_reason = f"{path} does not parse: {exc}"
+            return changes
+        changes.symbols |= changed
+        changes.added |= added
+    return changes
+
+
+def _full_run(nodeids, changes, reason):
+    changes.full_run_reason = reason
+    return list(nodeids), {nodeid: reason for nodeid in nodeids}
+
+
+def select_tests(nodeids, dependencies, changes):
+    """(selected node ids, reason per selected test) for a ChangeSet
+    
+    dependencies is the stored map: {'tests': {nodeid: [symbols]}, 'page_classes': [symbols]}.
+    """
+    if changes.full_run_reason:
+        return _full_run(nodeids, changes, changes.full_run_reason)
+    recorded = dependencies.get('tests', {})
+    known_classes = set(dependencies.get('page_classes', ()))
+    used = set().union(*recorded.values()) if recorded else set()
+    
+    importers, reads = page_object_graph(changes.root) if changes.symbols else ({}, {})
+    
+    def importing(module):
+        """Every module importing from module, directly or through another one"""
+        found, queue = set(), [module]
+        while queue:
+            for importer in importers.get(queue.pop(), ()):
+                if importer not in found:
+                    found.add(importer)
+                    queue.append(importer)
+        return found
+    
+    def classes_in(modules):
+        return [cls for cls in known_classes if cls.split(':', 1)[0] in modules]
+    
+    # What a changed symbol affects: exact users of a recorded public
+    # member, else every user of its class (private helpers, class headers,
+    # added or removed overrides), else every user of the module and of
+    # the modules importing from it. Page-object members that read a
+    # changed member count as changed; other readers (navigation code)
+    # reach every user of the changed member's class
+    triggers = {}
+    pending = [(symbol, symbol) for symbol in sorted(changes.symbols)]
+    seen = set(changes.symbols)
+    while pending:
+        symbol, reason = pending.pop(0)
+        module, _, qualified = symbol.partition(':')
+        class_name, _, member = qualified.partition('.')
+        class_symbol = f"{module}:{class_name}"
+        for reader in sorted(reads.get(symbol, ()) if member else ()):
+            if reader in seen:
+                continue
+            seen.add(reader)
+            reader_module, _, reader_qualified = reader.partition(':')
+            if f"{reader_module}:{reader_qualified.partition('.')[0]}" in known_classes:
+                pending.append((reader, reason))
+            else:
+                # A reader outside recorded classes is not in the map
+                triggers.setdefault(class_symbol, reason)
+        if not class_name:
+            module_classes = classes_in({module})
+            if not module_classes:
+                return _full_run(nodeids, changes, f"{module} changed outside page objects")
+            for cls in module_classes + classes_in(importing(module)):
+                triggers.setdefault(cls, reason)
+        elif class_symbol not in known_classes:
+            # A class added in this diff has no recorded users yet
+            if class_symbol not in changes.added:
+                return _full_run(nodeids, changes, f"{class_name} in {module} is not a recorded page object")
+        elif member and symbol in used:
+            triggers.setdefault(symbol, reason)
+        else:
+            triggers.setdefault(class_symbol, reason)
+    
+    selected, reasons = [], {}
+    for nodeid in nodeids:
+        path = nodeid.split('::', 1)[0]
+        deps = recorded.get(nodeid)
+        if deps is None:
+            reason = "no recorded dependencies"
+        elif path in changes.test_files:
+            reason = f"{path} changed"
+        else:
+            reason = next((triggers[dep] for dep in deps if dep in triggers), None)
+        if reason is not None:
+            selected.append(nodeid)
+            reasons[nodeid] = reason
+    return selected, reasons
+
+
+def load_dependencies(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as source:
+        return json.load(source)
+
+
+class ChangeSelector:
+    """pytest plugin: records dependencies (record) and/or deselects unaffected tests (select)"""
+    
+    def __init__(self, rootdir, path=DEFAULT_DEPENDENCIES_PATH, record=False, select=False, full_run=False,
+                 base=None):
+        self.rootdir = str(rootdir)
+        self.path = path if os.path.isabs(path) else os.path.join(self.rootdir, path)
+        self.record = record
+        self.select = select and not full_run
+        self.full_run = full_run
+        self.base = base
+        self.dependencies = load_dependencies(self.path)
+        self.recorder = DependencyRecorder()
+        self.recorded = {}
+        self.summary = None
+    
+    def pytest_collection_modifyitems(self, session, config, items):
+        if not self.select:
+            if self.full_run:
+                self.summary = f"🎯 Full run forced: {len(items)} tests"
+            return
+        base = self.base or self.dependencies.get('commit')
+        if not base:
+            changes = ChangeSet(full_run_reason=f"no dependency map in {self.path} (record one with --record-deps)")
+        else:
+            changes = analyze_changes(base, self.rootdir)
+        selected, reasons = select_tests([item.nodeid for item in items], self.dependencies, changes)
+        keep = set(selected)
+        deselected = [item for item in items if item.nodeid not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in keep]
+        if changes.full_run_reason:
+            self.summary = f"🎯 Full run: {changes.full_run_reason}"
+        else:
+            triggers = sorted({reason.split(':', 1)[-1] or reason for reason in reasons.values()})
+            self.summary = (f"🎯 Change-aware selection: {len(selected)} of {len(selected) + len(deselected)} tests "
+                            + (f"(changed: {', '.join(triggers)})" if triggers else "(no page-object changes)"))
+    
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if not self.record:
+            yield
+            return
+        self.recorder.start()
+        try:
+            yield
+        finally:
+            self.recorded[item.nodeid] = self.recorder.stop()
+    
+    def pytest_sessionfinish(self, session):
+        if not self.record or not self.recorded:
+            return
+        try:
+            commit = _git(self.rootdir, 'rev-parse', 'HEAD').strip()
+        except (OSError, subprocess.CalledProcessError):
+            return
+        tests = dict(self.dependencies.get('tests', {}))
+        tests.update(self.recorded)
+        classes = set(self.dependencies.get('page_classes', ())) | page_classes()
+        with open(self.path, 'w', encoding='utf-8') as output:
+            json.dump({'commit': commit, 'page_classes': sorted(classes), 'tests': tests},
+                      output, indent=1, sort_keys=True)
+    
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.summary:
+            terminalreporter.write_line(self.summary)
+        if self.record and self.recorded:
+            terminalreporter.write_line(f"🎯 Dependencies of {len(self.recorded)} tests recorded -> {self.path}")
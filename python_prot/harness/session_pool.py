@@ -0,0 +1,134 @@
+"""
+Session pool that keeps WebDriverAgent sessions alive across tests
+"""
+
+import threading
+from appium import webdriver
+from appium.webdriver.applicationstate import ApplicationState
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import HTTPError
+
+from page_objects.base_page import forget_snapshot
+
+from .capabilities import APPIUM_SERVER_URL, FINDMY_BUNDLE_ID, DEFAULT_DEVICE, build_options
+from .transport import TransportStats, TunedConnection
+
+
+# Errors that mean the session (or the server behind it) is gone
+SESSION_ERRORS = (WebDriverException, HTTPError, OSError)
+
+
+class SessionPool:
+    """Hands out live Appium sessions and only recreates dead ones
+    
+    Sessions are keyed by (server_url, udid) so several devices can share
+    one pool. A released session goes back to the idle list; the next
+    acquire() health-checks it and resets the app to its main screen
+    instead of paying for a new WebDriverAgent session. on_create is
+    called with every new driver, e.g. to attach instrumentation.
+    
+    Drivers talk to Appium over TunedConnection (keep-alive pool, retries,
+    gzip); transport_stats sums their traffic.
+    """
+    
+    def __init__(self, server_url=APPIUM_SERVER_URL, reset=None, bundle_id=FINDMY_BUNDLE_ID, on_create=None):
+        self.server_url = server_url
+        self.reset = reset
+        self.on_create = on_create
+        self.bundle_id = bundle_id
+        self.created = 0
+        self.reused = 0
+        self.recreated = 0
+        self.transport_stats = TransportStats()
+        self._idle = {}
+        self._in_use = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, server_url=None, **overrides):
+        """Check out a healthy session for the given server and device"""
+        server_url = server_url or self.server_url
+        key = (server_url, overrides.get('udid', DEFAULT_DEVICE['udid']))
+        
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                driver = idle.pop() if idle else None
+            if driver is None:
+                driver = self._create(server_url, overrides)
+                break
+            if self.is_alive(driver):
+                self.reused += 1
+                break
+            self._discard(driver)
+            self.recreated += 1
+        
+        with self._lock:
+            self._in_use[id(driver)] = (key, driver)
+        
+        # The previous test's snapshot says nothing about the screen now
+        forget_snapshot(driver)
+        if self.reset is not None:
+            self.reset(driver)
+        return driver
+    
+    def release(self, driver):
+        """Return a session to the pool for the next test"""
+        with self._lock:
+            key, _ = self._in_use.pop(id(driver))
+            self._idle.setdefault(key, []).append(driver)
+    
+    def session(self, server_url=None, **overrides):
+        """Context manager around acquire()/release()"""
+        return _PooledSession(self, server_url, overrides)
+    
+    def is_alive(self, driver):
+        """Check session health and bring the app back to the foreground"""
+        try:
+            state = driver.query_app_state(self.bundle_id)
+            if state != ApplicationState.RUNNING_IN_FOREGROUND:
+                driver.activate_app(self.bundle_id)
+            return True
+        except SESSION_ERRORS:
+            return False
+    
+    def close_all(self):
+        """Quit every session owned by the pool"""
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            drivers += [driver for _, driver in self._in_use.values()]
+            self._idle.clear()
+            self._in_use.clear()
+        for driver in drivers:
+            self._discard(driver)
+    
+    def _create(self, server_url, overrides):
+        connection = TunedConnection(server_url, stats=self.transport_stats)
+        driver = webdriver.Remote(command_executor=connection, options=build_options(**overrides))
+        self.created += 1
+        if self.on_create is not None:
+            self.on_create(driver)
+        return driver
+    
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except SESSION_ERRORS:
+            pass
+
+
+class _PooledSession:
+    """Context manager returned by SessionPool.session()"""
+    
+    def __init__(self, pool, server_url, overrides):
+        self.pool = pool
+        self.server_url = server_url
+        self.overrides = overrides
+        self.driver = None
+    
+    def __enter__(self):
+        self.driver = self.pool.acquire(self.server_url, **self.overrides)
+        return self.driver
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.release(self.driver)
+        return False
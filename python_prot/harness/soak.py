@@ -0,0 +1,350 @@
+"""
+Soak runner: repeat page-object flows and watch their latency drift
+    
+    python -m harness.soak --flows tabs,device_detail --duration 3600
+    python -m harness.soak --fake --fake-drift-ms 0.05 --iterations 300
+
+Every step of every flow is timed into rolling statistics. A step whose
+recent median is well above the median of its first window is reported as
+drifting; steps slower than --step-timeout, or that time out waiting, are
+counted as timeouts. The session's health (status round-trip, app state)
+and memory (UI tree size, client RSS) are sampled periodically.
+"""
+
+import argparse
+import contextlib
+import json
+import resource
+import statistics
+import sys
+import time
+from collections import deque
+
+from selenium.common.exceptions import TimeoutException
+
+from harness.capabilities import APPIUM_SERVER_URL, FINDMY_BUNDLE_ID
+from harness.hierarchy import iter_nodes
+from harness.session_pool import SESSION_ERRORS, SessionPool
+from page_objects import FindMyMainPage
+from page_objects.flight_recorder import recorder as flight_recorder
+
+
+# Samples per rolling window; the first full window is the baseline
+DEFAULT_WINDOW = 50
+# A step drifts when its rolling median is this much above the baseline...
+DEFAULT_DRIFT_THRESHOLD = 0.5
+# ...and at least this much slower in absolute terms (seconds)
+MIN_DRIFT_SECONDS = 0.02
+DEFAULT_STEP_TIMEOUT = 10.0
+DEFAULT_SAMPLE_INTERVAL = 60.0
+PROGRESS_INTERVAL = 30.0
+DEFAULT_REPORT_PATH = 'soak_report.json'
+
+# Flows as (step name, action(page) -> next page object) lists, all starting
+# on the main screen
+FLOWS = {
+    'tabs': [
+        ('devices_tab', lambda page: page.tap_devices_tab()),
+        ('items_tab', lambda page: page.tap_items_tab()),
+        ('me_tab', lambda page: page.tap_me_tab()),
+        ('people_tab', lambda page: page.tap_people_tab()),
+    ],
+    'device_detail': [
+        ('devices_tab', lambda page: page.tap_devices_tab()),
+        ('open_device', lambda page: page.tap_first_device()),
+        ('verify_device', lambda page: page.verify_detail_page_displayed()),
+        ('close_device', lambda page: page.tap_close_button()),
+    ],
+    'person_detail': [
+        ('people_tab', lambda page: page.tap_people_tab()),
+        ('open_person', lambda page: page.tap_first_person()),
+        ('verify_person', lambda page: page.verify_detail_page_displayed()),
+        ('close_person', lambda page: page.tap_close_button()),
+    ],
+}
+
+
+class RollingStats:
+    """Latency of one step: a rolling window against its first window"""
+    
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.recent = deque(maxlen=window)
+        self.baseline = None
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+        self.errors = 0
+    
+    def add(self, seconds):
+        self.recent.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if self.baseline is None and len(self.recent) == self.recent.maxlen:
+            self.baseline = statistics.median(self.recent)
+    
+    @property
+    def median(self):
+        return statistics.median(self.recent) if self.recent else 0.0
+    
+    @property
+    def p95(self):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    
+    def drift(self):
+        """Rolling median relative to the baseline (0.5 = 50% slower), None until two windows ran"""
+        if self.baseline is None or self.count < 2 * self.recent.maxlen:
+            return None
+        return self.median / self.baseline - 1 if self.baseline else 0.0
+    
+    def drifting(self, threshold=DEFAULT_DRIFT_THRESHOLD, min_seconds=MIN_DRIFT_SECONDS):
+        drift = self.drift()
+        return drift is not None and drift > threshold and self.median - self.baseline >= min_seconds
+    
+    def as_dict(self):
+        drift = self.drift()
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            'baseline_p50_ms': round(self.baseline * 1000, 1) if self.baseline is not None else None,
+            'p50_ms': round(self.median * 1000, 1),
+            'p95_ms': round(self.p95 * 1000, 1),
+            'max_ms': round(self.max * 1000, 1),
+            'drift': round(drift, 3) if drift is not None else None,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+        }
+
+
+def client_rss_mb():
+    """Peak resident memory of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def sample_health(driver, bundle_id=FINDMY_BUNDLE_ID):
+    """Status round-trip, app state, UI tree size and client memory"""
+    started = time.perf_counter()
+    status = driver.get_status()
+    status_ms = (time.perf_counter() - started) * 1000
+    return {
+        'ready': bool((status or {}).get('ready', True)),
+        'status_ms': round(status_ms, 1),
+        'app_state': int(driver.query_app_state(bundle_id)),
+        # A tree that keeps growing points at leaked views in the app
+        'ui_elements': sum(1 for _ in iter_nodes(driver.page_source)),
+        'client_rss_mb': client_rss_mb(),
+    }
+
+
+class SoakRunner:
+    """Loop flows on one pooled session and keep rolling statistics per step
+    
+    runner = SoakRunner(SessionPool(server_url=url), ["tabs", "device_detail"])
+    report = runner.run(duration=3600)
+    
+    A failing step is counted and the session recovered through the pool
+    (health check, reset to the main screen or a new session) before the
+    next flow starts. Page-object messages go to the flight recorder and
+    reach the console only when it echoes (--verbose).
+    """
+    
+    def __init__(self, pool, flows=('tabs',), window=DEFAULT_WINDOW, step_timeout=DEFAULT_STEP_TIMEOUT,
+                 drift_threshold=DEFAULT_DRIFT_THRESHOLD, sample_interval=DEFAULT_SAMPLE_INTERVAL, log=print):
+        unknown = [name for name in flows if name not in FLOWS]
+        if unknown:
+            raise ValueError(f"Unknown flows: {', '.join(unknown)} (known: {', '.join(FLOWS)})")
+        self.pool = pool
+        self.flows = list(flows)
+        self.window = window
+        self.step_timeout = step_timeout
+        self.drift_threshold = drift_threshold
+        self.sample_interval = sample_interval
+        self.log = log
+        self.stats = {}
+        self.samples = []
+        self.iterations = 0
+        self.recoveries = 0
+        self.flagged = set()
+        self.driver = None
+        self._started = None
+    
+    def run(self, duration=None, iterations=None):
+        """Repeat the flows until duration seconds or iterations rounds have passed; returns the report"""
+        if duration is None and iterations is None:
+            raise ValueError("Give a duration or a number of iterations")
+        self.driver = self.pool.acquire()
+        self._started = time.monotonic()
+        next_sample = next_progress = self._started
+        try:
+            while (iterations is None or self.iterations < iterations) and \
+                    (duration is None or time.monotonic() - self._started < duration):
+                for flow in self.flows:
+                    self._run_flow(flow)
+                self.iterations += 1
+                now = time.monotonic()
+                if now >= next_sample:
+                    self._sample()
+                    next_sample = now + self.sample_interval
+                if now >= next_progress:
+                    self._progress()
+                    next_progress = now + PROGRESS_INTERVAL
+            self._sample()
+        finally:
+            # A failed recovery leaves no session to give back
+            if self.driver is not None:
+                self.pool.release(self.driver)
+                self.driver = None
+        return self.report()
+    
+    def _step_stats(self, key):
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RollingStats(self.window)
+        return stats
+    
+    def _run_flow(self, flow):
+        page = FindMyMainPage(self.driver)
+        for step, action in FLOWS[flow]:
+            key = f"{flow}.{step}"
+            stats = self._step_stats(key)
+            started = time.perf_counter()
+            try:
+                page = action(page) or page
+            except TimeoutException:
+                stats.timeouts += 1
+                self._flag(key, f"⏰ {key} timed out waiting")
+                self._recover()
+                return
+            except (AssertionError, *SESSION_ERRORS) as exc:
+                stats.errors += 1
+                detail = str(exc).strip().splitlines()[0] if str(exc).strip() else ''
+                self.log(f"❌ {key}: {type(exc).__name__}: {detail}")
+                self._recover()
+                return
+            elapsed = time.perf_counter() - started
+            stats.add(elapsed)
+            if elapsed > self.step_timeout:
+                stats.timeouts += 1
+                self._flag(key, f"⏰ {key} took {elapsed:.1f} s (limit {self.step_timeout:.1f} s)")
+            if stats.drifting(self.drift_threshold):
+                self._flag(key + ' drift', f"📈 {key} drifting: p50 {stats.median * 1000:.0f} ms "
+                                           f"vs {stats.baseline * 1000:.0f} ms at the start ({stats.drift():+.0%})")
+    
+    def _flag(self, key, message):
+        # Alert once per step and kind; the counters keep the totals
+        if key not in self.flagged:
+            self.flagged.add(key)
+            self.log(message)
+    
+    def _recover(self):
+        self.recoveries += 1
+        # acquire() health-checks the session and resets it to the main screen
+        driver, self.driver = self.driver, None
+        self.pool.release(driver)
+        self.driver = self.pool.acquire()
+    
+    def _sample(self):
+        try:
+            sample = sample_health(self.driver)
+        except SESSION_ERRORS as exc:
+            sample = {'ready': False, 'error': type(exc).__name__}
+        sample['elapsed_s'] = round(time.monotonic() - self._started, 1)
+        sample['iteration'] = self.iterations
+        self.samples.append(sample)
+        if not sample['ready']:
+            self.log(f"🩺 Session unhealthy after {sample['elapsed_s']} s: {sample}")
+    
+    def _progress(self):
+        drifts = [(stats.drift(), key) for key, stats in self.stats.items() if stats.drift() is not None]
+        line = f"⏱️  {time.monotonic() - self._started:.0f} s, {self.iterations} iterations"
+        if drifts:
+            drift, key = max(drifts)
+            line += f", largest drift {key} {drift:+.0%}"
+        self.log(line)
+    
+    def drifting_steps(self):
+        return sorted(key for key, stats in self.stats.items() if stats.drifting(self.drift_threshold))
+    
+    def report(self):
+        steps = {key: stats.as_dict() for key, stats in sorted(self.stats.items())}
+        memory = [sample for sample in self.samples if 'ui_elements' in sample]
+        return {
+            'flows': self.flows,
+            'iterations': self.iterations,
+            'elapsed_s': round(time.monotonic() - self._started, 1) if self._started else 0.0,
+            'recoveries': self.recoveries,
+            'drifting': self.drifting_steps(),
+            'timeouts': sum(stats.timeouts for stats in self.stats.values()),
+            'errors': sum(stats.errors for stats in self.stats.values()),
+            'ui_elements_growth': memory[-1]['ui_elements'] - memory[0]['ui_elements'] if memory else 0,
+            'steps': steps,
+            'samples': self.samples,
+        }
+
+
+def print_report(report, log=print):
+    log(f"\n🏁 Soak: {report['iterations']} iterations in {report['elapsed_s']} s, "
+        f"{report['timeouts']} timeouts, {report['errors']} errors, {report['recoveries']} recoveries")
+    for key, stats in report['steps'].items():
+        drift = f"{stats['drift']:+.0%}" if stats['drift'] is not None else "n/a"
+        marker = "📈" if key in report['drifting'] else "  "
+        log(f"{marker} {key:28s} p50 {stats['p50_ms']:8.1f} ms  p95 {stats['p95_ms']:8.1f} ms  "
+            f"max {stats['max_ms']:8.1f} ms  drift {drift:>6s}  timeouts {stats['timeouts']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harness.soak', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--flows', default='tabs', help=f"comma-separated, from: {', '.join(FLOWS)}")
+    parser.add_argument('--duration', type=float, help='seconds to run')
+    parser.add_argument('--iterations', type=int, help='rounds of all flows to run')
+    parser.add_argument('--server-url', default=APPIUM_SERVER_URL)
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help='samples per rolling window')
+    parser.add_argument('--drift-threshold', type=float, default=DEFAULT_DRIFT_THRESHOLD,
+                        help='relative slowdown that counts as drift (0.5 = 50%%)')
+    parser.add_argument('--step-timeout', type=float, default=DEFAULT_STEP_TIMEOUT, help='seconds per step')
+    parser.add_argument('--sample-interval', type=float, default=DEFAULT_SAMPLE_INTERVAL,
+                        help='seconds between health and memory samples')
+    parser.add_argument('--report', default=DEFAULT_REPORT_PATH, help='JSON report')
+    parser.add_argument('--verbose', action='store_true', help='show page-object output')
+    parser.add_argument('--fake', action='store_true', help='run against the stand-in server')
+    parser.add_argument('--fake-latency-ms', type=float, default=0.0)
+    parser.add_argument('--fake-drift-ms', type=float, default=0.0, help='stand-in: extra delay per command served')
+    parser.add_argument('--fake-spike-ms', type=float, default=0.0)
+    parser.add_argument('--fake-spike-every', type=int, default=0)
+    args = parser.parse_args(argv)
+    flight_recorder.echo = args.verbose
+    if args.duration is None and args.iterations is None:
+        parser.error("give --duration or --iterations")
+    
+    with contextlib.ExitStack() as stack:
+        server_url = args.server_url
+        if args.fake:
+            from harness.fake_appium import FakeAppiumServer, LatencyModel, SimulatorBackend
+            latency = LatencyModel(base=args.fake_latency_ms / 1000.0, drift=args.fake_drift_ms / 1000.0,
+                                   spike=args.fake_spike_ms / 1000.0, spike_every=args.fake_spike_every)
+            server_url = stack.enter_context(FakeAppiumServer(SimulatorBackend(), latency=latency)).url
+        
+        pool = SessionPool(server_url=server_url,
+                           reset=lambda driver: FindMyMainPage(driver).return_to_main_screen())
+        stack.callback(pool.close_all)
+        runner = SoakRunner(pool, args.flows.split(','), window=args.window, step_timeout=args.step_timeout,
+                            drift_threshold=args.drift_threshold, sample_interval=args.sample_interval)
+        print(f"🔁 Soaking {', '.join(runner.flows)} on {server_url}")
+        report = runner.run(duration=args.duration, iterations=args.iterations)
+    
+    print_report(report)
+    with open(args.report, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2)
+    print(f"📄 Report: {args.report}")
+    return 1 if report['drifting'] or report['timeouts'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
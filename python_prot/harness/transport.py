@@ -0,0 +1,175 @@
+"""
+Keep-alive, retrying, gzip-aware HTTP transport for Appium sessions
+"""
+
+import threading
+import urllib3
+from appium.webdriver.appium_connection import AppiumConnection
+from appium.webdriver.client_config import AppiumClientConfig
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+# Connections kept open per Appium host (page objects, screenshot workers
+# and pool health checks can overlap)
+POOL_MAXSIZE = 4
+
+# Seconds; a page source from a busy device can take a while to produce
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 120.0
+
+# Transient failures (refused connection, gateway errors from a device-lab
+# proxy) are retried with exponential backoff: 0.2 s, 0.4 s, 0.8 s
+RETRIES = 3
+BACKOFF_FACTOR = 0.2
+RETRY_STATUSES = (502, 503, 504)
+
+# A tap or a new session must not run twice, so only these methods are
+# replayed once the request may have reached the server. Connection errors
+# are retried for every method: nothing was sent.
+IDEMPOTENT_METHODS = frozenset({"GET", "DELETE"})
+
+
+class TransportStats:
+    """Requests, connections opened, retries and bytes saved by gzip"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.retries = 0
+        self.compressed = 0
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def reused(self):
+        """Requests served on an already open connection"""
+        return max(self.requests - self.connections, 0)
+    
+    def count_connection(self):
+        with self._lock:
+            self.connections += 1
+    
+    def count_response(self, response):
+        body = len(response.data or b"")
+        length = response.headers.get("Content-Length")
+        retries = response.retries.history if response.retries is not None else ()
+        with self._lock:
+            self.requests += 1
+            self.retries += len(retries)
+            self.body_bytes += body
+            self.wire_bytes += int(length) if length and length.isdigit() else body
+            if response.headers.get("Content-Encoding") == "gzip":
+                self.compressed += 1
+    
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": self.reused,
+            "reuse_rate": round(self.reused / self.requests, 3) if self.requests else 0.0,
+            "retries": self.retries,
+            "compressed": self.compressed,
+            "wire_bytes": self.wire_bytes,
+            "body_bytes": self.body_bytes,
+        }
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    stats = None
+    
+    def _new_conn(self):
+        if self.stats is not None:
+            self.stats.count_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    stats = None
+    
+    def _new_conn(self):
+        if self.stats is not None:
+            self.stats.count_connection()
+        return super()._new_conn()
+
+
+class _StatsPoolManager(urllib3.PoolManager):
+    """PoolManager whose pools report into one TransportStats"""
+    
+    def __init__(self, stats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+        self.pool_classes_by_scheme = {"http": _CountingHTTPConnectionPool, "https": _CountingHTTPSConnectionPool}
+    
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.stats = self.stats
+        return pool
+    
+    def urlopen(self, method, url, redirect=True, **kw):
+        response = super().urlopen(method, url, redirect=redirect, **kw)
+        self.stats.count_response(response)
+        return response
+
+
+def retry_policy(retries=RETRIES, backoff_factor=BACKOFF_FACTOR):
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        redirect=0,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        # After the last retry, hand the error response to Selenium as usual
+        raise_on_status=False,
+    )
+
+
+class TunedConnection(AppiumConnection):
+    """AppiumConnection with a tuned, instrumented urllib3 pool
+    
+    driver = webdriver.Remote(command_executor=TunedConnection(url), options=...)
+    
+    One persistent keep-alive pool per connection, connect/read timeouts,
+    retries with backoff for transient errors, and Accept-Encoding: gzip
+    so large page sources cross a slow link compressed (urllib3 inflates
+    them). Counters go to stats, which several connections may share.
+    """
+    
+    def __init__(self, server_url, stats=None, pool_maxsize=POOL_MAXSIZE, retries=RETRIES,
+                 backoff_factor=BACKOFF_FACTOR, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        self.stats = stats if stats is not None else TransportStats()
+        self.pool_maxsize = pool_maxsize
+        self.retry = retry_policy(retries, backoff_factor)
+        config = AppiumClientConfig(
+            remote_server_addr=server_url,
+            keep_alive=True,
+            timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+        )
+        super().__init__(client_config=config)
+    
+    @classmethod
+    def get_remote_connection_headers(cls, parsed_url, keep_alive=True):
+        headers = super().get_remote_connection_headers(parsed_url, keep_alive=keep_alive)
+        headers["Accept-Encoding"] = "gzip"
+        return headers
+    
+    def _get_connection_manager(self):
+        if self._proxy_url:
+            # Proxy setups keep Selenium's own manager
+            return super()._get_connection_manager()
+        tls = {}
+        if self._client_config.ignore_certificates:
+            tls["cert_reqs"] = "CERT_NONE"
+        elif self._client_config.ca_certs:
+            tls.update(cert_reqs="CERT_REQUIRED", ca_certs=self._client_config.ca_certs)
+        return _StatsPoolManager(
+            self.stats,
+            maxsize=self.pool_maxsize,
+            retries=self.retry,
+            timeout=self._client_config.timeout,
+            **tls,
+        )
@@ -4,5 +4,6 @@ from .base_page import BasePage
 from .findmy_main_page import FindMyMainPage
 from .people_detail_page import PeopleDetailPage
 from .device_detail_page import DeviceDetailPage
+from .navigation import Navigator
 
-__all__ = ['BasePage', 'FindMyMainPage', 'PeopleDetailPage', 'DeviceDetailPage']
+__all__ = ['BasePage', 'FindMyMainPage', 'PeopleDetailPage', 'DeviceDetailPage', 'Navigator']
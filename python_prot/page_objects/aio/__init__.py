@@ -0,0 +1,16 @@
+"""Async page objects (requires aiohttp)
+    
+    driver = await AsyncAppiumDriver.create(APPIUM_SERVER_URL, build_options())
+    main_page = await AsyncFindMyMainPage(driver).wait_until_ready()
+    detail = await (await main_page.tap_devices_tab()).tap_device_by_name("Chi's Laptop")
+    await detail.tap_play_sound_button()
+"""
+
+from .client import AsyncAppiumDriver, AsyncElement
+from .base_page import AsyncBasePage
+from .findmy_main_page import AsyncFindMyMainPage
+from .people_detail_page import AsyncPeopleDetailPage
+from .device_detail_page import AsyncDeviceDetailPage
+
+__all__ = ['AsyncAppiumDriver', 'AsyncElement', 'AsyncBasePage', 'AsyncFindMyMainPage',
+           'AsyncPeopleDetailPage', 'AsyncDeviceDetailPage']
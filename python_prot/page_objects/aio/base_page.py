@@ -0,0 +1,192 @@
+"""
+Async Base Page Object for driving many devices from one event loop
+"""
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import time
+import weakref
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from ..flight_recorder import WAIT, log, now, recorder, task_lane
+from ..locators import compile_locator
+from ..snapshot import PageSnapshot
+from ..tracing import trace_page_methods
+
+
+logger = logging.getLogger(__name__)
+
+# Latest page-source snapshot per async driver
+_snapshots = weakref.WeakKeyDictionary()
+
+
+class AsyncBasePage:
+    """Async counterpart of BasePage: same contract, awaitable methods"""
+    
+    # Readiness contract: element that must be visible before the page is usable
+    READY_LOCATOR = None
+    
+    # Also wait for a stable page source in wait_until_ready() (see BasePage)
+    SETTLE_HIERARCHY = False
+    
+    # Wait engine tuning
+    FIND_TIMEOUT = 10
+    READY_TIMEOUT = 15
+    SETTLE_TIMEOUT = 3
+    POLL_INTERVAL = 0.2
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        trace_page_methods(cls)
+    
+    def __init__(self, driver):
+        self.driver = driver
+    
+    async def find_element(self, by, value):
+        """Find element with wait"""
+        locator = compile_locator(by, value)
+        
+        async def first_match():
+            elements = await self.driver.find_elements(*locator)
+            return elements[0] if elements else None
+        
+        return await self.wait_until(first_match, self.FIND_TIMEOUT, f"No element matches {locator}")
+    
+    async def find_elements(self, by, value):
+        """Find all matching elements without waiting"""
+        return await self.driver.find_elements(*compile_locator(by, value))
+    
+    async def find_element_by_accessibility_id(self, accessibility_id):
+        """Find element by accessibility ID"""
+        return await self.find_element(AppiumBy.ACCESSIBILITY_ID, accessibility_id)
+    
+    async def find_element_by_xpath(self, xpath):
+        """Find element by XPath"""
+        return await self.find_element(AppiumBy.XPATH, xpath)
+    
+    async def tap(self, element):
+        """Tap on element"""
+        await element.click()
+        self.invalidate_snapshot()
+    
+    async def is_element_visible(self, by, value, timeout=5):
+        """Check if element is visible"""
+        locator = compile_locator(by, value)
+        
+        async def visible():
+            elements = await self.driver.find_elements(*locator)
+            return bool(elements) and await elements[0].is_displayed()
+        
+        try:
+            await self.wait_until(visible, timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    async def get_text(self, element):
+        """Get text from element"""
+        return await element.text()
+    
+    async def snapshot(self):
+        """Parsed page source, fetched once until the UI changes"""
+        snapshot = _snapshots.get(self.driver)
+        if snapshot is None:
+            snapshot = self._store_snapshot(await self.driver.page_source())
+        return snapshot
+    
+    def invalidate_snapshot(self):
+        """Drop the cached snapshot after an action that changes the UI"""
+        _snapshots.pop(self.driver, None)
+    
+    async def locate(self, node):
+        """Fetch the live element for a snapshot node (one round-trip)"""
+        return await self.driver.find_element(*(await self.snapshot()).locator_for(node))
+    
+    def _store_snapshot(self, source):
+        snapshot = PageSnapshot(source)
+        _snapshots[self.driver] = snapshot
+        return snapshot
+    
+    async def wait_until(self, condition, timeout=None, message=""):
+        """Poll condition() until it returns a truthy value
+        
+        condition may be a plain function or a coroutine function. Other
+        tasks on the event loop run while this one sleeps between polls.
+        """
+        started = now()
+        polls = 0
+        deadline = time.monotonic() + (timeout or self.READY_TIMEOUT)
+        while True:
+            polls += 1
+            try:
+                value = condition()
+                if inspect.isawaitable(value):
+                    value = await value
+                if value:
+                    recorder.complete(WAIT, 'wait', started, {'polls': polls}, task_lane())
+                    return value
+            except StaleElementReferenceException:
+                pass
+            if time.monotonic() >= deadline:
+                recorder.complete(WAIT, 'wait', started, {'polls': polls, 'error': 'TimeoutException'}, task_lane())
+                raise TimeoutException(message)
+            await asyncio.sleep(self.POLL_INTERVAL)
+    
+    async def is_ready(self):
+        """Readiness contract: True once the page's key element is visible"""
+        if self.READY_LOCATOR is None:
+            return True
+        elements = await self.find_elements(*self.READY_LOCATOR)
+        return bool(elements) and await elements[0].is_displayed()
+    
+    async def wait_until_ready(self, timeout=None):
+        """Return once the readiness contract holds and the key element has stopped moving"""
+        await self.wait_until(self.is_ready, timeout, f"{type(self).__name__} did not become ready")
+        if self.READY_LOCATOR is not None:
+            await self.wait_for_animation(await self.find_element(*self.READY_LOCATOR))
+        if self.SETTLE_HIERARCHY:
+            await self.wait_for_stable_hierarchy()
+        return self
+    
+    async def wait_for_animation(self, element, timeout=None):
+        """Wait until an element's frame stops moving (animation finished)"""
+        previous = [None]
+        
+        async def frame_is_stable():
+            rect = await element.rect()
+            stable = rect == previous[0]
+            previous[0] = rect
+            return stable
+        
+        return await self._settle(frame_is_stable, timeout, "element frame")
+    
+    async def wait_for_stable_hierarchy(self, timeout=None):
+        """Wait until two consecutive page sources are identical"""
+        previous = [None]
+        
+        async def hierarchy_is_stable():
+            source = await self.driver.page_source()
+            digest = hashlib.sha1(source.encode("utf-8")).digest()
+            stable = digest == previous[0]
+            previous[0] = digest
+            if stable:
+                self._store_snapshot(source)
+            return stable
+        
+        return await self._settle(hierarchy_is_stable, timeout, "page source")
+    
+    async def _settle(self, is_stable, timeout, what):
+        # Best effort, as in BasePage: a screen that never settles is reported, not failed
+        timeout = timeout or self.SETTLE_TIMEOUT
+        try:
+            await self.wait_until(is_stable, timeout)
+            return True
+        except TimeoutException:
+            logger.warning("%s: %s still changing after %.1f s", type(self).__name__, what, timeout)
+            log(f"⚠️  {type(self).__name__}: {what} still changing after {timeout:.1f} s")
+            return False
+
+
+trace_page_methods(AsyncBasePage)
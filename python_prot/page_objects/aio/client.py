@@ -0,0 +1,142 @@
+"""
+Minimal asyncio W3C WebDriver client for the Appium endpoint
+"""
+
+import aiohttp
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    InvalidSessionIdException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from ..flight_recorder import COMMAND, command_args, now, recorder, task_lane
+
+
+# W3C element reference key
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# W3C error codes mapped to the exceptions the synchronous client raises
+ERRORS = {
+    'no such element': NoSuchElementException,
+    'stale element reference': StaleElementReferenceException,
+    'invalid selector': InvalidSelectorException,
+    'invalid session id': InvalidSessionIdException,
+    'timeout': TimeoutException,
+}
+
+
+class AsyncElement:
+    """Remote element handle; every method is one round-trip"""
+    
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+    
+    def __eq__(self, other):
+        return isinstance(other, AsyncElement) and other.id == self.id
+    
+    def __hash__(self):
+        return hash(self.id)
+    
+    async def click(self):
+        await self.driver.execute('POST', f'/element/{self.id}/click', {})
+    
+    async def get_attribute(self, name):
+        return await self.driver.execute('GET', f'/element/{self.id}/attribute/{name}')
+    
+    async def is_displayed(self):
+        return await self.driver.execute('GET', f'/element/{self.id}/displayed')
+    
+    async def rect(self):
+        return await self.driver.execute('GET', f'/element/{self.id}/rect')
+    
+    async def text(self):
+        return await self.driver.execute('GET', f'/element/{self.id}/text')
+
+
+class AsyncAppiumDriver:
+    """One Appium session driven with aiohttp
+    
+    driver = await AsyncAppiumDriver.create(APPIUM_SERVER_URL, build_options())
+    
+    Locators are the (by, value) pairs the synchronous page objects use, so
+    AppiumBy strategies and compiled class chains work unchanged.
+    """
+    
+    def __init__(self, server_url, http):
+        self.server_url = server_url.rstrip('/')
+        self.http = http
+        self.session_id = None
+        self.capabilities = {}
+    
+    @classmethod
+    async def create(cls, server_url, options, timeout=300):
+        """Start a new session from XCUITestOptions"""
+        http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout))
+        driver = cls(server_url, http)
+        try:
+            value = await driver.execute('POST', '/session', {
+                'capabilities': {'alwaysMatch': options.to_capabilities(), 'firstMatch': [{}]},
+            })
+        except BaseException:
+            await http.close()
+            raise
+        driver.session_id = value['sessionId']
+        driver.capabilities = value.get('capabilities', {})
+        return driver
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.quit()
+    
+    async def execute(self, method, path, body=None):
+        """Send one command; path is relative to the session when one exists"""
+        name = f'{method} {path}'
+        if self.session_id is not None and path != '/session':
+            path = f'/session/{self.session_id}{path}'
+        started = now()
+        async with self.http.request(method, self.server_url + path, json=body) as response:
+            payload = await response.json(content_type=None)
+        value = (payload or {}).get('value')
+        args = command_args(body)
+        if response.status >= 400:
+            error = value.get('error', '') if isinstance(value, dict) else ''
+            message = value.get('message', '') if isinstance(value, dict) else str(value)
+            exception = ERRORS.get(error, WebDriverException)
+            recorder.complete(COMMAND, name, started, dict(args, error=exception.__name__), task_lane())
+            raise exception(message)
+        recorder.complete(COMMAND, name, started, args or None, task_lane())
+        return value
+    
+    async def find_element(self, by, value):
+        found = await self.execute('POST', '/element', {'using': by, 'value': value})
+        return AsyncElement(self, found[ELEMENT_KEY])
+    
+    async def find_elements(self, by, value):
+        found = await self.execute('POST', '/elements', {'using': by, 'value': value})
+        return [AsyncElement(self, element[ELEMENT_KEY]) for element in found]
+    
+    async def page_source(self):
+        return await self.execute('GET', '/source')
+    
+    async def execute_script(self, script, *args):
+        return await self.execute('POST', '/execute/sync', {'script': script, 'args': list(args)})
+    
+    async def activate_app(self, bundle_id):
+        await self.execute_script('mobile: activateApp', {'bundleId': bundle_id})
+    
+    async def query_app_state(self, bundle_id):
+        return await self.execute_script('mobile: queryAppState', {'bundleId': bundle_id})
+    
+    async def quit(self):
+        """End the session and close the HTTP connections"""
+        try:
+            if self.session_id is not None:
+                await self.execute('DELETE', '')
+        finally:
+            self.session_id = None
+            await self.http.close()
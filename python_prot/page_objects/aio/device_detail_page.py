@@ -0,0 +1,59 @@
+"""
+Async Device Detail Page Object
+"""
+
+from appium.webdriver.common.appiumby import AppiumBy
+from ..device_detail_page import DeviceDetailPage
+from ..flight_recorder import log
+from .base_page import AsyncBasePage
+
+
+class AsyncDeviceDetailPage(AsyncBasePage):
+    """Async page object for Device detail screen"""
+    
+    # Identifiers are shared with the synchronous page object
+    CLOSE_BUTTON = DeviceDetailPage.CLOSE_BUTTON
+    PLAY_SOUND_BUTTON = DeviceDetailPage.PLAY_SOUND_BUTTON
+    DIRECTIONS_BUTTON = DeviceDetailPage.DIRECTIONS_BUTTON
+    LOST_MODE_BUTTON = DeviceDetailPage.LOST_MODE_BUTTON
+    
+    READY_LOCATOR = DeviceDetailPage.READY_LOCATOR
+    
+    async def tap_close_button(self):
+        """Close the detail page"""
+        from .findmy_main_page import AsyncFindMyMainPage
+        await self.tap(await self.find_element_by_accessibility_id(self.CLOSE_BUTTON))
+        log("✅ Closed Device detail page")
+        return await AsyncFindMyMainPage(self.driver).wait_until_ready()
+    
+    async def tap_play_sound_button(self):
+        """Tap play sound button"""
+        await self.tap(await self.find_element_by_accessibility_id(self.PLAY_SOUND_BUTTON))
+        log("✅ Tapped Play Sound button")
+        return self
+    
+    async def tap_directions_button(self):
+        """Tap directions button"""
+        await self.tap(await self.find_element_by_accessibility_id(self.DIRECTIONS_BUTTON))
+        log("✅ Tapped Directions button")
+        return self
+    
+    async def tap_lost_mode_button(self):
+        """Tap lost mode button"""
+        await self.tap(await self.find_element_by_accessibility_id(self.LOST_MODE_BUTTON))
+        log("✅ Tapped Lost Mode button")
+        return self
+    
+    async def get_device_name(self):
+        """Get device name from the page"""
+        return await self.get_text(await self.find_element_by_accessibility_id("PrimaryLabel"))
+    
+    async def is_map_visible(self):
+        """Check if map is visible"""
+        return await self.is_element_visible(AppiumBy.CLASS_NAME, "XCUIElementTypeMap")
+    
+    async def verify_detail_page_displayed(self):
+        """Verify the detail page is displayed"""
+        assert await self.is_map_visible(), "Map should be visible on detail page"
+        log("✅ Device detail page is displayed")
+        return self
@@ -0,0 +1,166 @@
+"""
+Async FindMy Main Page Object
+"""
+
+from appium.webdriver.common.appiumby import AppiumBy
+from ..findmy_main_page import FindMyMainPage
+from ..flight_recorder import log
+from ..locators import table_cell_containing
+from .base_page import AsyncBasePage
+
+
+class AsyncFindMyMainPage(AsyncBasePage):
+    """Async page object for FindMy app main screen"""
+    
+    # Identifiers are shared with the synchronous page object
+    PEOPLE_TAB = FindMyMainPage.PEOPLE_TAB
+    DEVICES_TAB = FindMyMainPage.DEVICES_TAB
+    ITEMS_TAB = FindMyMainPage.ITEMS_TAB
+    ME_TAB = FindMyMainPage.ME_TAB
+    CLOSE_BUTTON = FindMyMainPage.CLOSE_BUTTON
+    FIRST_CELL = "//XCUIElementTypeTable/XCUIElementTypeCell[1]"
+    
+    READY_LOCATOR = FindMyMainPage.READY_LOCATOR
+    SETTLE_HIERARCHY = FindMyMainPage.SETTLE_HIERARCHY
+    
+    async def return_to_main_screen(self, max_pages=3):
+        """Close any open detail pages without relaunching the app"""
+        for _ in range(max_pages):
+            close_buttons = await self.find_elements(AppiumBy.ACCESSIBILITY_ID, self.CLOSE_BUTTON)
+            if not close_buttons:
+                break
+            await self.tap(close_buttons[0])
+        return self
+    
+    async def is_ready(self):
+        """Ready when the tab bar is visible and no detail page covers it"""
+        if await self.find_elements(AppiumBy.ACCESSIBILITY_ID, self.CLOSE_BUTTON):
+            return False
+        return await super().is_ready()
+    
+    async def wait_for_tab_selected(self, tab):
+        """Wait until a tab button reports selected and its list has settled"""
+        async def selected():
+            return await tab.get_attribute("selected") == "true"
+        
+        await self.wait_until(selected, message="Tab was not selected")
+        await self.wait_for_stable_hierarchy()
+        return self
+    
+    async def _tap_tab(self, name):
+        tab = await self.find_element_by_accessibility_id(name)
+        await self.tap(tab)
+        await self.wait_for_tab_selected(tab)
+        log(f"✅ Tapped {name} tab")
+        return self
+    
+    async def tap_people_tab(self):
+        """Navigate to People tab"""
+        return await self._tap_tab(self.PEOPLE_TAB)
+    
+    async def tap_devices_tab(self):
+        """Navigate to Devices tab"""
+        return await self._tap_tab(self.DEVICES_TAB)
+    
+    async def tap_items_tab(self):
+        """Navigate to Items tab"""
+        return await self._tap_tab(self.ITEMS_TAB)
+    
+    async def tap_me_tab(self):
+        """Navigate to Me tab"""
+        return await self._tap_tab(self.ME_TAB)
+    
+    async def is_people_tab_selected(self):
+        """Check if People tab is selected"""
+        people_tab = await self.find_element_by_accessibility_id(self.PEOPLE_TAB)
+        return await people_tab.get_attribute("selected") == "true"
+    
+    async def is_devices_tab_selected(self):
+        """Check if Devices tab is selected"""
+        devices_tab = await self.find_element_by_accessibility_id(self.DEVICES_TAB)
+        return await devices_tab.get_attribute("selected") == "true"
+    
+    async def tap_first_person(self):
+        """Tap on first person in the list"""
+        from .people_detail_page import AsyncPeopleDetailPage
+        await self.tap(await self.find_element_by_xpath(self.FIRST_CELL))
+        log("✅ Tapped first person")
+        return await AsyncPeopleDetailPage(self.driver).wait_until_ready()
+    
+    async def tap_first_device(self):
+        """Tap on first device in the list"""
+        from .device_detail_page import AsyncDeviceDetailPage
+        await self.tap(await self.find_element_by_xpath(self.FIRST_CELL))
+        log("✅ Tapped first device")
+        return await AsyncDeviceDetailPage(self.driver).wait_until_ready()
+    
+    async def get_all_people_names(self):
+        """Get all people names from the list"""
+        return [cell.label for cell in (await self.snapshot()).table_cells()]
+    
+    async def get_all_device_names(self):
+        """Get all device names from the list"""
+        return [cell.label for cell in (await self.snapshot()).table_cells()]
+    
+    async def scroll_list(self, direction):
+        """Scroll the visible list one page up or down"""
+        tables = (await self.snapshot()).find_by_type("XCUIElementTypeTable")
+        options = {"direction": direction}
+        if tables:
+            options["elementId"] = (await self.locate(tables[0])).id
+        await self.driver.execute_script("mobile: scroll", options)
+        self.invalidate_snapshot()
+    
+    async def find_cell(self, text):
+        """First cell whose label contains text (case-insensitive), or None
+        
+        Walks the list like FindMyMainPage.iter_cells(): up to the top, then
+        down a page at a time until a match or the end of the list.
+        """
+        budget = FindMyMainPage.MAX_SCROLLS
+        while budget > 0 and not (await self.snapshot()).list_at_top():
+            await self.scroll_list("up")
+            budget -= 1
+        while True:
+            snapshot = await self.snapshot()
+            cell = snapshot.find_cell(text)
+            if cell is not None or snapshot.list_at_end() or budget <= 0:
+                return cell
+            await self.scroll_list("down")
+            budget -= 1
+    
+    async def tap_cell_containing(self, text):
+        """Tap the first cell whose label contains text (case-insensitive); False if there is none
+        
+        As in FindMyMainPage: one server-side query first, the scrolling
+        walk only on a miss.
+        """
+        cells = await self.find_elements(*table_cell_containing(text))
+        if not cells:
+            cell = await self.find_cell(text)
+            if cell is None:
+                return False
+            element = await self.locate(cell)
+            if not cell.visible:
+                await self.driver.execute_script("mobile: scroll", {"elementId": element.id, "toVisible": True})
+            cells = [element]
+        await self.tap(cells[0])
+        return True
+    
+    async def tap_device_by_name(self, device_name):
+        """Tap on a device by its name"""
+        from .device_detail_page import AsyncDeviceDetailPage
+        if not await self.tap_cell_containing(device_name):
+            raise Exception(f"❌ Device '{device_name}' not found in the list")
+        
+        log(f"✅ Tapped device: {device_name}")
+        return await AsyncDeviceDetailPage(self.driver).wait_until_ready()
+    
+    async def tap_person_by_name(self, person_name):
+        """Tap on a person by their name"""
+        from .people_detail_page import AsyncPeopleDetailPage
+        if not await self.tap_cell_containing(person_name):
+            raise Exception(f"❌ Person '{person_name}' not found in the list")
+        
+        log(f"✅ Tapped person: {person_name}")
+        return await AsyncPeopleDetailPage(self.driver).wait_until_ready()
@@ -0,0 +1,52 @@
+"""
+Async People Detail Page Object
+"""
+
+from appium.webdriver.common.appiumby import AppiumBy
+from ..people_detail_page import PeopleDetailPage
+from ..flight_recorder import log
+from .base_page import AsyncBasePage
+
+
+class AsyncPeopleDetailPage(AsyncBasePage):
+    """Async page object for People detail screen"""
+    
+    # Identifiers are shared with the synchronous page object
+    CLOSE_BUTTON = PeopleDetailPage.CLOSE_BUTTON
+    CONTACT_BUTTON = PeopleDetailPage.CONTACT_BUTTON
+    DIRECTIONS_BUTTON = PeopleDetailPage.DIRECTIONS_BUTTON
+    
+    READY_LOCATOR = PeopleDetailPage.READY_LOCATOR
+    
+    async def tap_close_button(self):
+        """Close the detail page"""
+        from .findmy_main_page import AsyncFindMyMainPage
+        await self.tap(await self.find_element_by_accessibility_id(self.CLOSE_BUTTON))
+        log("✅ Closed People detail page")
+        return await AsyncFindMyMainPage(self.driver).wait_until_ready()
+    
+    async def tap_contact_button(self):
+        """Tap contact button"""
+        await self.tap(await self.find_element_by_accessibility_id(self.CONTACT_BUTTON))
+        log("✅ Tapped Contact button")
+        return self
+    
+    async def tap_directions_button(self):
+        """Tap directions button"""
+        await self.tap(await self.find_element_by_accessibility_id(self.DIRECTIONS_BUTTON))
+        log("✅ Tapped Directions button")
+        return self
+    
+    async def get_person_name(self):
+        """Get person's name from the page"""
+        return await self.get_text(await self.find_element_by_accessibility_id("PrimaryLabel"))
+    
+    async def is_map_visible(self):
+        """Check if map is visible"""
+        return await self.is_element_visible(AppiumBy.CLASS_NAME, "XCUIElementTypeMap")
+    
+    async def verify_detail_page_displayed(self):
+        """Verify the detail page is displayed"""
+        assert await self.is_map_visible(), "Map should be visible on detail page"
+        log("✅ People detail page is displayed")
+        return self
@@ -2,21 +2,167 @@
 Base Page Object for Appium tests
 """
 
+import hashlib
+import logging
+import weakref
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from .element_cache import ElementCache
+from .flight_recorder import log
+from .locators import TolerantId, compile_locator
+from .snapshot import PageSnapshot
+from .tracing import page_method_stack, trace_page_methods
+from .waits import poll
+
+
+logger = logging.getLogger(__name__)
+
+# Latest page-source snapshot per driver, shared by every page object on it
+_snapshots = weakref.WeakKeyDictionary()
+
+# Element handle cache per driver
+_element_caches = weakref.WeakKeyDictionary()
+
+# Window width in points per driver, to map screenshot pixels to points
+_window_widths = weakref.WeakKeyDictionary()
+
+# Drivers whose app-lifecycle commands drop their snapshot
+_watched_drivers = weakref.WeakSet()
+
+# Scripts that relaunch, background or bring back the app under test
+LIFECYCLE_SCRIPTS = frozenset({
+    'mobile: activateApp', 'mobile: terminateApp', 'mobile: backgroundApp', 'mobile: launchApp',
+})
+
+
+def forget_snapshot(driver):
+    """Drop a driver's cached page-source snapshot (the app changed without a page-object tap)"""
+    _snapshots.pop(driver, None)
+
+
+def _watch_app_lifecycle(driver):
+    # activate_app() and friends change the screen behind the page objects' back
+    if driver is None or driver in _watched_drivers:
+        return
+    execute = driver.execute
+    
+    def watched_execute(driver_command, params=None):
+        try:
+            return execute(driver_command, params)
+        finally:
+            if params and params.get('script') in LIFECYCLE_SCRIPTS:
+                forget_snapshot(driver)
+    
+    driver.execute = watched_execute
+    _watched_drivers.add(driver)
 
 
 class BasePage:
     """Base page object with common methods"""
     
+    # Readiness contract: element that must be visible before the page is usable
+    READY_LOCATOR = None
+    
+    # Also wait in wait_until_ready() until two page sources match. Opt-in:
+    # it costs at least two page_source round-trips, and screens with a live
+    # map never settle.
+    SETTLE_HIERARCHY = False
+    
+    # Screenshot pipeline (e.g. harness.screenshots.ScreenshotPipeline) that
+    # take_screenshot() and every ready screen hand captures to; None = direct
+    screenshot_sink = None
+    
+    # Hierarchy archive (e.g. harness.hierarchy.HierarchyArchive) that every
+    # stored snapshot is recorded to, labelled with the running page method
+    hierarchy_sink = None
+    
+    # Visual checks (page_objects.visual.VisualChecker): a page that names a
+    # VISUAL_REFERENCE is then judged ready and displayed from one screenshot.
+    # VISUAL_MASKS are rects in points left out of the comparison (maps,
+    # names, timestamps).
+    visual_checker = None
+    VISUAL_REFERENCE = None
+    VISUAL_MASKS = ()
+    VISUAL_TOLERANCE = 0.01
+    
+    # Wait engine tuning
+    FIND_TIMEOUT = 10
+    READY_TIMEOUT = 15
+    SETTLE_TIMEOUT = 3
+    POLL_INTERVAL = 0.2
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        trace_page_methods(cls)
+    
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        _watch_app_lifecycle(driver)
     
     def find_element(self, by, value):
-        """Find element with wait"""
-        return self.wait.until(EC.presence_of_element_located((by, value)))
+        """Find element with an adaptive wait (polled around its usual latency)
+        
+        Accessibility-id lookups are served from the session's element cache
+        until this screen is left. A TolerantId is resolved by
+        find_tolerant().
+        """
+        if isinstance(value, TolerantId):
+            return self.find_tolerant(value)
+        locator = compile_locator(by, value)
+        if locator[0] == AppiumBy.ACCESSIBILITY_ID:
+            return self.element_cache().get(type(self).__name__, locator,
+                                            lambda: self._wait_for_element(locator),
+                                            lambda: self.driver.find_element(*locator))
+        return self._wait_for_element(locator)
+    
+    def _wait_for_element(self, locator):
+        def first_match():
+            elements = self.driver.find_elements(*locator)
+            return elements[0] if elements else None
+        
+        return poll(first_match, self.FIND_TIMEOUT, f"No element matches {locator}", key=locator)
+    
+    def find_tolerant(self, tolerant):
+        """Find the element for any variant of a TolerantId and record which one matched
+        
+        A settled snapshot names the element without a round-trip, so the
+        lookup is the usual accessibility-id query. Otherwise one predicate
+        query covers every variant and the match's name is read back. A
+        changed state or wording costs a round-trip, not a timeout.
+        """
+        def fetch():
+            if self._is_settled():
+                match = tolerant.best(self.snapshot().by_name)
+                if match is not None:
+                    elements = self.driver.find_elements(AppiumBy.ACCESSIBILITY_ID, match[1])
+                    if elements:
+                        tolerant.record(*match)
+                        return elements[0]
+            locator = tolerant.locator()
+            elements = poll(lambda: self.driver.find_elements(*locator), self.FIND_TIMEOUT,
+                            f"No element matches {tolerant!r}: {locator[1]}", key=tolerant)
+            names = [element.get_attribute("name") for element in elements]
+            variant, name = tolerant.best(names) or (tolerant.ranked()[0], names[0])
+            tolerant.record(variant, name)
+            return elements[names.index(name)]
+        
+        return self.element_cache().get(type(self).__name__, tolerant, fetch,
+                                        lambda: self.driver.find_element(*tolerant.locator()))
+    
+    def element_cache(self):
+        """Element handles cached for this driver's session"""
+        cache = _element_caches.get(self.driver)
+        if cache is None:
+            cache = _element_caches[self.driver] = ElementCache()
+        return cache
+    
+    def leave_screen(self):
+        """Forget the cached elements of this screen (call after navigating away)"""
+        self.element_cache().clear(type(self).__name__)
+    
+    def find_elements(self, by, value):
+        """Find all matching elements without waiting"""
+        return self.driver.find_elements(*compile_locator(by, value))
     
     def find_element_by_accessibility_id(self, accessibility_id):
         """Find element by accessibility ID"""
@@ -29,22 +175,194 @@ class BasePage:
     def tap(self, element):
         """Tap on element"""
         element.click()
+        self.invalidate_snapshot()
+    
+    def batch(self):
+        """Queue taps, pauses and swipes to send as few W3C Actions calls as possible"""
+        from .gestures import ActionBatch
+        return ActionBatch(self)
     
     def is_element_visible(self, by, value, timeout=5):
-        """Check if element is visible"""
+        """Check if element is visible
+        
+        One zero-wait query answers it when the element is there; otherwise
+        poll adaptively until timeout, since the screen may still change
+        without a tap (late alerts, live list updates). An element going
+        stale between lookup and is_displayed() is retried like any poll;
+        session and transport errors are raised, not reported as "not
+        visible".
+        """
+        locator = compile_locator(by, value)
+        
+        def visible():
+            elements = self.driver.find_elements(*locator)
+            return bool(elements) and elements[0].is_displayed()
+        
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((by, value))
-            )
-            return True
-        except:
+            return poll(visible, timeout or 0, key=locator)
+        except TimeoutException:
             return False
     
+    def is_element_absent(self, by, value):
+        """Fast negative check: True if the element is not visible right now
+        
+        Costs one zero-wait query against the live UI instead of a full
+        visibility timeout. It does not wait for the hierarchy to settle:
+        screens with a live map never do.
+        """
+        return not self.is_element_visible(by, value, timeout=0)
+    
     def get_text(self, element):
         """Get text from element"""
         return element.text
     
     def take_screenshot(self, filename):
-        """Take screenshot"""
+        """Take screenshot (queued to the screenshot pipeline when one is set)"""
+        if self.screenshot_sink is not None:
+            self.screenshot_sink.capture(self.driver, filename)
+            return
         self.driver.save_screenshot(filename)
-        print(f"📸 Screenshot saved: {filename}")
+        log(f"📸 Screenshot saved: {filename}")
+    
+    def snapshot(self):
+        """Parsed page source, fetched once until the UI changes"""
+        snapshot = _snapshots.get(self.driver)
+        if snapshot is None:
+            snapshot = self._store_snapshot(self.driver.page_source)
+        return snapshot
+    
+    def invalidate_snapshot(self):
+        """Drop the cached snapshot after an action that changes the UI"""
+        forget_snapshot(self.driver)
+    
+    def locate(self, node):
+        """Fetch the live element for a snapshot node (one round-trip)"""
+        return self.driver.find_element(*self.snapshot().locator_for(node))
+    
+    def _store_snapshot(self, source, settled=False):
+        if self.hierarchy_sink is not None:
+            methods = page_method_stack()
+            self.hierarchy_sink.record(source, methods[0] if methods else type(self).__name__)
+        snapshot = PageSnapshot(source)
+        snapshot.settled = settled
+        _snapshots[self.driver] = snapshot
+        return snapshot
+    
+    def _is_settled(self):
+        # A settled snapshot is dropped by the next tap, app-lifecycle command
+        # or pool checkout; the screen may still change on its own, so this only
+        # picks the likely variant for find_tolerant(), which verifies it
+        snapshot = _snapshots.get(self.driver)
+        return snapshot is not None and snapshot.settled
+    
+    def wait_until(self, condition, timeout=None, message="", key=None):
+        """Poll condition(driver) until it returns a truthy value
+        
+        With a key, polling follows the latency learned for that key;
+        without one it polls every POLL_INTERVAL.
+        """
+        interval = None if key is not None else self.POLL_INTERVAL
+        return poll(lambda: condition(self.driver), timeout or self.READY_TIMEOUT, message,
+                    key=key, interval=interval)
+    
+    def uses_visual_check(self):
+        """True when readiness and verification compare against a reference image"""
+        checker = self.visual_checker
+        return (checker is not None and self.VISUAL_REFERENCE is not None
+                and not checker.update and checker.has_reference(self.VISUAL_REFERENCE))
+    
+    def matches_reference(self):
+        """Compare one screenshot against the page's reference image (a VisualResult)
+        
+        In update mode the screenshot becomes the new reference.
+        """
+        png = self.driver.get_screenshot_as_png()
+        return self.visual_checker.check(self.VISUAL_REFERENCE, png, self.VISUAL_MASKS,
+                                         self._screen_scale(png), self.VISUAL_TOLERANCE)
+    
+    def _screen_scale(self, png):
+        # Screenshot pixels per point; the window size is asked once per session
+        width = _window_widths.get(self.driver)
+        if width is None:
+            width = _window_widths[self.driver] = self.driver.get_window_size()["width"]
+        return int.from_bytes(png[16:20], "big") / width  # IHDR width
+    
+    def is_ready(self):
+        """Readiness contract: True once the page's key element is visible
+        
+        Pages with a visual reference are ready when a screenshot matches it.
+        """
+        if self.uses_visual_check():
+            return self.matches_reference().matched
+        if self.READY_LOCATOR is None:
+            return True
+        cached = self.element_cache().peek(type(self).__name__, compile_locator(*self.READY_LOCATOR))
+        if cached is not None:
+            return cached.is_displayed()
+        elements = self.find_elements(*self.READY_LOCATOR)
+        return bool(elements) and elements[0].is_displayed()
+    
+    def wait_until_ready(self, timeout=None):
+        """Return once the readiness contract holds and the key element has stopped moving
+        
+        Pages with SETTLE_HIERARCHY also wait for a stable page source.
+        """
+        self.wait_until(
+            lambda _: self.is_ready(),
+            timeout,
+            f"{type(self).__name__} did not become ready",
+            key=("ready", type(self).__name__),
+        )
+        # A matching screenshot already rules out a frame still in motion
+        if self.READY_LOCATOR is not None and not self.uses_visual_check():
+            self.wait_for_animation(self.find_element(*self.READY_LOCATOR))
+        if self.SETTLE_HIERARCHY:
+            self.wait_for_stable_hierarchy()
+        if self.visual_checker is not None and self.visual_checker.update and self.VISUAL_REFERENCE is not None:
+            self.matches_reference()
+        if self.screenshot_sink is not None:
+            self.screenshot_sink.capture(self.driver, f"{type(self).__name__} ready")
+        return self
+    
+    def wait_for_animation(self, element, timeout=None):
+        """Wait until an element's frame stops moving (animation finished)"""
+        previous = [None]
+        
+        def frame_is_stable(_):
+            rect = element.rect
+            stable = rect == previous[0]
+            previous[0] = rect
+            return stable
+        
+        return self._settle(frame_is_stable, timeout, "element frame")
+    
+    def wait_for_stable_hierarchy(self, timeout=None):
+        """Wait until two consecutive page sources are identical"""
+        previous = [None]
+        
+        def hierarchy_is_stable(driver):
+            source = driver.page_source
+            digest = hashlib.sha1(source.encode("utf-8")).digest()
+            stable = digest == previous[0]
+            previous[0] = digest
+            if stable:
+                # A settled source is exactly what the next lookup needs
+                self._store_snapshot(source, settled=True)
+            return stable
+        
+        return self._settle(hierarchy_is_stable, timeout, "page source")
+    
+    def _settle(self, is_stable, timeout, what):
+        # Settling is best effort: the readiness contract already holds, so a
+        # screen that never stops changing must not fail the test, but it is reported.
+        timeout = timeout or self.SETTLE_TIMEOUT
+        try:
+            self.wait_until(is_stable, timeout)
+            return True
+        except TimeoutException:
+            logger.warning("%s: %s still changing after %.1f s", type(self).__name__, what, timeout)
+            log(f"⚠️  {type(self).__name__}: {what} still changing after {timeout:.1f} s")
+            return False
+
+
+trace_page_methods(BasePage)
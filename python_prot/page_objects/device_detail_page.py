@@ -4,6 +4,13 @@ Device Detail Page Object
 
 from appium.webdriver.common.appiumby import AppiumBy
 from .base_page import BasePage
+from .flight_recorder import log
+from .locators import TolerantId
+
+
+# Detail card regions (points) whose content changes from run to run
+MAP_AREA = (0, 0, 390, 420)
+NAME_AREA = (16, 440, 300, 30)
 
 
 class DeviceDetailPage(BasePage):
@@ -11,9 +18,17 @@ class DeviceDetailPage(BasePage):
     
     # Element identifiers
     CLOSE_BUTTON = "Close"
-    PLAY_SOUND_BUTTON = "Play Sound,Off"
-    DIRECTIONS_BUTTON = "Directions,"
-    LOST_MODE_BUTTON = "Lost Mode, Enable additional protection, Off"
+    # The play sound and lost mode ids end in the control's state
+    PLAY_SOUND_BUTTON = TolerantId("Play Sound,Off", pattern=r"Play Sound(,.*)?")
+    DIRECTIONS_BUTTON = TolerantId("Directions,", "Directions, ")
+    LOST_MODE_BUTTON = TolerantId("Lost Mode, Enable additional protection, Off", prefix="Lost Mode,")
+    
+    # Ready when the map is visible
+    READY_LOCATOR = (AppiumBy.CLASS_NAME, "XCUIElementTypeMap")
+    
+    # Visual check: the card layout, ignoring the live map and the name
+    VISUAL_REFERENCE = "device_detail"
+    VISUAL_MASKS = (MAP_AREA, NAME_AREA)
     
     def __init__(self, driver):
         super().__init__(driver)
@@ -23,28 +38,29 @@ class DeviceDetailPage(BasePage):
         from .findmy_main_page import FindMyMainPage
         close_btn = self.find_element_by_accessibility_id(self.CLOSE_BUTTON)
         self.tap(close_btn)
-        print("✅ Closed Device detail page")
-        return FindMyMainPage(self.driver)
+        self.leave_screen()
+        log("✅ Closed Device detail page")
+        return FindMyMainPage(self.driver).wait_until_ready()
     
     def tap_play_sound_button(self):
         """Tap play sound button"""
         play_sound_btn = self.find_element_by_accessibility_id(self.PLAY_SOUND_BUTTON)
         self.tap(play_sound_btn)
-        print("✅ Tapped Play Sound button")
+        log("✅ Tapped Play Sound button")
         return self
     
     def tap_directions_button(self):
         """Tap directions button"""
         directions_btn = self.find_element_by_accessibility_id(self.DIRECTIONS_BUTTON)
         self.tap(directions_btn)
-        print("✅ Tapped Directions button")
+        log("✅ Tapped Directions button")
         return self
     
     def tap_lost_mode_button(self):
         """Tap lost mode button"""
         lost_mode_btn = self.find_element_by_accessibility_id(self.LOST_MODE_BUTTON)
         self.tap(lost_mode_btn)
-        print("✅ Tapped Lost Mode button")
+        log("✅ Tapped Lost Mode button")
         return self
     
     def get_device_name(self):
@@ -58,7 +74,11 @@ class DeviceDetailPage(BasePage):
         return self.is_element_visible(AppiumBy.CLASS_NAME, "XCUIElementTypeMap")
     
     def verify_detail_page_displayed(self):
-        """Verify the detail page is displayed"""
-        assert self.is_map_visible(), "Map should be visible on detail page"
-        print("✅ Device detail page is displayed")
+        """Verify the detail page is displayed (visually when a reference exists)"""
+        if self.uses_visual_check():
+            result = self.matches_reference()
+            assert result.matched, f"Device detail page should match its reference: {result}"
+        else:
+            assert self.is_map_visible(), "Map should be visible on detail page"
+        log("✅ Device detail page is displayed")
         return self
@@ -0,0 +1,91 @@
+"""
+Per-session cache of element handles for stable controls
+"""
+
+from appium.webdriver.webelement import WebElement
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+
+class CachedElement(WebElement):
+    """Element handle that re-finds itself once when the server reports it stale"""
+    
+    def __init__(self, element, refetch):
+        super().__init__(element.parent, element.id)
+        self._refetch = refetch
+    
+    def _execute(self, command, params=None):
+        try:
+            return super()._execute(command, params)
+        except StaleElementReferenceException:
+            self._id = self._refetch().id
+            return super()._execute(command, params)
+
+
+class ElementCache:
+    """Element handles keyed by (screen, locator), with hit/miss counters
+    
+    Only lookups that identify a control by accessibility id are cached:
+    tab-bar and detail-page buttons keep their reference for as long as the
+    screen is up. Leaving a screen drops its entries; a handle that went
+    stale anyway is fetched again transparently.
+    """
+    
+    # Counters summed over every session of the process
+    totals = {'hits': 0, 'misses': 0, 'stale': 0}
+    
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+    
+    def get(self, screen, locator, fetch, find_now):
+        """Cached element for (screen, locator)
+        
+        fetch() (which may wait) is called on a miss; find_now() (which must
+        not) re-finds a handle that went stale, and the entry is dropped if
+        the element is gone.
+        """
+        key = (screen, locator)
+        element = self.entries.get(key)
+        if element is not None:
+            self.hits += 1
+            self.totals['hits'] += 1
+            return element
+        
+        self.misses += 1
+        self.totals['misses'] += 1
+        
+        def refetch():
+            self.stale += 1
+            self.totals['stale'] += 1
+            try:
+                return find_now()
+            except NoSuchElementException:
+                self.entries.pop(key, None)
+                raise
+        
+        element = CachedElement(fetch(), refetch)
+        self.entries[key] = element
+        return element
+    
+    def peek(self, screen, locator):
+        """Cached element or None, without counting a lookup"""
+        return self.entries.get((screen, locator))
+    
+    def clear(self, screen=None):
+        """Drop every entry, or only those of one screen"""
+        if screen is None:
+            self.entries.clear()
+        else:
+            for key in [key for key in self.entries if key[0] == screen]:
+                del self.entries[key]
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -4,6 +4,8 @@ FindMy Main Page Object
 
 from appium.webdriver.common.appiumby import AppiumBy
 from .base_page import BasePage
+from .flight_recorder import log
+from .locators import table_cell_containing
 
 
 class FindMyMainPage(BasePage):
@@ -15,35 +17,77 @@ class FindMyMainPage(BasePage):
     ITEMS_TAB = "Items"
     ME_TAB = "Me"
     
+    # Close button shared by the People and Device detail pages
+    CLOSE_BUTTON = "Close"
+    
+    # Ready when the tab bar is visible
+    READY_LOCATOR = (AppiumBy.ACCESSIBILITY_ID, PEOPLE_TAB)
+    
+    # The list under the tab bar may still be loading once the tab bar is ready
+    SETTLE_HIERARCHY = True
+    
+    # Upper bound on page scrolls for one pass over a list (~9 rows each)
+    MAX_SCROLLS = 100
+    
     def __init__(self, driver):
         super().__init__(driver)
     
+    def return_to_main_screen(self, max_pages=3):
+        """Close any open detail pages without relaunching the app"""
+        for _ in range(max_pages):
+            close_buttons = self.find_elements(AppiumBy.ACCESSIBILITY_ID, self.CLOSE_BUTTON)
+            if not close_buttons:
+                break
+            self.tap(close_buttons[0])
+            # Detail-page handles do not survive the close
+            self.element_cache().clear()
+        return self
+    
+    def is_ready(self):
+        """Ready when the tab bar is visible and no detail page covers it"""
+        if self.find_elements(AppiumBy.ACCESSIBILITY_ID, self.CLOSE_BUTTON):
+            return False
+        return super().is_ready()
+    
+    def wait_for_tab_selected(self, tab):
+        """Wait until a tab button reports selected and its list has settled"""
+        self.wait_until(
+            lambda _: tab.get_attribute("selected") == "true",
+            message="Tab was not selected",
+        )
+        self.wait_for_stable_hierarchy()
+        return self
+    
     def tap_people_tab(self):
         """Navigate to People tab"""
         people_tab = self.find_element_by_accessibility_id(self.PEOPLE_TAB)
         self.tap(people_tab)
-        print("✅ Tapped People tab")
+        self.wait_for_tab_selected(people_tab)
+        log("✅ Tapped People tab")
         return self
     
     def tap_devices_tab(self):
         """Navigate to Devices tab"""
         devices_tab = self.find_element_by_accessibility_id(self.DEVICES_TAB)
         self.tap(devices_tab)
-        print("✅ Tapped Devices tab")
+        self.wait_for_tab_selected(devices_tab)
+        log("✅ Tapped Devices tab")
         return self
     
     def tap_items_tab(self):
         """Navigate to Items tab"""
         items_tab = self.find_element_by_accessibility_id(self.ITEMS_TAB)
         self.tap(items_tab)
-        print("✅ Tapped Items tab")
+        self.wait_for_tab_selected(items_tab)
+        log("✅ Tapped Items tab")
         return self
     
     def tap_me_tab(self):
         """Navigate to Me tab"""
         me_tab = self.find_element_by_accessibility_id(self.ME_TAB)
         self.tap(me_tab)
-        print("✅ Tapped Me tab")
+        self.wait_for_tab_selected(me_tab)
+        log("✅ Tapped Me tab")
         return self
     
     def is_people_tab_selected(self):
@@ -62,8 +106,8 @@ class FindMyMainPage(BasePage):
         # Find first cell in table
         first_cell = self.find_element_by_xpath("//XCUIElementTypeTable/XCUIElementTypeCell[1]")
         self.tap(first_cell)
-        print("✅ Tapped first person")
-        return PeopleDetailPage(self.driver)
+        log("✅ Tapped first person")
+        return PeopleDetailPage(self.driver).wait_until_ready()
     
     def tap_first_device(self):
         """Tap on first device in the list"""
@@ -71,45 +115,109 @@ class FindMyMainPage(BasePage):
         # Find first cell in table
         first_cell = self.find_element_by_xpath("//XCUIElementTypeTable/XCUIElementTypeCell[1]")
         self.tap(first_cell)
-        print("✅ Tapped first device")
-        return DeviceDetailPage(self.driver)
+        log("✅ Tapped first device")
+        return DeviceDetailPage(self.driver).wait_until_ready()
     
     def get_all_people_names(self):
         """Get all people names from the list"""
-        cells = self.driver.find_elements(AppiumBy.XPATH, "//XCUIElementTypeTable/XCUIElementTypeCell")
-        names = [cell.get_attribute("label") for cell in cells]
-        return names
+        return [cell.label for cell in self.iter_cells()]
     
     def get_all_device_names(self):
         """Get all device names from the list"""
-        cells = self.driver.find_elements(AppiumBy.XPATH, "//XCUIElementTypeTable/XCUIElementTypeCell")
-        names = [cell.get_attribute("label") for cell in cells]
-        return names
+        return [cell.label for cell in self.iter_cells()]
+    
+    def iter_cells(self, from_top=True, max_scrolls=None):
+        """Stream the current list's cells in order, scrolling a page at a time
+        
+        Every materialised row of a snapshot (including the off-screen rows
+        the table prefetches) is yielded before the next scroll, and each
+        label only once. Stops at the end of the list, after max_scrolls,
+        or as soon as the caller stops iterating.
+        """
+        budget = self.MAX_SCROLLS if max_scrolls is None else max_scrolls
+        table = None
+        if from_top:
+            while budget > 0 and not self.snapshot().list_at_top():
+                table = self.scroll_list("up", table)
+                budget -= 1
+        
+        seen = set()
+        while True:
+            fresh = [cell for cell in self.snapshot().table_cells() if cell.text not in seen]
+            for cell in fresh:
+                seen.add(cell.text)
+                yield cell
+            if not fresh or self.snapshot().list_at_end() or budget <= 0:
+                return
+            table = self.scroll_list("down", table)
+            budget -= 1
+    
+    def find_cell(self, text):
+        """First cell whose label contains text (case-insensitive), or None
+        
+        The cells already on screen are checked first, then the list is
+        streamed from the top until a match appears.
+        """
+        match = self.snapshot().find_cell(text)
+        if match is None:
+            text = text.lower()
+            match = next((cell for cell in self.iter_cells() if text in cell.text.lower()), None)
+        return match
+    
+    def scroll_list(self, direction, table=None):
+        """Scroll the visible list one page "up" or "down"; returns the table element
+        
+        Pass the returned element back in to save a lookup on the next scroll.
+        """
+        if table is None:
+            tables = self.snapshot().find_by_type("XCUIElementTypeTable")
+            table = self.locate(tables[0]) if tables else None
+        options = {"direction": direction}
+        if table is not None:
+            options["elementId"] = table.id
+        self.driver.execute_script("mobile: scroll", options)
+        self.invalidate_snapshot()
+        return table
+    
+    def tap_cell(self, cell):
+        """Tap a snapshot cell, scrolling it into view first if it is off screen"""
+        element = self.locate(cell)
+        if not cell.visible:
+            self.driver.execute_script("mobile: scroll", {"elementId": element.id, "toVisible": True})
+        self.tap(element)
+        return self
+    
+    def tap_cell_containing(self, text):
+        """Tap the first cell whose label contains text (case-insensitive); False if there is none
+        
+        One server-side query covers the rows already in the hierarchy; only
+        on a miss is the list streamed from the top to find a row below the fold.
+        """
+        cells = self.find_elements(*table_cell_containing(text))
+        if cells:
+            self.tap(cells[0])
+            return True
+        text = text.lower()
+        cell = next((cell for cell in self.iter_cells() if text in cell.text.lower()), None)
+        if cell is None:
+            return False
+        self.tap_cell(cell)
+        return True
     
     def tap_device_by_name(self, device_name):
         """Tap on a device by its name"""
         from .device_detail_page import DeviceDetailPage
-        # Find all cells and search for the one containing the device name
-        cells = self.driver.find_elements(AppiumBy.XPATH, "//XCUIElementTypeTable/XCUIElementTypeCell")
-        for cell in cells:
-            label = cell.get_attribute("label")
-            if device_name.lower() in label.lower():
-                self.tap(cell)
-                print(f"✅ Tapped device: {device_name}")
-                return DeviceDetailPage(self.driver)
+        if not self.tap_cell_containing(device_name):
+            raise Exception(f"❌ Device '{device_name}' not found in the list")
         
-        raise Exception(f"❌ Device '{device_name}' not found in the list")
+        log(f"✅ Tapped device: {device_name}")
+        return DeviceDetailPage(self.driver).wait_until_ready()
     
     def tap_person_by_name(self, person_name):
         """Tap on a person by their name"""
         from .people_detail_page import PeopleDetailPage
-        # Find all cells and search for the one containing the person name
-        cells = self.driver.find_elements(AppiumBy.XPATH, "//XCUIElementTypeTable/XCUIElementTypeCell")
-        for cell in cells:
-            label = cell.get_attribute("label")
-            if person_name.lower() in label.lower():
-                self.tap(cell)
-                print(f"✅ Tapped person: {person_name}")
-                return PeopleDetailPage(self.driver)
+        if not self.tap_cell_containing(person_name):
+            raise Exception(f"❌ Person '{person_name}' not found in the list")
         
-        raise Exception(f"❌ Person '{person_name}' not found in the list")
+        log(f"✅ Tapped person: {person_name}")
+        return PeopleDetailPage(self.driver).wait_until_ready()
@@ -0,0 +1,179 @@
+"""
+In-process flight recorder: the last N timeline events of the run
+
+Page-object methods, WebDriver commands, waits, test phases and page-object
+messages are appended to a bounded ring buffer as plain tuples instead of
+being printed. export() writes the buffer as a Chrome trace-event file
+(chrome://tracing or https://ui.perfetto.dev) in which spans nest by time:
+test → phase → page method → wait → command.
+"""
+
+import asyncio
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+DEFAULT_CAPACITY = 50000
+
+# Event categories
+TEST = 'test'
+PAGE = 'page'
+COMMAND = 'command'
+WAIT = 'wait'
+LOG = 'log'
+
+# Command parameters worth keeping (locator of a lookup, script name)
+COMMAND_ARGS = ('using', 'value', 'script')
+
+# Timestamps of every event, in nanoseconds
+now = time.perf_counter_ns
+
+
+def task_lane():
+    """Lane of the running asyncio task, so concurrent flows get their own track"""
+    task = asyncio.current_task()
+    if task is None:
+        return threading.get_ident()
+    lane = id(task)
+    if lane not in recorder.lane_names:
+        recorder.lane_names[lane] = task.get_name()
+    return lane
+
+
+class FlightRecorder:
+    """Ring buffer of (phase, category, name, start ns, duration ns, lane, args) tuples
+    
+    Recording costs a clock read and a deque append; nothing is formatted
+    until export(). Once capacity events are held the oldest are dropped.
+    """
+    
+    def __init__(self, capacity=DEFAULT_CAPACITY, echo=False):
+        self.enabled = True
+        # Also print log() messages, as page objects used to
+        self.echo = echo
+        self.recorded = 0
+        self._events = collections.deque(maxlen=capacity)
+        # Labels of lanes that are not threads (asyncio tasks)
+        self.lane_names = {}
+    
+    @property
+    def capacity(self):
+        return self._events.maxlen
+    
+    def resize(self, capacity):
+        """Keep the newest capacity events from now on"""
+        self._events = collections.deque(self._events, maxlen=capacity)
+    
+    def __len__(self):
+        return len(self._events)
+    
+    @property
+    def dropped(self):
+        """Events overwritten since the recorder was created or cleared"""
+        return self.recorded - len(self._events)
+    
+    def clear(self):
+        self._events.clear()
+        self.recorded = 0
+    
+    def complete(self, category, name, started, args=None, lane=None):
+        """A span from started (a now() value) until now"""
+        if self.enabled:
+            self._events.append(('X', category, name, started, now() - started,
+                                 lane or threading.get_ident(), args))
+            self.recorded += 1
+    
+    def instant(self, category, name, args=None, lane=None):
+        if self.enabled:
+            self._events.append(('i', category, name, now(), 0, lane or threading.get_ident(), args))
+            self.recorded += 1
+    
+    def log(self, message, **args):
+        """What page objects record instead of print()"""
+        if self.echo:
+            print(message)
+        self.instant(LOG, message, args or None)
+    
+    @contextlib.contextmanager
+    def span(self, category, name, **args):
+        started = now()
+        try:
+            yield args
+        except BaseException as exc:
+            args['error'] = type(exc).__name__
+            raise
+        finally:
+            self.complete(category, name, started, args or None)
+    
+    def attach(self, driver):
+        """Record every command of a WebDriver as a span"""
+        execute = driver.execute
+        
+        def recorded_execute(driver_command, params=None):
+            started = now()
+            try:
+                result = execute(driver_command, params)
+            except Exception as exc:
+                args = dict(command_args(params), error=type(exc).__name__)
+                self.complete(COMMAND, driver_command, started, args)
+                raise
+            self.complete(COMMAND, driver_command, started, command_args(params) or None)
+            return result
+        
+        driver.execute = recorded_execute
+        return driver
+    
+    def trace_events(self):
+        """The buffer as Chrome trace-event dicts (timestamps in microseconds)"""
+        pid = os.getpid()
+        events = list(self._events)
+        lanes = {thread.ident: thread.name for thread in threading.enumerate()}
+        lanes.update(self.lane_names)
+        trace = [{'ph': 'M', 'name': 'process_name', 'pid': pid, 'tid': 0, 'args': {'name': 'pytest'}}]
+        for lane in sorted({event[5] for event in events}):
+            if lane in lanes:
+                trace.append({'ph': 'M', 'name': 'thread_name', 'pid': pid, 'tid': lane,
+                              'args': {'name': lanes[lane]}})
+        for phase, category, name, started, duration, lane, args in events:
+            event = {'ph': phase, 'cat': category, 'name': name, 'ts': started / 1000, 'pid': pid, 'tid': lane}
+            if phase == 'X':
+                event['dur'] = duration / 1000
+            else:
+                event['s'] = 't'
+            if args:
+                event['args'] = args
+            trace.append(event)
+        return trace
+    
+    def export(self, path, **metadata):
+        """Write the buffer as a trace-event JSON file and return its path"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump({
+                'traceEvents': self.trace_events(),
+                'displayTimeUnit': 'ms',
+                'otherData': dict(metadata, capacity=self.capacity, dropped_events=self.dropped),
+            }, output, default=str)
+        return path
+
+
+def command_args(params):
+    """The COMMAND_ARGS of a command's parameters"""
+    if not params:
+        return {}
+    return {key: params[key] for key in COMMAND_ARGS if key in params}
+
+
+# Shared by every page object, driver and test of the process
+recorder = FlightRecorder()
+
+
+def log(message, **args):
+    """Record a page-object message (printed only when recorder.echo is set)"""
+    recorder.log(message, **args)
@@ -0,0 +1,267 @@
+"""
+Batched W3C Actions: chain taps, pauses and swipes into one round-trip
+"""
+
+import abc
+import time
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.webdriver.remote.command import Command
+
+
+# How a step changes the screen, for resolving the steps after it
+CONTENT = "content"  # the visible content changes, the tab bar stays (tab switch)
+SCREEN = "screen"    # everything may change (a detail page opens or closes)
+
+# Pause between two queued gestures so the UI registers each one (ms)
+STEP_GAP_MS = 150
+SWIPE_DURATION_MS = 300
+
+
+def _center(rect):
+    x, y, width, height = rect
+    return x + width // 2, y + height // 2
+
+
+class _Step(abc.ABC):
+    """One queued gesture"""
+    
+    navigates = None
+    # Target position survives CONTENT changes (tab-bar buttons)
+    persistent = False
+    
+    @abc.abstractmethod
+    def resolve(self, snapshot):
+        """Viewport points for the gesture, or None when the target is not on screen"""
+    
+    @abc.abstractmethod
+    def actions(self, points):
+        """W3C pointer actions performing the gesture at the resolved points"""
+    
+    @abc.abstractmethod
+    def fallback(self, page):
+        """Perform the step on its own, finding the target with a wait"""
+
+
+class _Tap(_Step):
+    def __init__(self, target, navigates=None, persistent=False):
+        self.target = target
+        self.navigates = navigates
+        self.persistent = persistent
+    
+    def resolve(self, snapshot):
+        if isinstance(self.target, tuple):
+            return [self.target]
+        nodes = [node for node in snapshot.find_by_accessibility_id(self.target) if node.visible]
+        return [_center(nodes[0].rect)] if nodes else None
+    
+    def actions(self, points):
+        x, y = points[0]
+        return [
+            {"type": "pointerMove", "duration": 0, "origin": "viewport", "x": x, "y": y},
+            {"type": "pointerDown", "button": 0},
+            {"type": "pointerUp", "button": 0},
+        ]
+    
+    def fallback(self, page):
+        if isinstance(self.target, tuple):
+            page.driver.execute(Command.W3C_ACTIONS, {"actions": [_pointer(self.actions([self.target]))]})
+            return
+        page.tap(page.find_element(AppiumBy.ACCESSIBILITY_ID, self.target))
+    
+    def __repr__(self):
+        return f"tap({self.target!r})"
+
+
+class _TapCell(_Tap):
+    navigates = SCREEN
+    
+    def __init__(self, text):
+        self.target = text
+    
+    def resolve(self, snapshot):
+        cell = snapshot.find_cell(self.target)
+        return [_center(cell.rect)] if cell is not None and cell.visible else None
+    
+    def fallback(self, page):
+        from .findmy_main_page import FindMyMainPage
+        main_page = FindMyMainPage(page.driver)
+        
+        def find_cell(_):
+            main_page.invalidate_snapshot()
+            return main_page.find_cell(self.target)
+        
+        cell = main_page.wait_until(find_cell, main_page.FIND_TIMEOUT, f"❌ No cell matches '{self.target}'",
+                                    key=("cell", self.target))
+        main_page.tap_cell(cell)
+    
+    def __repr__(self):
+        return f"tap_cell({self.target!r})"
+
+
+class _Pause(_Step):
+    def __init__(self, seconds):
+        self.seconds = seconds
+    
+    def resolve(self, snapshot):
+        return []
+    
+    def actions(self, points):
+        return [{"type": "pause", "duration": int(self.seconds * 1000)}]
+    
+    def fallback(self, page):
+        time.sleep(self.seconds)
+    
+    def __repr__(self):
+        return f"pause({self.seconds})"
+
+
+class _Swipe(_Step):
+    """Swipe between two points, or one page up/down inside the visible list"""
+    
+    navigates = CONTENT
+    
+    def __init__(self, start=None, end=None, direction=None):
+        self.start = start
+        self.end = end
+        self.direction = direction
+        # The list keeps its frame while its rows move
+        self.persistent = direction is not None
+    
+    def resolve(self, snapshot):
+        if self.direction is None:
+            return [self.start, self.end]
+        tables = snapshot.find_by_type("XCUIElementTypeTable")
+        if not tables:
+            return None
+        x, y, width, height = tables[0].rect
+        top, bottom = y + height // 5, y + height * 4 // 5
+        # Content moves down the list when the finger moves up
+        if self.direction == "down":
+            return [(x + width // 2, bottom), (x + width // 2, top)]
+        return [(x + width // 2, top), (x + width // 2, bottom)]
+    
+    def actions(self, points):
+        (start_x, start_y), (end_x, end_y) = points
+        return [
+            {"type": "pointerMove", "duration": 0, "origin": "viewport", "x": start_x, "y": start_y},
+            {"type": "pointerDown", "button": 0},
+            {"type": "pointerMove", "duration": SWIPE_DURATION_MS, "origin": "viewport", "x": end_x, "y": end_y},
+            {"type": "pointerUp", "button": 0},
+        ]
+    
+    def fallback(self, page):
+        page.driver.execute_script("mobile: swipe", {"direction": "up" if self.direction == "down" else "down"})
+        page.invalidate_snapshot()
+    
+    def __repr__(self):
+        return f"swipe({self.direction or (self.start, self.end)!r})"
+
+
+class _WaitFor:
+    def __init__(self, page_class):
+        self.page_class = page_class
+    
+    def __repr__(self):
+        return f"wait_for({self.page_class.__name__})"
+
+
+def _pointer(actions):
+    return {"type": "pointer", "id": "finger1", "parameters": {"pointerType": "touch"}, "actions": actions}
+
+
+class ActionBatch:
+    """Queue gestures, then send every run of resolvable ones as one W3C Actions call
+    
+    batch = main_page.batch()
+    batch.tap_tab("Devices").tap_cell("Chi's Laptop").wait_for(DeviceDetailPage)
+    batch.tap("Play Sound,Off").tap("Close", navigates=SCREEN)
+    detail = batch.perform()
+    
+    Targets are resolved to screen points from the page-source snapshot.
+    Steps after one that changes the screen are resolved against the new
+    screen: the queued actions are sent first and the hierarchy is read
+    again once it settles. A target that is still missing then is found and
+    tapped on its own, with the usual wait.
+    """
+    
+    def __init__(self, page):
+        self.page = page
+        self.steps = []
+        self.round_trips = 0
+        self.batched = 0
+        self.fallbacks = 0
+        self._pending = []
+        self._changed = None
+    
+    def tap(self, target, navigates=None):
+        """Tap an accessibility id or an (x, y) point; navigates: None, CONTENT or SCREEN"""
+        self.steps.append(_Tap(target, navigates))
+        return self
+    
+    def tap_tab(self, name):
+        """Tap a tab-bar button (its position survives the tab switch)"""
+        self.steps.append(_Tap(name, CONTENT, persistent=True))
+        return self
+    
+    def tap_cell(self, text):
+        """Tap the visible list cell whose label contains text"""
+        self.steps.append(_TapCell(text))
+        return self
+    
+    def swipe(self, direction=None, start=None, end=None):
+        """Swipe the visible list one page "up"/"down", or from start to end"""
+        self.steps.append(_Swipe(start, end, direction))
+        return self
+    
+    def pause(self, seconds):
+        self.steps.append(_Pause(seconds))
+        return self
+    
+    def wait_for(self, page_class):
+        """Send what is queued and wait until page_class is ready"""
+        self.steps.append(_WaitFor(page_class))
+        return self
+    
+    def perform(self):
+        """Run every step; returns the page object of the last wait_for (or the batch's page)"""
+        page = self.page
+        for step in self.steps:
+            if isinstance(step, _WaitFor):
+                self._flush(page)
+                page = step.page_class(page.driver).wait_until_ready()
+                continue
+            
+            if self._changed == SCREEN or (self._changed == CONTENT and not step.persistent):
+                self._flush(page)
+                page.wait_for_stable_hierarchy()
+            points = step.resolve(page.snapshot())
+            if points is None and self._pending:
+                # The target may only appear once the queued gestures have run
+                self._flush(page)
+                page.wait_for_stable_hierarchy()
+                points = step.resolve(page.snapshot())
+            
+            if points is None:
+                self._flush(page)
+                step.fallback(page)
+                self.fallbacks += 1
+            else:
+                if self._pending:
+                    self._pending.append({"type": "pause", "duration": STEP_GAP_MS})
+                self._pending.extend(step.actions(points))
+                self.batched += 1
+            self._changed = step.navigates or self._changed
+        self._flush(page)
+        self.steps = []
+        return page
+    
+    def _flush(self, page):
+        if self._pending:
+            page.driver.execute(Command.W3C_ACTIONS, {"actions": [_pointer(self._pending)]})
+            self.round_trips += 1
+            self._pending = []
+            page.invalidate_snapshot()
+        if self._changed is not None:
+            # Handles cached for the screens left behind are no longer valid
+            page.element_cache().clear()
+        self._changed = None
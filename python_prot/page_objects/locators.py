@@ -0,0 +1,280 @@
+"""
+Locator compiler: XPath to native iOS class-chain / predicate queries,
+and accessibility ids that tolerate state and wording changes
+"""
+
+import logging
+import re
+import weakref
+from appium.webdriver.common.appiumby import AppiumBy
+from .flight_recorder import log
+
+
+logger = logging.getLogger(__name__)
+
+# Attributes XCUITest understands in predicates and class chains
+_ATTRIBUTES = ('name', 'label', 'value', 'type', 'enabled', 'visible', 'selected')
+
+# One location step: "Type" or "*", optional attribute predicates, optional index
+_STEP = re.compile(
+    r"(?P<type>XCUIElementType\w+|\*)"
+    r"(?P<filters>(?:\[(?!\d)(?:[^\]'\"]|'[^']*'|\"[^\"]*\")*\])*)"
+    r"(?:\[(?P<index>\d+)\])?$"
+)
+_FILTER = re.compile(r"\[((?:[^\]'\"]|'[^']*'|\"[^\"]*\")*)\]")
+_STRING = r"(?:'(?P<sq>[^']*)'|\"(?P<dq>[^\"]*)\")"
+_EQUALS = re.compile(r"^\s*@(?P<attr>\w+)\s*=\s*" + _STRING + r"\s*$")
+_FUNCTION = re.compile(
+    r"^\s*(?P<func>contains|starts-with)\(\s*@(?P<attr>\w+)\s*,\s*" + _STRING + r"\s*\)\s*$"
+)
+_OPERATORS = {'contains': 'CONTAINS', 'starts-with': 'BEGINSWITH'}
+
+_compiled = {}
+_uncompiled = {}
+
+# Every live TolerantId, for stale_ids()
+_tolerant_ids = weakref.WeakSet()
+
+
+def quote(text):
+    """Quote a string literal for an NSPredicate / class chain predicate"""
+    escaped = text.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def table_cell_containing(text):
+    """Server-side query for the first table cell whose label contains text"""
+    return (
+        AppiumBy.IOS_CLASS_CHAIN,
+        f"**/XCUIElementTypeTable/XCUIElementTypeCell[`label CONTAINS[c] {quote(text)}`]",
+    )
+
+
+class _Variant:
+    """One way a TolerantId may read: exact name, name prefix or regex"""
+    
+    __slots__ = ('operator', 'text', 'hits')
+    
+    def __init__(self, operator, text):
+        self.operator = operator
+        self.text = text
+        self.hits = 0
+    
+    def clause(self):
+        return f"name {self.operator} {quote(self.text)}"
+    
+    def matches(self, name):
+        if self.operator == '==':
+            return name == self.text
+        if self.operator == 'BEGINSWITH':
+            return name.startswith(self.text)
+        return re.fullmatch(self.text, name, re.S) is not None
+    
+    def __repr__(self):
+        return self.clause()
+
+
+class TolerantId:
+    """Accessibility id whose text may carry state or change with the OS
+    
+    PLAY_SOUND_BUTTON = TolerantId("Play Sound,Off", pattern=r"Play Sound(,.*)?")
+    DIRECTIONS_BUTTON = TolerantId("Directions,", "Directions, ")
+    
+    The first name is the expected one; further names, a prefix and an
+    NSPredicate MATCHES regex are accepted alternatives. All of them are
+    resolved by one predicate query, and the variants that matched most
+    often so far are ranked first. Names other than the expected one are
+    reported by stale_ids().
+    """
+    
+    def __init__(self, name, *alternatives, prefix=None, pattern=None):
+        self.name = name
+        self.variants = [_Variant('==', text) for text in (name, *alternatives)]
+        if prefix is not None:
+            self.variants.append(_Variant('BEGINSWITH', prefix))
+        if pattern is not None:
+            self.variants.append(_Variant('MATCHES', pattern))
+        self.lookups = 0
+        # Matched names other than the expected one, with counts
+        self.stale = {}
+        _tolerant_ids.add(self)
+    
+    def ranked(self):
+        """Variants by observed success rate, declaration order among equals"""
+        return sorted(self.variants, key=lambda variant: -variant.hits)
+    
+    def success_rate(self, variant):
+        return variant.hits / self.lookups if self.lookups else 0.0
+    
+    def locator(self):
+        """One -ios predicate string query matching any variant"""
+        return AppiumBy.IOS_PREDICATE, ' OR '.join(variant.clause() for variant in self.ranked())
+    
+    def best(self, names):
+        """(variant, name) for the best-ranked variant that one of names matches, or None"""
+        for variant in self.ranked():
+            for name in names:
+                if name and variant.matches(name):
+                    return variant, name
+        return None
+    
+    def record(self, variant, name):
+        """Count a resolution; a name other than the expected one is reported"""
+        self.lookups += 1
+        variant.hits += 1
+        if name != self.name:
+            if name not in self.stale:
+                logger.warning("Accessibility id %r matched %r via %r", self.name, name, variant)
+            self.stale[name] = self.stale.get(name, 0) + 1
+            log(f"🏷️  {self.name!r} matched {name!r} ({variant})")
+    
+    def __str__(self):
+        return self.name
+    
+    def __repr__(self):
+        return f"TolerantId({self.name!r})"
+
+
+def stale_ids():
+    """{expected name: {name actually matched: count}} for ids that matched another variant"""
+    found = {}
+    for tolerant in _tolerant_ids:
+        for name, count in tolerant.stale.items():
+            matched = found.setdefault(tolerant.name, {})
+            matched[name] = matched.get(name, 0) + count
+    return found
+
+
+def compile_locator(by, value):
+    """Translate a locator into the fastest equivalent native query
+    
+    Only XPath is rewritten; anything that cannot be translated is
+    returned unchanged and recorded in uncompiled_locators(). A TolerantId
+    becomes its predicate query.
+    """
+    if isinstance(value, TolerantId):
+        return value.locator()
+    if by != AppiumBy.XPATH:
+        return by, value
+    if value in _compiled:
+        return _compiled[value]
+    
+    compiled = compile_xpath(value)
+    if compiled is None:
+        if value not in _uncompiled:
+            logger.warning("XPath locator has no native translation: %s", value)
+        _uncompiled[value] = _uncompiled.get(value, 0) + 1
+        compiled = (by, value)
+    _compiled[value] = compiled
+    return compiled
+
+
+def uncompiled_locators():
+    """XPath locators that fell back to XPath, with how often they were compiled"""
+    return dict(_uncompiled)
+
+
+def compile_xpath(xpath):
+    """Compile a supported XPath shape, or return None
+    
+    Supported: //Step(/Step|//Step)* where each step is an element type
+    or *, optionally filtered by @attr='v', contains(@attr, 'v') or
+    starts-with(@attr, 'v'), and optionally indexed. (//Step)[n] is
+    supported too. Indexes on a step right after // are not, because
+    XPath and class chains count them differently.
+    """
+    xpath = xpath.strip()
+    outer_index = None
+    grouped = re.match(r"^\((//.+)\)\[(\d+)\]$", xpath)
+    if grouped:
+        xpath, outer_index = grouped.group(1), int(grouped.group(2))
+    if not xpath.startswith('//') or xpath.startswith('///'):
+        return None
+    
+    steps = []
+    descendant = True
+    for raw in _split_steps(xpath[2:]):
+        if raw == '':
+            # "//" in the middle of the path
+            if descendant:
+                return None
+            descendant = True
+            continue
+        match = _STEP.match(raw)
+        if match is None:
+            return None
+        conditions = []
+        for body in _FILTER.findall(match.group('filters')):
+            condition = _compile_condition(body)
+            if condition is None:
+                return None
+            conditions.append(condition)
+        index = match.group('index')
+        if index and descendant:
+            return None
+        steps.append((match.group('type'), conditions, int(index) if index else None, descendant))
+        descendant = False
+    
+    if not steps or descendant:
+        return None
+    if outer_index is not None and len(steps) > 1:
+        return None
+    
+    element_type, conditions, _, _ = steps[0]
+    if len(steps) == 1 and outer_index is None:
+        # Single step: plain accessibility id or a predicate string
+        if element_type == '*' and len(conditions) == 1 and conditions[0][0] == 'name ==':
+            return AppiumBy.ACCESSIBILITY_ID, conditions[0][1]
+        clauses = [f"type == {quote(element_type)}"] if element_type != '*' else []
+        clauses += [f"{op} {quote(text)}" for op, text in conditions]
+        if not clauses:
+            return None
+        return AppiumBy.IOS_PREDICATE, ' AND '.join(clauses)
+    
+    parts = []
+    for position, (element_type, conditions, index, descendant) in enumerate(steps):
+        part = '**/' + element_type if descendant else element_type
+        if conditions:
+            part += '[`' + ' AND '.join(f"{op} {quote(text)}" for op, text in conditions) + '`]'
+        if index is not None:
+            part += f"[{index}]"
+        elif position == 0 and outer_index is not None:
+            part += f"[{outer_index}]"
+        parts.append(part)
+    return AppiumBy.IOS_CLASS_CHAIN, '/'.join(parts)
+
+
+def _split_steps(path):
+    # Split on "/" outside of brackets and quotes; "//" yields an empty step
+    steps, depth, quote_char, current = [], 0, None, ''
+    for char in path:
+        if quote_char:
+            quote_char = None if char == quote_char else quote_char
+        elif char in '\'"':
+            quote_char = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == '/' and depth == 0:
+            steps.append(current)
+            current = ''
+            continue
+        current += char
+    steps.append(current)
+    return steps
+
+
+def _compile_condition(body):
+    match = _EQUALS.match(body)
+    if match:
+        operator = f"{match.group('attr')} =="
+    else:
+        match = _FUNCTION.match(body)
+        if match is None:
+            return None
+        operator = f"{match.group('attr')} {_OPERATORS[match.group('func')]}"
+    if match.group('attr') not in _ATTRIBUTES:
+        return None
+    text = match.group('sq') if match.group('sq') is not None else match.group('dq')
+    return operator, text
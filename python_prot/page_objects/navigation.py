@@ -0,0 +1,222 @@
+"""
+Declarative navigation graph and shortest-path routing between screens
+"""
+
+import heapq
+from .base_page import BasePage
+from .device_detail_page import DeviceDetailPage
+from .findmy_main_page import FindMyMainPage
+from .flight_recorder import log
+from .people_detail_page import PeopleDetailPage
+
+
+# Screens of the graph: one per main tab plus the two detail screens
+PEOPLE = "people"
+DEVICES = "devices"
+ITEMS = "items"
+ME = "me"
+PERSON_DETAIL = "person_detail"
+DEVICE_DETAIL = "device_detail"
+
+# Tab button behind every tab screen, and the tab a detail screen is opened from
+TAB_SCREENS = {
+    PEOPLE: FindMyMainPage.PEOPLE_TAB,
+    DEVICES: FindMyMainPage.DEVICES_TAB,
+    ITEMS: FindMyMainPage.ITEMS_TAB,
+    ME: FindMyMainPage.ME_TAB,
+}
+DETAIL_SCREENS = {
+    FindMyMainPage.PEOPLE_TAB: PERSON_DETAIL,
+    FindMyMainPage.DEVICES_TAB: DEVICE_DETAIL,
+}
+
+# Page object that drives each screen
+PAGES = {
+    PEOPLE: FindMyMainPage,
+    DEVICES: FindMyMainPage,
+    ITEMS: FindMyMainPage,
+    ME: FindMyMainPage,
+    PERSON_DETAIL: PeopleDetailPage,
+    DEVICE_DETAIL: DeviceDetailPage,
+}
+
+# Transition costs, roughly the WebDriver round-trips each one needs
+TAB_COST = 1
+OPEN_DETAIL_COST = 2
+CLOSE_DETAIL_COST = 1
+
+
+class Screen:
+    """Where the app is: a graph screen plus the person/device shown, if any"""
+    
+    __slots__ = ('name', 'target')
+    
+    def __init__(self, name, target=None):
+        self.name = name
+        self.target = target
+    
+    def satisfies(self, name, target=None):
+        """True when no navigation is needed to reach (name, target)"""
+        if self.name != name:
+            return False
+        return target is None or (self.target or "").lower() == target.lower()
+    
+    def __eq__(self, other):
+        return isinstance(other, Screen) and (self.name, self.target) == (other.name, other.target)
+    
+    def __repr__(self):
+        return f"Screen({self.name!r}, {self.target!r})" if self.target else f"Screen({self.name!r})"
+
+
+class Transition:
+    """Edge of the navigation graph
+    
+    action(page, target) performs the transition from a page object of the
+    source screen and returns the page object of the destination screen.
+    """
+    
+    __slots__ = ('source', 'destination', 'cost', 'action')
+    
+    def __init__(self, source, destination, cost, action):
+        self.source = source
+        self.destination = destination
+        self.cost = cost
+        self.action = action
+    
+    def __repr__(self):
+        return f"{self.source} → {self.destination}"
+
+
+def _open_device(page, target):
+    return page.tap_device_by_name(target) if target else page.tap_first_device()
+
+
+def _open_person(page, target):
+    return page.tap_person_by_name(target) if target else page.tap_first_person()
+
+
+def _close(page, target):
+    return page.tap_close_button()
+
+
+def findmy_transitions():
+    """The FindMy navigation graph"""
+    tab_actions = {
+        PEOPLE: lambda page, target: page.tap_people_tab(),
+        DEVICES: lambda page, target: page.tap_devices_tab(),
+        ITEMS: lambda page, target: page.tap_items_tab(),
+        ME: lambda page, target: page.tap_me_tab(),
+    }
+    transitions = [
+        Transition(source, destination, TAB_COST, tab_actions[destination])
+        for source in TAB_SCREENS for destination in TAB_SCREENS if source != destination
+    ]
+    transitions += [
+        Transition(PEOPLE, PERSON_DETAIL, OPEN_DETAIL_COST, _open_person),
+        Transition(PERSON_DETAIL, PEOPLE, CLOSE_DETAIL_COST, _close),
+        Transition(DEVICES, DEVICE_DETAIL, OPEN_DETAIL_COST, _open_device),
+        Transition(DEVICE_DETAIL, DEVICES, CLOSE_DETAIL_COST, _close),
+    ]
+    return transitions
+
+
+def shortest_route(transitions, start, goal, start_satisfies=False):
+    """Cheapest list of transitions from screen start to screen goal (Dijkstra)
+    
+    When start is the goal screen but shows the wrong person or device
+    (start_satisfies=False), the route has to leave and come back.
+    """
+    if start == goal and start_satisfies:
+        return []
+    outgoing = {}
+    for transition in transitions:
+        outgoing.setdefault(transition.source, []).append(transition)
+    
+    best = {start: 0}
+    arrival = None
+    queue = [(0, 0, start, [])]
+    counter = 1
+    while queue:
+        cost, _, screen, route = heapq.heappop(queue)
+        if arrival is not None and cost >= arrival[0]:
+            break
+        if cost > best.get(screen, float("inf")):
+            continue
+        for transition in outgoing.get(screen, []):
+            next_cost = cost + transition.cost
+            next_route = route + [transition]
+            # Reaching the goal through an edge always counts, even when the
+            # goal is the start screen (leave and come back)
+            if transition.destination == goal:
+                if arrival is None or next_cost < arrival[0]:
+                    arrival = (next_cost, next_route)
+                continue
+            if next_cost < best.get(transition.destination, float("inf")):
+                best[transition.destination] = next_cost
+                heapq.heappush(queue, (next_cost, counter, transition.destination, next_route))
+                counter += 1
+    if arrival is None:
+        raise ValueError(f"No route from {start} to {goal}")
+    return arrival[1]
+
+
+class Navigator:
+    """Moves a live session to the screen a test needs in the fewest transitions
+    
+    navigator = Navigator(driver)
+    detail = navigator.go_to(DEVICE_DETAIL, "Chi's Laptop")
+    
+    The current screen is read from one page-source snapshot, so a session
+    that is already on the Devices tab does not tap it again.
+    """
+    
+    def __init__(self, driver, transitions=None):
+        self.driver = driver
+        self.transitions = transitions if transitions is not None else findmy_transitions()
+        self.transitions_taken = 0
+    
+    def current_screen(self):
+        """Detect the current screen from a fresh page-source snapshot (None if unknown)"""
+        page = BasePage(self.driver)
+        page.invalidate_snapshot()
+        snapshot = page.snapshot()
+        selected = [
+            node.name for node in snapshot.find_by_type("XCUIElementTypeButton")
+            if node.name in TAB_SCREENS.values() and node.attrib.get("selected") == "true"
+        ]
+        if not selected:
+            return None
+        tab = selected[0]
+        if snapshot.find_by_accessibility_id(FindMyMainPage.CLOSE_BUTTON):
+            if tab not in DETAIL_SCREENS:
+                return None
+            labels = snapshot.find_by_accessibility_id("PrimaryLabel")
+            return Screen(DETAIL_SCREENS[tab], labels[0].text if labels else None)
+        return Screen(next(name for name, button in TAB_SCREENS.items() if button == tab))
+    
+    def route(self, screen, target=None, start=None):
+        """Transitions go_to() would take, without performing them"""
+        start = start or self.current_screen()
+        if start is None:
+            raise ValueError("Current screen is unknown")
+        return shortest_route(self.transitions, start.name, screen, start.satisfies(screen, target))
+    
+    def go_to(self, screen, target=None):
+        """Navigate to screen (and person/device target) and return its page object"""
+        start = self.current_screen()
+        if start is None:
+            # Unknown state (launching, or a detail page the graph does not
+            # model): fall back to the main screen and look again
+            FindMyMainPage(self.driver).return_to_main_screen().wait_until_ready()
+            start = self.current_screen()
+            if start is None:
+                raise ValueError("Could not detect the current FindMy screen")
+        
+        page = PAGES[start.name](self.driver)
+        route = self.route(screen, target, start)
+        if route:
+            log(f"🧭 {start.name} → {' → '.join(transition.destination for transition in route)}")
+        for transition in route:
+            page = transition.action(page, target if transition.destination == screen else None)
+            self.transitions_taken += 1
+        return page
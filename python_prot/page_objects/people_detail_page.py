@@ -4,6 +4,9 @@ People Detail Page Object
 
 from appium.webdriver.common.appiumby import AppiumBy
 from .base_page import BasePage
+from .device_detail_page import MAP_AREA, NAME_AREA
+from .flight_recorder import log
+from .locators import TolerantId
 
 
 class PeopleDetailPage(BasePage):
@@ -12,7 +15,14 @@ class PeopleDetailPage(BasePage):
     # Element identifiers
     CLOSE_BUTTON = "Close"
     CONTACT_BUTTON = "Contact,Info"
-    DIRECTIONS_BUTTON = "Directions, "
+    DIRECTIONS_BUTTON = TolerantId("Directions, ", "Directions,")
+    
+    # Ready when the map is visible
+    READY_LOCATOR = (AppiumBy.CLASS_NAME, "XCUIElementTypeMap")
+    
+    # Visual check: the card layout, ignoring the live map and the name
+    VISUAL_REFERENCE = "person_detail"
+    VISUAL_MASKS = (MAP_AREA, NAME_AREA)
     
     def __init__(self, driver):
         super().__init__(driver)
@@ -22,21 +32,22 @@ class PeopleDetailPage(BasePage):
         from .findmy_main_page import FindMyMainPage
         close_btn = self.find_element_by_accessibility_id(self.CLOSE_BUTTON)
         self.tap(close_btn)
-        print("✅ Closed People detail page")
-        return FindMyMainPage(self.driver)
+        self.leave_screen()
+        log("✅ Closed People detail page")
+        return FindMyMainPage(self.driver).wait_until_ready()
     
     def tap_contact_button(self):
         """Tap contact button"""
         contact_btn = self.find_element_by_accessibility_id(self.CONTACT_BUTTON)
         self.tap(contact_btn)
-        print("✅ Tapped Contact button")
+        log("✅ Tapped Contact button")
         return self
     
     def tap_directions_button(self):
         """Tap directions button"""
         directions_btn = self.find_element_by_accessibility_id(self.DIRECTIONS_BUTTON)
         self.tap(directions_btn)
-        print("✅ Tapped Directions button")
+        log("✅ Tapped Directions button")
         return self
     
     def get_person_name(self):
@@ -50,7 +61,11 @@ class PeopleDetailPage(BasePage):
         return self.is_element_visible(AppiumBy.CLASS_NAME, "XCUIElementTypeMap")
     
     def verify_detail_page_displayed(self):
-        """Verify the detail page is displayed"""
-        assert self.is_map_visible(), "Map should be visible on detail page"
-        print("✅ People detail page is displayed")
+        """Verify the detail page is displayed (visually when a reference exists)"""
+        if self.uses_visual_check():
+            result = self.matches_reference()
+            assert result.matched, f"People detail page should match its reference: {result}"
+        else:
+            assert self.is_map_visible(), "Map should be visible on detail page"
+        log("✅ People detail page is displayed")
         return self
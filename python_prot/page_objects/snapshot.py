@@ -0,0 +1,146 @@
+"""
+Page-source snapshots for answering lookups without WDA round-trips
+"""
+
+import xml.etree.ElementTree as ET
+from appium.webdriver.common.appiumby import AppiumBy
+from .locators import TolerantId
+
+
+class SnapshotNode:
+    """One element of a parsed page source"""
+    
+    __slots__ = ('type', 'name', 'label', 'value', 'attrib', 'parent', 'children', 'index')
+    
+    def __init__(self, element, parent, index):
+        self.type = element.tag
+        self.attrib = element.attrib
+        self.name = element.get('name')
+        self.label = element.get('label')
+        self.value = element.get('value')
+        self.parent = parent
+        self.children = []
+        # 1-based position among siblings of the same type (class chain index)
+        self.index = index
+    
+    @property
+    def text(self):
+        """Label used for name matching (never None)"""
+        return self.label or self.name or ''
+    
+    @property
+    def rect(self):
+        """(x, y, width, height) from the source attributes"""
+        return tuple(int(float(self.attrib.get(key, 0))) for key in ('x', 'y', 'width', 'height'))
+    
+    @property
+    def visible(self):
+        return self.attrib.get('visible') != 'false'
+    
+    def class_chain(self):
+        """Absolute -ios class chain that selects exactly this node"""
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append(f"{node.type}[{node.index}]")
+            node = node.parent
+        return '/'.join(reversed(parts))
+    
+    def __repr__(self):
+        return f"<{self.type} name={self.name!r} label={self.label!r}>"
+
+
+class PageSnapshot:
+    """Indexed in-memory tree built from a single driver.page_source call
+    
+    Nodes are indexed by element type, label and accessibility id (name),
+    so list lookups and name listings are answered locally. Only the
+    element that actually needs to be tapped is fetched from the server,
+    through locator_for().
+    """
+    
+    def __init__(self, source):
+        self.source = source
+        # True when taken once the hierarchy stopped changing (see BasePage)
+        self.settled = False
+        self.nodes = []
+        self.by_type = {}
+        self.by_label = {}
+        self.by_name = {}
+        
+        root = ET.fromstring(source)
+        # WDA wraps the tree in <AppiumAUT>; class chains start below the application
+        if root.tag == 'AppiumAUT' and len(root):
+            root = root[0]
+        self.root = self._build(root, None, 1)
+    
+    def _build(self, element, parent, index):
+        node = SnapshotNode(element, parent, index)
+        self.nodes.append(node)
+        self.by_type.setdefault(node.type, []).append(node)
+        if node.label:
+            self.by_label.setdefault(node.label, []).append(node)
+        if node.name:
+            self.by_name.setdefault(node.name, []).append(node)
+        
+        seen = {}
+        for child in element:
+            seen[child.tag] = seen.get(child.tag, 0) + 1
+            node.children.append(self._build(child, node, seen[child.tag]))
+        return node
+    
+    def find_by_type(self, element_type):
+        """All nodes of the given XCUIElementType, in document order"""
+        return list(self.by_type.get(element_type, []))
+    
+    def find_by_label(self, label):
+        """All nodes whose label matches exactly"""
+        return list(self.by_label.get(label, []))
+    
+    def find_by_accessibility_id(self, name):
+        """All nodes whose accessibility id (name) matches exactly
+        
+        For a TolerantId: the nodes of the best-ranked variant that matches,
+        recorded on the id.
+        """
+        if isinstance(name, TolerantId):
+            match = name.best(self.by_name)
+            if match is None:
+                return []
+            name.record(*match)
+            name = match[1]
+        return list(self.by_name.get(name, []))
+    
+    def table_cells(self):
+        """Cells that are direct children of a table (//Table/Cell)"""
+        return [
+            cell for cell in self.by_type.get('XCUIElementTypeCell', [])
+            if cell.parent is not None and cell.parent.type == 'XCUIElementTypeTable'
+        ]
+    
+    def find_cell(self, text):
+        """First table cell whose label contains text (case-insensitive)"""
+        text = text.lower()
+        for cell in self.table_cells():
+            if text in cell.text.lower():
+                return cell
+        return None
+    
+    def list_at_top(self):
+        """True when no row of the list sits above the table's top edge"""
+        cells = self.table_cells()
+        return not cells or cells[0].rect[1] >= cells[0].parent.rect[1]
+    
+    def list_at_end(self):
+        """True when the last row is fully inside the table: nothing left below it"""
+        cells = self.table_cells()
+        if not cells:
+            return True
+        x, y, width, height = cells[-1].parent.rect
+        return cells[-1].rect[1] + cells[-1].rect[3] <= y + height
+    
+    def locator_for(self, node):
+        """Cheapest server locator that resolves to exactly this node"""
+        if node.name and len(self.by_name[node.name]) == 1:
+            return AppiumBy.ACCESSIBILITY_ID, node.name
+        return AppiumBy.IOS_CLASS_CHAIN, node.class_chain()
@@ -0,0 +1,126 @@
+"""
+Tracks which page-object method is currently running
+
+Every traced call is also recorded as a span in the flight recorder.
+"""
+
+import contextvars
+import functools
+import inspect
+
+from .flight_recorder import PAGE, now, recorder, task_lane
+
+
+_stack = contextvars.ContextVar('page_method_stack', default=())
+
+# Callables notified with every traced function as it is called
+_listeners = []
+
+
+def page_method_stack():
+    """Names of the page-object methods on the call stack, outermost first
+    
+    e.g. ('FindMyMainPage.tap_device_by_name', 'DeviceDetailPage.wait_until_ready')
+    """
+    return _stack.get()
+
+
+def add_listener(listener):
+    """Call listener(page_class, func) whenever a traced page method starts, e.g. to record usage"""
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    _listeners.remove(listener)
+
+
+def _notify(page_class, func):
+    for listener in _listeners:
+        listener(page_class, func)
+
+
+def trace_page_methods(cls):
+    """Wrap the public methods defined on cls so they appear on the stack"""
+    for name, value in list(vars(cls).items()):
+        if name.startswith('_') or not inspect.isfunction(value) or getattr(value, '__page_method__', False):
+            continue
+        setattr(cls, name, _traced(value))
+    return cls
+
+
+def _traced(func):
+    if inspect.iscoroutinefunction(func):
+        # Async page objects: keep the method on the stack while it is awaited
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if _listeners:
+                _notify(type(self), func)
+            name = f"{type(self).__name__}.{func.__name__}"
+            token = _stack.set(_stack.get() + (name,))
+            started = now()
+            try:
+                result = await func(self, *args, **kwargs)
+            except BaseException as exc:
+                recorder.complete(PAGE, name, started, {'error': type(exc).__name__}, task_lane())
+                raise
+            finally:
+                _stack.reset(token)
+            recorder.complete(PAGE, name, started, lane=task_lane())
+            return result
+    elif inspect.isgeneratorfunction(func):
+        # Streaming methods: on the stack while their body runs (including
+        # the scrolls between items), not while the caller handles an item
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if _listeners:
+                _notify(type(self), func)
+            name = f"{type(self).__name__}.{func.__name__}"
+            started = now()
+            generator = func(self, *args, **kwargs)
+            resume, value = generator.send, None
+            try:
+                while True:
+                    token = _stack.set(_stack.get() + (name,))
+                    try:
+                        item = resume(value)
+                    except StopIteration as stop:
+                        result = stop.value
+                        break
+                    finally:
+                        _stack.reset(token)
+                    try:
+                        resume, value = generator.send, (yield item)
+                    except GeneratorExit:
+                        raise
+                    except BaseException as exc:
+                        resume, value = generator.throw, exc
+            except GeneratorExit:
+                # The caller stopped iterating
+                generator.close()
+                recorder.complete(PAGE, name, started)
+                raise
+            except BaseException as exc:
+                recorder.complete(PAGE, name, started, {'error': type(exc).__name__})
+                raise
+            recorder.complete(PAGE, name, started)
+            return result
+    else:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if _listeners:
+                _notify(type(self), func)
+            name = f"{type(self).__name__}.{func.__name__}"
+            token = _stack.set(_stack.get() + (name,))
+            started = now()
+            try:
+                result = func(self, *args, **kwargs)
+            except BaseException as exc:
+                recorder.complete(PAGE, name, started, {'error': type(exc).__name__})
+                raise
+            finally:
+                _stack.reset(token)
+            recorder.complete(PAGE, name, started)
+            return result
+    
+    wrapper.__page_method__ = True
+    return wrapper
@@ -0,0 +1,124 @@
+"""
+Screenshot comparison against reference images with NumPy
+"""
+
+import io
+import os
+import numpy as np
+from PIL import Image
+
+
+# A pixel counts as different when one channel moves more than this (0-255)
+DEFAULT_PIXEL_TOLERANCE = 24
+
+# A screen matches when at most this fraction of compared pixels differ
+DEFAULT_TOLERANCE = 0.01
+
+
+def decode(png):
+    """PNG bytes -> uint8 array of shape (height, width, 3)"""
+    with Image.open(io.BytesIO(png)) as image:
+        return np.asarray(image.convert('RGB'))
+
+
+def build_mask(shape, masks=(), scale=1.0):
+    """Boolean array, True where pixels are compared
+    
+    masks are (x, y, width, height) rects in points; scale converts them to
+    screenshot pixels (3.0 on a 3x iPhone).
+    """
+    compared = np.ones(shape[:2], dtype=bool)
+    for x, y, width, height in masks:
+        left, top = int(x * scale), int(y * scale)
+        compared[max(top, 0):max(int((y + height) * scale), 0), max(left, 0):max(int((x + width) * scale), 0)] = False
+    return compared
+
+
+class VisualResult:
+    """Outcome of one comparison"""
+    
+    __slots__ = ('name', 'matched', 'mismatch', 'compared', 'tolerance')
+    
+    def __init__(self, name, matched, mismatch, compared, tolerance):
+        self.name = name
+        self.matched = matched
+        # Fraction of compared pixels that differ
+        self.mismatch = mismatch
+        self.compared = compared
+        self.tolerance = tolerance
+    
+    def __bool__(self):
+        return self.matched
+    
+    def __repr__(self):
+        verdict = "match" if self.matched else "MISMATCH"
+        return (f"<VisualResult {self.name}: {verdict}, {self.mismatch:.2%} of {self.compared} pixels differ "
+                f"(tolerance {self.tolerance:.2%})>")
+
+
+def compare(actual, reference, masks=(), scale=1.0, tolerance=DEFAULT_TOLERANCE,
+            pixel_tolerance=DEFAULT_PIXEL_TOLERANCE, name=""):
+    """Compare two decoded screenshots outside the masked rects
+    
+    A handful of whole-array operations, so a full iPhone screenshot takes
+    a few milliseconds. Screenshots of a different size never match.
+    """
+    if actual.shape != reference.shape:
+        return VisualResult(name, False, 1.0, 0, tolerance)
+    compared = build_mask(reference.shape, masks, scale)
+    # |a - b| in uint8 without widening: larger minus smaller cannot wrap
+    difference = np.maximum(actual, reference)
+    difference -= np.minimum(actual, reference)
+    over = difference > pixel_tolerance
+    # Channel-wise OR is several times faster than .any(axis=2)
+    different = int(np.count_nonzero((over[..., 0] | over[..., 1] | over[..., 2]) & compared))
+    total = int(np.count_nonzero(compared))
+    mismatch = different / total if total else 0.0
+    return VisualResult(name, mismatch <= tolerance, mismatch, total, tolerance)
+
+
+class VisualChecker:
+    """Reference images in a directory, one <name>.png per screen
+    
+    checker = VisualChecker("visual_references")
+    checker.check("device_detail", driver.get_screenshot_as_png(), masks=[(0, 0, 390, 420)])
+    
+    With update=True every check stores the screenshot as the new
+    reference and passes, which is how references are recorded.
+    """
+    
+    def __init__(self, directory, update=False):
+        self.directory = directory
+        self.update = update
+        self._references = {}
+    
+    def path(self, name):
+        return os.path.join(self.directory, f"{name}.png")
+    
+    def has_reference(self, name):
+        return self.update or name in self._references or os.path.exists(self.path(name))
+    
+    def reference(self, name):
+        """Decoded reference image, read from disk once"""
+        image = self._references.get(name)
+        if image is None:
+            with open(self.path(name), 'rb') as source:
+                image = self._references[name] = decode(source.read())
+        return image
+    
+    def record(self, name, png):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(name), 'wb') as output:
+            output.write(png)
+        self._references[name] = decode(png)
+    
+    def check(self, name, png, masks=(), scale=None, tolerance=DEFAULT_TOLERANCE,
+              pixel_tolerance=DEFAULT_PIXEL_TOLERANCE):
+        """Compare a PNG screenshot against reference name
+        
+        scale defaults to 1.0; pass pixels per point when masks are given
+        in points and the screenshot is at device resolution.
+        """
+        if self.update:
+            self.record(name, png)
+        return compare(decode(png), self.reference(name), masks, scale or 1.0, tolerance, pixel_tolerance, name)
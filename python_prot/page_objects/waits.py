@@ -0,0 +1,96 @@
+"""
+Adaptive polling for page-object waits
+"""
+
+import time
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from .flight_recorder import WAIT, now as trace_now, recorder
+
+
+# Poll schedule bounds (seconds)
+MIN_POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 1.0
+BACKOFF = 1.5
+
+# Errors that only mean "not yet"; anything else (a dead session, a refused
+# connection) ends the wait immediately
+RETRYABLE_ERRORS = (NoSuchElementException, StaleElementReferenceException)
+
+
+class LatencyTracker:
+    """Learns how long each wait key (usually a locator) takes to succeed
+    
+    Keeps an exponentially weighted moving average per key, so a locator
+    that usually appears after ~0.8 s is first polled close to 0.8 s.
+    """
+    
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self._expected = {}
+    
+    def expected(self, key):
+        """Typical seconds until success, or None when never seen"""
+        return self._expected.get(key)
+    
+    def observe(self, key, seconds):
+        previous = self._expected.get(key)
+        self._expected[key] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+    
+    def snapshot(self):
+        """{key: expected seconds} for reports"""
+        return dict(self._expected)
+    
+    def clear(self):
+        self._expected.clear()
+
+
+# Shared by every page object: appearance latency is a property of the app
+latency_tracker = LatencyTracker()
+
+
+def next_interval(elapsed, expected, backoff):
+    """Sleep before the next poll
+    
+    While the expected latency is still ahead, halve the remaining gap so
+    polls converge on it; after that (or without history) start at
+    MIN_POLL_INTERVAL and back off towards MAX_POLL_INTERVAL.
+    """
+    if expected is not None and elapsed + MIN_POLL_INTERVAL < expected:
+        return max(MIN_POLL_INTERVAL, (expected - elapsed) / 2), backoff
+    return backoff, min(backoff * BACKOFF, MAX_POLL_INTERVAL)
+
+
+def poll(condition, timeout, message="", key=None, interval=None, tracker=latency_tracker):
+    """Call condition() until it returns a truthy value and return that value
+    
+    key enables the learned, adaptive schedule; interval forces a fixed
+    one. Raises TimeoutException after timeout seconds. Only
+    RETRYABLE_ERRORS are swallowed between polls. Each wait is recorded as
+    one span in the flight recorder.
+    """
+    clock = trace_now()
+    polls = 0
+    started = time.monotonic()
+    deadline = started + timeout
+    expected = tracker.expected(key) if key is not None else None
+    backoff = MIN_POLL_INTERVAL
+    while True:
+        polls += 1
+        try:
+            value = condition()
+            if value:
+                if key is not None:
+                    tracker.observe(key, time.monotonic() - started)
+                recorder.complete(WAIT, 'wait', clock, {'key': key, 'polls': polls})
+                return value
+        except RETRYABLE_ERRORS:
+            pass
+        now = time.monotonic()
+        if now >= deadline:
+            recorder.complete(WAIT, 'wait', clock, {'key': key, 'polls': polls, 'error': 'TimeoutException'})
+            raise TimeoutException(message)
+        if interval is not None:
+            sleep = interval
+        else:
+            sleep, backoff = next_interval(now - started, expected, backoff)
+        time.sleep(min(sleep, deadline - now))
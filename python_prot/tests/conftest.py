@@ -0,0 +1,329 @@
+"""
+Shared pytest fixtures
+"""
+
+import os
+import time
+
+import pytest
+from harness import APPIUM_SERVER_URL, SessionPool
+from harness import flight_traces
+from harness.hierarchy import HierarchyArchive
+from harness.ordering import DEFAULT_SESSION_SETUP_SECONDS, OrderOptimizer
+from harness.screenshots import MODES, OFF, ScreenshotPipeline
+from harness.selection import DEFAULT_DEPENDENCIES_PATH, ChangeSelector
+from harness.instrumentation import CommandRecorder
+from harness.fake_appium import (
+    Cassette, FakeAppiumServer, FindMyApp, LatencyModel, ProxyBackend, Recorder, ReplayBackend, SimulatorBackend,
+)
+from page_objects import BasePage, FindMyMainPage
+from page_objects.element_cache import ElementCache
+from page_objects.locators import stale_ids
+from page_objects.flight_recorder import DEFAULT_CAPACITY, recorder as flight_recorder
+from page_objects.navigation import Navigator
+from page_objects.visual import VisualChecker
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("appium", "Appium server selection")
+    group.addoption("--fake-appium", action="store_true",
+                    help="run against the stand-in server with a simulated FindMy app")
+    group.addoption("--replay-cassette", metavar="PATH",
+                    help="run against the stand-in server replaying a recorded cassette")
+    group.addoption("--record-cassette", metavar="PATH",
+                    help="record every Appium command of the run into a cassette")
+    group.addoption("--fake-latency-ms", type=float, default=0.0,
+                    help="stand-in server: delay injected per command")
+    group.addoption("--fake-jitter-ms", type=float, default=0.0,
+                    help="stand-in server: +/- jitter per command")
+    group.addoption("--fake-bandwidth-kbps", type=float, default=0.0,
+                    help="stand-in server: link speed for response bodies in KB/s (0 = unlimited)")
+    group.addoption("--latency-report", metavar="PATH",
+                    help="write per-method and per-command latency histograms as JSON")
+    group.addoption("--screenshots", choices=MODES, default=OFF,
+                    help="capture every ready screen ('all'), only failing tests ('failures'), or nothing")
+    group.addoption("--screenshot-archive", metavar="PATH",
+                    help="zip archive for captures (default: screenshots/run-<timestamp>.zip)")
+    group.addoption("--hierarchy-archive", metavar="PATH",
+                    help="record every page-source snapshot per test into a compressed SQLite archive")
+    group.addoption("--visual-references", metavar="DIR",
+                    help="check pages that have a reference image in DIR visually")
+    group.addoption("--update-visual-references", action="store_true",
+                    help="store each ready page's screenshot as its reference in --visual-references")
+    group.addoption("--optimize-order", action="store_true",
+                    help="reorder app tests to minimise screen transitions and session setups")
+    group.addoption("--transition-seconds", type=float,
+                    help="--optimize-order: seconds per transition step (default: estimated from durations)")
+    group.addoption("--session-setup-seconds", type=float, default=DEFAULT_SESSION_SETUP_SECONDS,
+                    help="--optimize-order: seconds to create a session")
+    group.addoption("--record-deps", action="store_true",
+                    help="record the page-object methods and locators each test uses")
+    group.addoption("--changed-only", action="store_true",
+                    help="run only the tests affected by the git diff since the recorded dependencies")
+    group.addoption("--full-run", action="store_true",
+                    help="run every test even with --changed-only")
+    group.addoption("--changed-since", metavar="REF",
+                    help="--changed-only: diff against REF instead of the recorded commit")
+    group.addoption("--deps-file", default=DEFAULT_DEPENDENCIES_PATH,
+                    help="dependency map (default .test_dependencies.json)")
+    group.addoption("--flight-traces", choices=flight_traces.MODES, default=flight_traces.FAILURES,
+                    help="write the flight recorder as a trace timeline for failing tests, "
+                         "also at the end of the run ('all'), or record nothing ('off')")
+    group.addoption("--flight-trace-dir", default=flight_traces.DEFAULT_DIRECTORY,
+                    help="directory for trace timelines (default flight_traces)")
+    group.addoption("--flight-buffer", type=int, default=DEFAULT_CAPACITY,
+                    help="events kept by the flight recorder ring buffer")
+    group.addoption("--echo-events", action="store_true",
+                    help="also print page-object messages (use with -s)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "screens(start, *visits, end=None, session='default'): "
+                                       "screens an app test starts on and visits, for --optimize-order")
+    config.addinivalue_line("markers", "order_after(*tests): run after the named tests under --optimize-order")
+    if config.getoption("--optimize-order"):
+        config.pluginmanager.register(OrderOptimizer(
+            transition_seconds=config.getoption("--transition-seconds"),
+            session_setup_seconds=config.getoption("--session-setup-seconds"),
+        ), "order-optimizer")
+    if config.getoption("--record-deps") or config.getoption("--changed-only") or config.getoption("--full-run"):
+        config.pluginmanager.register(ChangeSelector(
+            config.rootpath,
+            path=config.getoption("--deps-file"),
+            record=config.getoption("--record-deps"),
+            select=config.getoption("--changed-only"),
+            full_run=config.getoption("--full-run"),
+            base=config.getoption("--changed-since"),
+        ), "change-selector")
+    
+    flight_recorder.echo = config.getoption("--echo-events")
+    flight_recorder.resize(config.getoption("--flight-buffer"))
+    if config.getoption("--flight-traces") == flight_traces.OFF:
+        flight_recorder.enabled = False
+    else:
+        config.pluginmanager.register(flight_traces.FlightTraces(
+            config.getoption("--flight-trace-dir"), mode=config.getoption("--flight-traces"),
+        ), "flight-traces")
+    
+    hierarchy = config.getoption("--hierarchy-archive")
+    if hierarchy:
+        config._hierarchy = BasePage.hierarchy_sink = HierarchyArchive(hierarchy)
+    
+    references = config.getoption("--visual-references")
+    if references:
+        BasePage.visual_checker = VisualChecker(references, update=config.getoption("--update-visual-references"))
+    
+    mode = config.getoption("--screenshots")
+    if mode == OFF:
+        return
+    path = config.getoption("--screenshot-archive") or time.strftime("screenshots/run-%Y%m%d-%H%M%S.zip")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    config._screenshots = BasePage.screenshot_sink = ScreenshotPipeline(path, mode=mode)
+
+
+def pytest_unconfigure(config):
+    flight_recorder.enabled = True
+    flight_recorder.echo = False
+    BasePage.visual_checker = None
+    archive = getattr(config, "_hierarchy", None)
+    if archive is not None:
+        BasePage.hierarchy_sink = None
+        archive.close()
+    pipeline = getattr(config, "_screenshots", None)
+    if pipeline is not None:
+        BasePage.screenshot_sink = None
+        pipeline.close()
+
+
+def pytest_runtest_setup(item):
+    archive = getattr(item.config, "_hierarchy", None)
+    if archive is not None:
+        archive.current_run = item.nodeid
+    pipeline = getattr(item.config, "_screenshots", None)
+    if pipeline is not None:
+        pipeline.current_test = item.nodeid
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    pipeline = getattr(item.config, "_screenshots", None)
+    driver = getattr(item, "funcargs", {}).get("driver")
+    if pipeline is not None and driver is not None and report.failed:
+        pipeline.capture_failure(driver, item.nodeid)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    pipeline = getattr(config, "_screenshots", None)
+    if pipeline is not None:
+        pipeline.flush()
+        stats = pipeline.stats()
+        terminalreporter.write_line(
+            f"📸 Screenshots: {stats['stored']} stored, {stats['skipped']} near-duplicates skipped -> {pipeline.path}"
+        )
+    archive = getattr(config, "_hierarchy", None)
+    if archive is not None:
+        stats = archive.stats()
+        terminalreporter.write_line(
+            f"🌳 Hierarchy: {stats['steps']} snapshots, {stats['sources']} distinct, "
+            f"{stats['raw_bytes'] // 1024} KB stored as {stats['stored_bytes'] // 1024} KB -> {archive.path}"
+        )
+    transport = getattr(config, "_transport_stats", None)
+    if transport is not None and transport.requests:
+        stats = transport.as_dict()
+        terminalreporter.write_line(
+            f"🔌 Transport: {stats['requests']} requests over {stats['connections']} connections "
+            f"({stats['reuse_rate']:.0%} reused), {stats['retries']} retries, "
+            f"{stats['body_bytes'] // 1024} KB received as {stats['wire_bytes'] // 1024} KB"
+        )
+    for expected, matched in stale_ids().items():
+        variants = ", ".join(f"{name!r} ({count}x)" for name, count in matched.items())
+        terminalreporter.write_line(f"🏷️  Accessibility id {expected!r} matched {variants}")
+    totals = ElementCache.totals
+    if totals["hits"] or totals["misses"]:
+        terminalreporter.write_line(
+            f"🗂️  Element cache: {totals['hits']} hits, {totals['misses']} misses, {totals['stale']} stale"
+        )
+
+
+def reset_to_main_screen(driver):
+    """Bring FindMy back to its main screen between tests"""
+    FindMyMainPage(driver).return_to_main_screen()
+
+
+class FakeFindMy:
+    """A stand-in server simulating FindMy, with its own session pool
+    
+    commands records every WebDriver command of the pool's sessions.
+    """
+    
+    def __init__(self, backend, latency=None, on_create=None, reset=None):
+        self.backend = backend
+        self.app = getattr(backend, "app", None)
+        self.server = FakeAppiumServer(backend, latency=latency).start()
+        self.url = self.server.url
+        self.commands = CommandRecorder()
+        
+        def created(driver):
+            self.commands.attach(driver)
+            if on_create is not None:
+                on_create(driver)
+        
+        self.pool = SessionPool(server_url=self.url, reset=reset, on_create=created)
+        self._driver = None
+    
+    @property
+    def driver(self):
+        """The pooled session the test works on (created on first use)"""
+        if self._driver is None:
+            self._driver = self.pool.acquire()
+        return self._driver
+    
+    def main_page(self):
+        """FindMy's main screen on driver, once it is ready"""
+        return FindMyMainPage(self.driver).wait_until_ready()
+    
+    def close(self):
+        """Quit the pool's sessions and stop the server (safe to call twice)"""
+        if self.server is None:
+            return
+        try:
+            self.pool.close_all()
+        finally:
+            self.server.stop()
+            self.server = None
+
+
+@pytest.fixture
+def fake_findmy():
+    """Factory: a FakeFindMy per call, closed after the test even when it fails
+    
+    findmy = fake_findmy(devices=[...], delays={"tab": 0.8})   # FindMyApp settings
+    findmy = fake_findmy(backend=ReplayBackend(...), latency=LatencyModel(base=0.02), on_create=...)
+    main_page = findmy.main_page()
+    """
+    started = []
+    
+    def start(backend=None, latency=None, on_create=None, reset=None, **app_settings):
+        findmy = FakeFindMy(backend or SimulatorBackend(FindMyApp(**app_settings)), latency=latency,
+                            on_create=on_create, reset=reset)
+        started.append(findmy)
+        return findmy
+    
+    yield start
+    
+    for findmy in reversed(started):
+        findmy.close()
+
+
+@pytest.fixture(scope="session")
+def appium_server_url(request):
+    """URL of the Appium server (real, or a stand-in when requested)"""
+    config = request.config
+    replay = config.getoption("--replay-cassette")
+    record = config.getoption("--record-cassette")
+    
+    if replay:
+        backend = ReplayBackend(Cassette.load(replay))
+    elif config.getoption("--fake-appium"):
+        backend = SimulatorBackend()
+    elif record:
+        backend = ProxyBackend(APPIUM_SERVER_URL)
+    else:
+        yield APPIUM_SERVER_URL
+        return
+    
+    if record:
+        backend = Recorder(backend)
+    latency = LatencyModel(
+        base=config.getoption("--fake-latency-ms") / 1000.0,
+        jitter=config.getoption("--fake-jitter-ms") / 1000.0,
+        bandwidth=config.getoption("--fake-bandwidth-kbps") * 1000.0 or None,
+    )
+    with FakeAppiumServer(backend, latency=latency) as server:
+        yield server.url
+    
+    if record:
+        backend.cassette.save(record)
+
+
+@pytest.fixture(scope="session")
+def command_recorder(request):
+    """Times every WebDriver command of the run"""
+    recorder = CommandRecorder()
+    
+    yield recorder
+    
+    report_path = request.config.getoption("--latency-report")
+    if report_path:
+        recorder.write_report(report_path)
+
+
+@pytest.fixture(scope="session")
+def session_pool(request, appium_server_url, command_recorder):
+    """Appium sessions shared by every test in the run"""
+    pool = SessionPool(server_url=appium_server_url, reset=reset_to_main_screen,
+                       on_create=lambda driver: flight_recorder.attach(command_recorder.attach(driver)))
+    request.config._transport_stats = pool.transport_stats
+    
+    yield pool
+    
+    # Teardown
+    pool.close_all()
+
+
+@pytest.fixture(scope="function")
+def driver(session_pool):
+    """Check out a pooled Appium driver for one test"""
+    driver = session_pool.acquire()
+    
+    yield driver
+    
+    session_pool.release(driver)
+
+
+@pytest.fixture(scope="function")
+def navigator(driver):
+    """Shortest-path navigation from wherever the pooled session already is"""
+    return Navigator(driver)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Test launch and time-to-interactive metrics against scripted delays
+"""
+
+from harness.app_metrics import AppMetrics, Measurement, MetricsHistory, app_version
+
+
+def test_launch_and_screen_tti_follow_the_scripted_delays(fake_findmy):
+    findmy = fake_findmy(delays={"launch": 0.4, "detail": 0.25}, version="4.1")
+    app = findmy.app
+    assert app_version(findmy.driver) == "4.1"
+    results = AppMetrics(findmy.driver, repetitions=2).run(screens=("device_detail",))
+    
+    assert set(results) == {"cold_launch", "warm_launch", "tti.device_detail"}
+    assert app.launches == 3  # session start plus two cold launches
+    assert results["cold_launch"].median >= 0.4
+    assert results["warm_launch"].median < results["cold_launch"].median - 0.2
+    assert results["tti.device_detail"].median >= 0.25
+    assert all(len(measurement.samples) == 2 for measurement in results.values())
+
+
+def test_history_reports_regressions_against_the_previous_version(tmp_path):
+    path = str(tmp_path / "app_metrics.json")
+    history = MetricsHistory(path)
+    history.record("4.0", {"cold_launch": Measurement("cold_launch", [1.0, 1.1, 0.9])})
+    history.versions["4.0"]["recorded_at"] = "2026-01-01T00:00:00"
+    history.save()
+    
+    history = MetricsHistory(path)
+    history.record("4.1", {"cold_launch": Measurement("cold_launch", [1.5, 1.6, 1.4])})
+    assert history.previous("4.1") == "4.0"
+    assert history.regressions("4.1") == [
+        "cold_launch: median 1.500s on 4.1, 1.000s on 4.0 (limit 1.250s)"
+    ]
+    history.record("4.1", {"cold_launch": Measurement("cold_launch", [1.1, 1.2, 1.0])})
+    assert history.regressions("4.1") == []
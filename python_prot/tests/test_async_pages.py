@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the async page objects against several stand-in servers at once
+"""
+
+import asyncio
+import time
+
+from harness import build_options
+from harness.fake_appium import LatencyModel
+from page_objects.aio import AsyncAppiumDriver, AsyncFindMyMainPage
+from page_objects.tracing import page_method_stack
+
+
+async def play_sound(server_url, udid):
+    """Open Chi's Laptop on one device and play a sound"""
+    async with await AsyncAppiumDriver.create(server_url, build_options(udid=udid)) as driver:
+        main_page = await AsyncFindMyMainPage(driver).wait_until_ready()
+        detail = await (await main_page.tap_devices_tab()).tap_device_by_name("Chi's Laptop")
+        await detail.tap_play_sound_button()
+        assert await detail.get_device_name() == "Chi's Laptop"
+        return await detail.tap_close_button()
+
+
+def test_play_sound_on_many_devices_at_once(fake_findmy):
+    """One event loop drives every device; the flows overlap in time"""
+    devices = [fake_findmy(latency=LatencyModel(base=0.02)) for _ in range(4)]
+    
+    async def run(count):
+        started = time.monotonic()
+        pages = await asyncio.gather(*(
+            play_sound(device.url, f"0000-FAKE-{index}") for index, device in enumerate(devices[:count])
+        ))
+        return pages, time.monotonic() - started
+    
+    _, single = asyncio.run(run(1))
+    pages, together = asyncio.run(run(4))
+    
+    assert all(isinstance(page, AsyncFindMyMainPage) for page in pages)
+    assert all(("Play Sound", "Chi's Laptop") in device.app.events for device in devices)
+    # Serially, four devices would take four times as long as one
+    assert together < single * 2.5
+
+
+def test_page_methods_traced_across_awaits():
+    """The tracing stack stays correct while async page methods are suspended"""
+    seen = []
+    
+    class Probe(AsyncFindMyMainPage):
+        async def probe(self):
+            await asyncio.sleep(0)
+            seen.append(page_method_stack())
+    
+    asyncio.run(Probe(None).probe())
+    assert seen == [("Probe.probe",)]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test the per-session element cache
+"""
+
+import pytest
+
+
+@pytest.fixture
+def main_page(fake_findmy):
+    return fake_findmy().main_page()
+
+
+def test_tab_buttons_are_looked_up_once(main_page):
+    cache = main_page.element_cache()
+    for _ in range(2):
+        main_page.tap_devices_tab()
+        assert main_page.is_devices_tab_selected()
+        main_page.tap_people_tab()
+        assert main_page.is_people_tab_selected()
+    
+    # People was cached by wait_until_ready, Devices on its first tap
+    assert cache.misses == 2
+    assert cache.hits == 7
+
+
+def test_stale_handles_are_fetched_again(main_page):
+    cache = main_page.element_cache()
+    tab = main_page.find_element_by_accessibility_id(main_page.DEVICES_TAB)
+    tab._id = "no-longer-attached"
+    
+    main_page.tap(tab)
+    assert main_page.is_devices_tab_selected()
+    assert cache.stale == 1
+
+
+def test_leaving_a_screen_drops_its_handles(main_page):
+    detail = main_page.tap_devices_tab().tap_device_by_name("Chi's Laptop")
+    detail.tap_play_sound_button()
+    assert any(screen == "DeviceDetailPage" for screen, _ in detail.element_cache().entries)
+    
+    detail.tap_close_button()
+    assert not any(screen == "DeviceDetailPage" for screen, _ in detail.element_cache().entries)
+    assert detail.element_cache().stats()["hit_rate"] > 0
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test the stand-in Appium server
+"""
+
+import pytest
+from harness.fake_appium import Cassette, FindMyApp, Recorder, ReplayBackend, SimulatorBackend
+from harness.fake_appium.queries import find
+from page_objects import FindMyMainPage
+
+
+def play_sound_flow(pool):
+    """Open Chi's Laptop, play a sound and close the page"""
+    with pool.session() as driver:
+        main_page = FindMyMainPage(driver).wait_until_ready()
+        main_page.tap_devices_tab()
+        names = main_page.get_all_device_names()
+        main_page.tap_device_by_name("Chi's Laptop").tap_play_sound_button().tap_close_button()
+        return names
+
+
+@pytest.fixture
+def app():
+    app = FindMyApp()
+    app.activate()
+    app.tab = "Devices"
+    return app
+
+
+def test_predicate_and_class_chain_queries(app):
+    """The simulator evaluates the native locator strategies"""
+    tree = app.tree()
+    cells = find(tree, "-ios class chain", "**/XCUIElementTypeTable/XCUIElementTypeCell")
+    assert len(cells) == 4
+    
+    laptop = find(tree, "-ios class chain",
+                  '**/XCUIElementTypeTable/XCUIElementTypeCell[`label CONTAINS[c] "chi\'s laptop"`]')
+    assert [cell.label for cell in laptop] == ["Chi's Laptop, Home, Now"]
+    
+    second = find(tree, "-ios class chain", "**/XCUIElementTypeCell[2]")
+    assert second[0].label.startswith("Chi's Laptop")
+    
+    buttons = find(tree, "-ios predicate string",
+                   "type == 'XCUIElementTypeButton' AND (name BEGINSWITH 'Dev' OR name MATCHES 'P.*e')")
+    assert [button.name for button in buttons] == ["People", "Devices"]
+    
+    assert find(tree, "xpath", "//XCUIElementTypeTable/XCUIElementTypeCell[1]")[0].label.startswith("Chi's iPhone")
+
+
+def test_session_pool_reuses_live_sessions(fake_findmy):
+    """One WebDriverAgent session serves consecutive tests"""
+    findmy = fake_findmy()
+    pool = findmy.pool
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    assert second is first
+    assert (pool.created, pool.reused) == (1, 1)
+    
+    # A dead session is replaced on the next acquire
+    findmy.backend.sessions.clear()
+    pool.release(second)
+    third = pool.acquire()
+    assert third is not first
+    assert (pool.created, pool.recreated) == (2, 1)
+
+
+def test_record_then_replay(fake_findmy, tmp_path):
+    """A recorded run replays against a server with no app behind it"""
+    cassette_path = tmp_path / "play_sound.jsonl.gz"
+    recording = fake_findmy(backend=Recorder(SimulatorBackend()))
+    recorded_names = play_sound_flow(recording.pool)
+    recording.close()
+    recording.backend.cassette.save(cassette_path)
+    
+    replay = ReplayBackend(Cassette.load(cassette_path))
+    assert play_sound_flow(fake_findmy(backend=replay).pool) == recorded_names
+    assert replay.misses == []
@@ -4,101 +4,62 @@ Test FindMy app navigation
 """
 
 import pytest
-import time
-from appium import webdriver
-from appium.options.ios import XCUITestOptions
 from page_objects import FindMyMainPage
+from page_objects.navigation import DEVICE_DETAIL, DEVICES, ITEMS, ME, PEOPLE, PERSON_DETAIL
 
 
-@pytest.fixture(scope="function")
-def driver():
-    """Setup and teardown Appium driver"""
-    
-    # W3C compliant capabilities
-    options = XCUITestOptions()
-    options.platform_name = 'iOS'
-    options.automation_name = 'XCUITest'
-    options.device_name = 'Chi Thu – iPhone'
-    options.udid = '00008110-001E64343483801E'
-    options.bundle_id = 'com.apple.findmy'
-    options.no_reset = True
-    options.new_command_timeout = 300
-    
-    # WebDriverAgent configuration
-    options.show_xcode_log = True
-    options.use_prebuilt_wda = True
-    options.xcode_org_id = '5C489RHX7L'
-    options.xcode_signing_id = 'Apple Development'
-    options.updated_wda_bundle_id = 'com.chithule.WebDriverAgentRunner'
-    
-    # Connect to Appium server
-    appium_server_url = 'http://127.0.0.1:4723'
-    driver = webdriver.Remote(appium_server_url, options=options)
-    
-    yield driver
-    
-    # Teardown
-    driver.quit()
-
-
+@pytest.mark.screens(PEOPLE)
 def test_navigate_to_people_tab(driver):
     """Test navigation to People tab"""
-    main_page = FindMyMainPage(driver)
-    time.sleep(2)  # Wait for app to load
+    main_page = FindMyMainPage(driver).wait_until_ready()
     
     main_page.tap_people_tab()
-    time.sleep(1)
     
     assert main_page.is_people_tab_selected(), "People tab should be selected"
     print("✅ Successfully navigated to People tab")
 
 
+@pytest.mark.screens(DEVICES)
 def test_navigate_to_devices_tab(driver):
     """Test navigation to Devices tab"""
-    main_page = FindMyMainPage(driver)
-    time.sleep(2)
+    main_page = FindMyMainPage(driver).wait_until_ready()
     
     main_page.tap_devices_tab()
-    time.sleep(1)
     
     assert main_page.is_devices_tab_selected(), "Devices tab should be selected"
     print("✅ Successfully navigated to Devices tab")
 
 
+@pytest.mark.screens(ITEMS)
 def test_navigate_to_items_tab(driver):
     """Test navigation to Items tab"""
-    main_page = FindMyMainPage(driver)
-    time.sleep(2)
+    main_page = FindMyMainPage(driver).wait_until_ready()
     
     main_page.tap_items_tab()
-    time.sleep(1)
     
     print("✅ Successfully navigated to Items tab")
 
 
+@pytest.mark.screens(ME)
 def test_navigate_to_me_tab(driver):
     """Test navigation to Me tab"""
-    main_page = FindMyMainPage(driver)
-    time.sleep(2)
+    main_page = FindMyMainPage(driver).wait_until_ready()
     
     main_page.tap_me_tab()
-    time.sleep(1)
     
     print("✅ Successfully navigated to Me tab")
 
 
+@pytest.mark.screens(PEOPLE, PERSON_DETAIL)
 def test_view_person_details(driver):
     """Test viewing person details"""
-    main_page = FindMyMainPage(driver)
-    time.sleep(2)
+    main_page = FindMyMainPage(driver).wait_until_ready()
     
     # Navigate to People tab
     main_page.tap_people_tab()
-    time.sleep(1)
     
     # Tap first person
     detail_page = main_page.tap_first_person()
-    time.sleep(2)
     
     # Verify detail page
     detail_page.verify_detail_page_displayed()
@@ -109,23 +70,20 @@ def test_view_person_details(driver):
     
     # Close detail page
     detail_page.tap_close_button()
-    time.sleep(1)
     
     print("✅ Successfully viewed person details")
 
 
+@pytest.mark.screens(DEVICES, DEVICE_DETAIL)
 def test_view_device_details(driver):
     """Test viewing device details"""
-    main_page = FindMyMainPage(driver)
-    time.sleep(2)
+    main_page = FindMyMainPage(driver).wait_until_ready()
     
     # Navigate to Devices tab
     main_page.tap_devices_tab()
-    time.sleep(1)
     
     # Tap first device
     detail_page = main_page.tap_first_device()
-    time.sleep(2)
     
     # Verify detail page
     detail_page.verify_detail_page_displayed()
@@ -136,7 +94,6 @@ def test_view_device_details(driver):
     
     # Close detail page
     detail_page.tap_close_button()
-    time.sleep(1)
     
     print("✅ Successfully viewed device details")
 
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test fleet actions against several stand-in servers
+"""
+
+import io
+import json
+import time
+
+from harness import SessionPool
+from harness.fake_appium import LatencyModel
+from harness.fleet import FleetRunner, fake_inventory, main
+from page_objects import FindMyMainPage
+
+
+def test_play_sound_across_handsets_within_limits(fake_findmy):
+    latency = LatencyModel(base=0.01)
+    handsets = [fake_findmy(devices=["Chi's Laptop", f"Laptop {index}", "Keys Tracker"], latency=latency)
+                for index in range(3)]
+    output = io.StringIO()
+    pool = SessionPool(reset=lambda driver: FindMyMainPage(driver).return_to_main_screen())
+    try:
+        runner = FleetRunner(pool, fake_inventory([handset.url for handset in handsets]), per_host=2, output=output)
+        records = runner.run("play-sound", match="*laptop*")
+    finally:
+        pool.close_all()
+    
+    # Every record was streamed as one JSON line
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == records
+    assert all(record["ok"] for record in records)
+    assert sorted(record["action"] for record in records) == ["list-devices"] * 3 + ["play-sound"] * 6
+    for index, handset in enumerate(handsets):
+        assert {target for action, target in handset.app.events if action == "Play Sound"} == {
+            "Chi's Laptop", f"Laptop {index}"}
+    # All stand-ins share one host; one session per handset serves all its actions
+    assert runner.peak == {"127.0.0.1": 2}
+    assert (pool.created, pool.reused) == (3, 6)
+
+
+def test_rate_limit_and_failures(capsys):
+    started = time.monotonic()
+    assert main(["--fake", "2", "--rate", "2", "list-devices"]) == 0
+    assert time.monotonic() - started >= 0.5  # second start waits 1/rate
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(record["handset"] for record in lines) == ["fake-1", "fake-2"]
+    assert all(record["ok"] and "Chi's Laptop, Home, Now" in record["devices"] for record in lines)
+    
+    pool = SessionPool()
+    dead = fake_inventory(["http://127.0.0.1:9"])
+    [record] = FleetRunner(pool, dead).run("play-sound")
+    assert record["action"] == "list-devices" and not record["ok"]
+    assert record["error"].startswith("MaxRetryError")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the flight recorder and its trace timelines
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from harness.flight_traces import trace_filename
+from page_objects.flight_recorder import FlightRecorder, recorder
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FAILING_TESTS = '''
+from page_objects import BasePage
+from page_objects.flight_recorder import log
+
+
+class CheckoutPage(BasePage):
+    def confirm(self):
+        log("✅ Confirmed")
+        assert False, "not confirmed"
+
+
+def test_passes():
+    pass
+
+
+def test_fails():
+    CheckoutPage(None).confirm()
+'''
+
+PLUGIN = '''
+from harness.flight_traces import FlightTraces
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(FlightTraces("traces"), "flight-traces")
+'''
+
+
+def test_ring_buffer_keeps_the_newest_events(capsys):
+    flights = FlightRecorder(capacity=3)
+    for number in range(5):
+        flights.log(f"step {number}")
+    assert [event["name"] for event in flights.trace_events() if event["ph"] == "i"] == ["step 2", "step 3", "step 4"]
+    assert flights.dropped == 2
+    assert capsys.readouterr().out == ""
+    
+    flights.echo = True
+    flights.log("✅ Tapped Devices tab")
+    assert capsys.readouterr().out == "✅ Tapped Devices tab\n"
+
+
+def test_commands_and_waits_nest_inside_page_methods(fake_findmy, tmp_path):
+    recorder.clear()
+    fake_findmy(on_create=recorder.attach).main_page().tap_devices_tab()
+    with open(recorder.export(str(tmp_path / "run.trace.json"))) as source:
+        events = json.load(source)["traceEvents"]
+    
+    tap = next(event for event in events if event["name"] == "FindMyMainPage.tap_devices_tab")
+    inside = [event for event in events
+              if event["ph"] == "X" and tap["ts"] <= event["ts"] and event["ts"] + event["dur"] <= tap["ts"] + tap["dur"]]
+    categories = {event["cat"] for event in inside}
+    assert {"page", "wait", "command"} <= categories
+    assert any(event["name"] == "clickElement" for event in inside)
+    assert any(event["ph"] == "i" and event["name"] == "✅ Tapped Devices tab" for event in events)
+    assert any(event["args"] == {"using": "accessibility id", "value": "Devices"}
+               for event in inside if event["name"] == "findElements")
+
+
+def test_failing_test_writes_its_timeline(tmp_path):
+    (tmp_path / "test_checkout.py").write_text(FAILING_TESTS)
+    (tmp_path / "conftest.py").write_text(PLUGIN)
+    completed = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "test_checkout.py"],
+        cwd=tmp_path, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=PROJECT_ROOT),
+    )
+    assert completed.returncode == 1, completed.stdout + completed.stderr
+    assert "not confirmed" in completed.stdout and "Captured stdout" not in completed.stdout
+    assert os.listdir(tmp_path / "traces") == [trace_filename("test_checkout.py::test_fails")]
+    
+    with open(tmp_path / "traces" / trace_filename("test_checkout.py::test_fails")) as source:
+        events = {event["name"]: event for event in json.load(source)["traceEvents"]}
+    assert events["test_checkout.py::test_fails"]["args"] == {"outcome": "failed"}
+    assert events["test_checkout.py::test_passes"]["args"] == {"outcome": "passed"}
+    assert events["CheckoutPage.confirm"]["args"] == {"error": "AssertionError"}
+    assert {"setup", "call", "teardown", "✅ Confirmed"} <= set(events)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test batched W3C Actions
+"""
+
+import time
+
+import pytest
+from page_objects import DeviceDetailPage
+from page_objects.gestures import SCREEN, _Pause, _Step
+
+
+@pytest.fixture
+def findmy(fake_findmy):
+    """Factory: (main page, simulator backend) for the given app settings"""
+    def start(**settings):
+        findmy = fake_findmy(**settings)
+        return findmy.main_page(), findmy.backend
+    
+    return start
+
+
+def test_tab_taps_share_one_round_trip(findmy):
+    main_page, backend = findmy()
+    batch = main_page.batch().tap_tab("Devices").tap_tab("Items").tap_tab("Me")
+    batch.perform()
+    
+    assert backend.app.tab == "Me"
+    assert (batch.round_trips, batch.batched, batch.fallbacks) == (1, 3, 0)
+    assert backend.commands["performActions"] == 1
+    assert backend.commands["click"] == 0
+
+
+def test_play_sound_flow(findmy):
+    main_page, backend = findmy()
+    finds = backend.commands["findElement"] + backend.commands["findElements"]
+    batch = main_page.batch()
+    batch.tap_tab("Devices").tap_cell("Chi's Laptop").wait_for(DeviceDetailPage)
+    batch.tap(DeviceDetailPage.PLAY_SOUND_BUTTON).tap(DeviceDetailPage.CLOSE_BUTTON, navigates=SCREEN)
+    detail = batch.perform()
+    
+    assert isinstance(detail, DeviceDetailPage)
+    assert ("Play Sound", "Chi's Laptop") in backend.app.events
+    assert backend.app.detail is None
+    # Tab, then cell, then Play Sound + Close together
+    assert (batch.round_trips, batch.fallbacks) == (3, 0)
+    # Only the detail page's readiness check looks elements up
+    assert backend.commands["click"] == 0
+    assert backend.commands["findElement"] + backend.commands["findElements"] - finds <= 2
+
+
+def test_late_targets_fall_back_to_one_by_one(findmy):
+    main_page, backend = findmy(delays={"tab": 0.8})
+    batch = main_page.batch().tap_tab("Devices").tap_cell("Chi's Laptop").wait_for(DeviceDetailPage)
+    detail = batch.perform()
+    
+    # The Devices list was still loading when the batch looked for the cell
+    assert batch.fallbacks == 1
+    assert detail.get_device_name() == "Chi's Laptop"
+    detail.tap_close_button()
+
+
+def test_every_step_can_run_on_its_own():
+    with pytest.raises(TypeError):
+        _Step()
+    started = time.monotonic()
+    _Pause(0.1).fallback(None)
+    assert time.monotonic() - started >= 0.1
+
+
+def test_swipes_scroll_the_list(findmy):
+    devices = [f"Family iPhone {number}" for number in range(1, 31)]
+    main_page, backend = findmy(devices=devices)
+    main_page.tap_devices_tab()
+    
+    batch = main_page.batch().swipe("down").swipe("down")
+    batch.perform()
+    assert backend.app.first_row["Devices"] == 18
+    
+    batch.swipe("up").tap_cell("Family iPhone 12").perform()
+    assert backend.app.detail == ("Devices", "Family iPhone 12")
+    # Both swipes down in one call; the cell is resolved after the swipe up
+    assert batch.round_trips == 3
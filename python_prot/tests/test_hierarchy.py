@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the streaming hierarchy parser and archive
+"""
+
+import io
+import tracemalloc
+
+import pytest
+from harness.fake_appium import FindMyApp
+from harness.hierarchy import HierarchyArchive, iter_nodes, main, parse
+from page_objects import BasePage
+
+
+def devices_source(count=4, tab='Devices'):
+    app = FindMyApp(devices=[f"Device {number}" for number in range(count)])
+    app.activate()
+    app.tab = tab
+    return app.page_source()
+
+
+def long_list_source(rows):
+    cells = ''.join(
+        f'<XCUIElementTypeCell type="XCUIElementTypeCell" label="Row {row}" x="0" y="{row * 60}" width="390" '
+        f'height="60" visible="true" enabled="true"><XCUIElementTypeStaticText label="Row {row}"/></XCUIElementTypeCell>'
+        for row in range(rows)
+    )
+    return (f'<AppiumAUT><XCUIElementTypeApplication name="Find My"><XCUIElementTypeTable>{cells}'
+            f'</XCUIElementTypeTable></XCUIElementTypeApplication></AppiumAUT>')
+
+
+def test_parse_keeps_structure_and_attributes():
+    root = parse(devices_source())
+    assert root.type == "XCUIElementTypeApplication" and root.depth == 0
+    cells = [node for node in root.iter() if node.type == "XCUIElementTypeCell"]
+    assert [cell.label.split(',')[0] for cell in cells] == ["Device 0", "Device 1", "Device 2", "Device 3"]
+    assert cells[1].rect == (0, 180, 390, 60)
+    assert [node.name for node in root.iter() if node.selected] == ["Devices"]
+
+
+def streaming_peak(rows):
+    source = long_list_source(rows).encode('utf-8')
+    tracemalloc.start()
+    count = sum(1 for node in iter_nodes(io.BytesIO(source)) if node.type == "XCUIElementTypeCell")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert count == rows
+    return peak, len(source)
+
+
+def test_streaming_memory_does_not_grow_with_the_tree():
+    small, _ = streaming_peak(2000)
+    large, size = streaming_peak(50000)
+    # Bounded by the read chunk, not by the 10 MB source
+    assert large < 2 * small
+    assert large < size / 5
+
+
+def test_archive_deduplicates_and_answers_step_queries(tmp_path):
+    path = str(tmp_path / "hierarchy.sqlite")
+    people, devices = devices_source(tab='People'), devices_source(count=30)
+    with HierarchyArchive(path) as archive:
+        for label, source in [("launch", people), ("tap Devices", devices), ("settled", devices)]:
+            archive.record(source, label, run="test_one")
+        stats = archive.stats()
+    assert (stats['steps'], stats['sources']) == (3, 2)
+    assert stats['stored_bytes'] * 4 < stats['raw_bytes']
+    
+    with HierarchyArchive(path) as archive:
+        assert archive.steps("test_one") == [(1, "launch"), (2, "tap Devices"), (3, "settled")]
+        cells = archive.find(3, "test_one", element_type="XCUIElementTypeCell")
+        assert cells[0].label.startswith("Device 0") and len(cells) == 12
+        assert archive.find(1, "test_one", text="device 0") == []
+        assert archive.source(2, "test_one") == devices
+        with pytest.raises(KeyError):
+            archive.source(9, "test_one")
+
+
+def test_page_objects_record_each_snapshot(fake_findmy, tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "hierarchy.sqlite")
+    archive = HierarchyArchive(path)
+    archive.current_run = "tests/test_hierarchy.py::flow"
+    monkeypatch.setattr(BasePage, "hierarchy_sink", archive)
+    fake_findmy().main_page().tap_devices_tab()
+    steps = archive.steps(archive.current_run)
+    archive.close()
+    
+    assert [label for _, label in steps] == ["FindMyMainPage.wait_until_ready", "FindMyMainPage.tap_devices_tab"]
+    main([path, "--run", "tests/test_hierarchy.py::flow", "--step", "2", "--type", "Cell"])
+    assert "Cell \"Chi's Laptop, Home, Now\" (0,180 390x60)" in capsys.readouterr().out
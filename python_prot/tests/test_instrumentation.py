@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Test per-command latency instrumentation
+"""
+
+import json
+from harness.instrumentation import TEST_CODE, latency_stats
+from page_objects import FindMyMainPage
+
+
+def test_commands_are_attributed_to_page_methods(fake_findmy, tmp_path):
+    """Each command knows the page-object method it ran inside"""
+    findmy = fake_findmy()
+    recorder = findmy.commands
+    main_page = FindMyMainPage(findmy.driver)
+    main_page.tap_devices_tab()
+    main_page.tap_device_by_name("Chi's Laptop")
+    findmy.driver.get_window_size()
+    
+    report = json.loads(open(recorder.write_report(tmp_path / "latency.json")).read())
+    lookup = report["methods"]["FindMyMainPage.tap_device_by_name"]
+    assert lookup["commands"]["findElements"] >= 1
+    assert lookup["bytes_sent"] > 0 and lookup["bytes_received"] > 0
+    assert {"p50_ms", "p95_ms", "p99_ms", "histogram"} <= set(lookup)
+    assert any(path.startswith("FindMyMainPage.tap_device_by_name > DeviceDetailPage.wait_until_ready")
+               for path in report["call_paths"])
+    assert report["methods"][TEST_CODE]["commands"]["getWindowRect"] == 1
+    assert report["total_commands"] == recorder.count()
+
+
+def test_latency_stats_percentiles():
+    """Percentiles use the nearest-rank method"""
+    stats = latency_stats(list(range(1, 101)))
+    assert (stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["max_ms"]) == (50, 95, 99, 100)
+    assert sum(stats["histogram"].values()) == 100
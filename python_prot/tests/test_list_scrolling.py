@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the scroll-aware cell iterator on long lists
+"""
+
+import asyncio
+import math
+
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+from harness import build_options
+from harness.fake_appium.app import VISIBLE_ROWS
+from page_objects import DeviceDetailPage
+from page_objects.aio import AsyncAppiumDriver, AsyncFindMyMainPage
+
+
+DEVICES = [f"Family iPhone {number:03d}" for number in range(300)]
+
+
+@pytest.fixture
+def findmy(fake_findmy):
+    return fake_findmy(devices=DEVICES)
+
+
+@pytest.fixture
+def app(findmy):
+    return findmy.app
+
+
+@pytest.fixture
+def main_page(findmy):
+    return findmy.main_page().tap_devices_tab()
+
+
+def test_only_materialised_cells_are_in_the_hierarchy(main_page):
+    assert len(main_page.snapshot().table_cells()) < 20
+
+
+def test_tap_device_deep_in_the_list(app, main_page):
+    """A device a few hundred rows down is found with a bounded number of scrolls"""
+    detail = main_page.tap_device_by_name("Family iPhone 250")
+    assert isinstance(detail, DeviceDetailPage)
+    assert detail.get_device_name() == "Family iPhone 250"
+    assert app.scrolls <= math.ceil(250 / (VISIBLE_ROWS - 1)) + 1
+
+
+def test_row_on_screen_is_one_query(findmy, app, main_page):
+    """Rows already in the hierarchy are found server-side, without page sources or scrolls"""
+    before = findmy.commands.count()
+    main_page.tap_device_by_name("Family iPhone 003")
+    commands = [sample.command for sample in findmy.commands.samples[before:]]
+    assert commands[:2] == ["findElements", "clickElement"]
+    assert "getPageSource" not in commands and app.scrolls == 0
+
+
+def test_async_page_reaches_rows_below_the_fold(findmy, app):
+    async def open_device(server_url):
+        async with await AsyncAppiumDriver.create(server_url, build_options()) as driver:
+            main_page = await (await AsyncFindMyMainPage(driver).wait_until_ready()).tap_devices_tab()
+            detail = await main_page.tap_device_by_name("Family iPhone 250")
+            return await detail.get_device_name()
+    
+    assert asyncio.run(open_device(findmy.url)) == "Family iPhone 250"
+    assert app.scrolls <= math.ceil(250 / (VISIBLE_ROWS - 1)) + 1
+
+
+def test_iterator_streams_in_order_and_stops_early(app, main_page):
+    first = [cell.text for _, cell in zip(range(25), main_page.iter_cells())]
+    assert first == [f"{name}, Home, Now" for name in DEVICES[:25]]
+    assert app.scrolls <= 3
+    
+    # A full listing starts from the top again and sees every row once
+    assert main_page.get_all_device_names() == [f"{name}, Home, Now" for name in DEVICES]
+
+
+def test_missing_name_gives_up_after_max_scrolls(app, main_page):
+    main_page.MAX_SCROLLS = 5
+    with pytest.raises(Exception, match="not found"):
+        main_page.tap_device_by_name("Nobody's Phone")
+    assert app.scrolls <= 10
+
+
+def test_scrolls_while_streaming_are_credited_to_the_iterator(findmy, main_page):
+    before = findmy.commands.count()
+    for index, _ in zip(range(30), main_page.iter_cells()):
+        if index == 20:
+            main_page.find_elements(AppiumBy.ACCESSIBILITY_ID, "Close")
+    samples = findmy.commands.samples[before:]
+    scrolls = [sample.path for sample in samples if sample.command == "w3cExecuteScript"]
+    assert scrolls and all(path.startswith("FindMyMainPage.iter_cells > ") for path in scrolls)
+    assert [sample.path for sample in samples if sample.command == "findElements"] == ["FindMyMainPage.find_elements"]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test the XPath to native locator compiler
+"""
+
+import time
+
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+from page_objects.locators import (
+    TolerantId, compile_locator, compile_xpath, stale_ids, table_cell_containing, uncompiled_locators,
+)
+
+
+@pytest.mark.parametrize("xpath, expected", [
+    ("//XCUIElementTypeTable/XCUIElementTypeCell[1]",
+     (AppiumBy.IOS_CLASS_CHAIN, "**/XCUIElementTypeTable/XCUIElementTypeCell[1]")),
+    ("//XCUIElementTypeTable//XCUIElementTypeCell",
+     (AppiumBy.IOS_CLASS_CHAIN, "**/XCUIElementTypeTable/**/XCUIElementTypeCell")),
+    ("(//XCUIElementTypeCell)[3]",
+     (AppiumBy.IOS_CLASS_CHAIN, "**/XCUIElementTypeCell[3]")),
+    ("//*[@name='Close']",
+     (AppiumBy.ACCESSIBILITY_ID, "Close")),
+    ("//XCUIElementTypeButton[@label=\"Play Sound\"]",
+     (AppiumBy.IOS_PREDICATE, 'type == "XCUIElementTypeButton" AND label == "Play Sound"')),
+    ("//XCUIElementTypeTable/XCUIElementTypeCell[contains(@label, 'Laptop')]",
+     (AppiumBy.IOS_CLASS_CHAIN, '**/XCUIElementTypeTable/XCUIElementTypeCell[`label CONTAINS "Laptop"`]')),
+])
+def test_supported_shapes(xpath, expected):
+    """Supported XPath shapes compile to native queries"""
+    assert compile_xpath(xpath) == expected
+
+
+@pytest.mark.parametrize("xpath", [
+    "//XCUIElementTypeCell[2]",
+    "//XCUIElementTypeCell[last()]",
+    "//XCUIElementTypeCell[@foo='1']",
+    "//XCUIElementTypeTable/..",
+])
+def test_unsupported_shapes_fall_back_to_xpath(xpath):
+    """Unsupported shapes keep XPath and are reported"""
+    assert compile_xpath(xpath) is None
+    assert compile_locator(AppiumBy.XPATH, xpath) == (AppiumBy.XPATH, xpath)
+    assert xpath in uncompiled_locators()
+
+
+def test_name_lookup_is_one_predicate_query():
+    """Quotes in names are escaped inside the predicate"""
+    assert table_cell_containing('Chi\'s "Laptop"') == (
+        AppiumBy.IOS_CLASS_CHAIN,
+        '**/XCUIElementTypeTable/XCUIElementTypeCell[`label CONTAINS[c] "Chi\'s \\"Laptop\\""`]',
+    )
+
+
+def test_tolerant_id_is_one_predicate_ranked_by_success():
+    """Every variant goes into one query; variants that matched move to the front"""
+    button = TolerantId("Ring,Off", "Ring, Off", prefix="Ring", pattern=r"Ring(,.*)?")
+    assert compile_locator(AppiumBy.ACCESSIBILITY_ID, button) == (
+        AppiumBy.IOS_PREDICATE,
+        'name == "Ring,Off" OR name == "Ring, Off" OR name BEGINSWITH "Ring" '
+        'OR name MATCHES "Ring(,.*)?"',
+    )
+    
+    variant, name = button.best(["Close", "Ring,On"])
+    assert (variant.operator, name) == ("BEGINSWITH", "Ring,On")
+    button.record(variant, name)
+    button.record(*button.best(["Ring,On"]))
+    assert button.locator()[1].startswith('name BEGINSWITH "Ring" OR name == "Ring,Off"')
+    assert button.success_rate(variant) == 1.0
+    assert stale_ids()["Ring,Off"] == {"Ring,On": 2}
+    assert button.best(["Mute"]) is None
+
+
+def test_changed_state_costs_a_round_trip_not_a_timeout(fake_findmy):
+    """After Play Sound the button reads "Play Sound,On"; the expected id would time out"""
+    findmy = fake_findmy()
+    recorder = findmy.commands
+    detail = findmy.main_page().tap_devices_tab().tap_device_by_name("Chi's Laptop")
+    
+    # Settled screen: the snapshot names the button, one lookup by id
+    detail.wait_for_stable_hierarchy()
+    before = recorder.count()
+    detail.tap_play_sound_button()
+    assert [sample.command for sample in recorder.samples[before:]] == ["findElements", "clickElement"]
+    
+    detail.leave_screen()
+    before = recorder.count()
+    started = time.monotonic()
+    detail.tap_play_sound_button()
+    elapsed = time.monotonic() - started
+    commands = [sample.command for sample in recorder.samples[before:]]
+    
+    assert commands == ["findElements", "getElementAttribute", "clickElement"]
+    assert elapsed < 1.0
+    assert stale_ids()["Play Sound,Off"]["Play Sound,On"] >= 1
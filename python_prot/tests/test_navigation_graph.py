@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test the navigation graph and shortest-path routing
+"""
+
+import pytest
+from page_objects import DeviceDetailPage, FindMyMainPage, PeopleDetailPage
+from page_objects.navigation import (
+    DEVICE_DETAIL, DEVICES, ME, PEOPLE, PERSON_DETAIL, Navigator, Screen, findmy_transitions, shortest_route,
+)
+
+
+def route_names(route):
+    return [transition.destination for transition in route]
+
+
+def test_shortest_routes():
+    transitions = findmy_transitions()
+    assert route_names(shortest_route(transitions, PEOPLE, DEVICE_DETAIL)) == [DEVICES, DEVICE_DETAIL]
+    assert route_names(shortest_route(transitions, DEVICE_DETAIL, PERSON_DETAIL)) == [DEVICES, PEOPLE, PERSON_DETAIL]
+    assert route_names(shortest_route(transitions, ME, ME, start_satisfies=True)) == []
+    # Another device: close the current one and open the right one
+    assert route_names(shortest_route(transitions, DEVICE_DETAIL, DEVICE_DETAIL)) == [DEVICES, DEVICE_DETAIL]
+
+
+@pytest.fixture
+def driver(fake_findmy):
+    return fake_findmy().driver
+
+
+def test_go_to_detects_screen_and_skips_needless_taps(driver):
+    """An already selected tab is not tapped again"""
+    navigator = Navigator(driver)
+    main_page = navigator.go_to(DEVICES)
+    assert isinstance(main_page, FindMyMainPage) and main_page.is_devices_tab_selected()
+    assert navigator.current_screen() == Screen(DEVICES)
+    taken = navigator.transitions_taken
+    
+    navigator.go_to(DEVICES)
+    assert navigator.transitions_taken == taken
+    
+    detail = navigator.go_to(DEVICE_DETAIL, "Chi's Laptop")
+    assert isinstance(detail, DeviceDetailPage)
+    assert navigator.current_screen() == Screen(DEVICE_DETAIL, "Chi's Laptop")
+    assert navigator.transitions_taken == taken + 1
+    
+    person = navigator.go_to(PERSON_DETAIL)
+    assert isinstance(person, PeopleDetailPage)
+    assert navigator.current_screen().name == PERSON_DETAIL
+    assert navigator.transitions_taken == taken + 4
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test the screen-aware test ordering
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from harness.ordering import CostModel, ScreenProfile, optimize
+from page_objects.navigation import DEVICE_DETAIL, DEVICES, ITEMS, ME, PEOPLE, PERSON_DETAIL
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profiles(*screens):
+    return [ScreenProfile(index, f"tests/test_x.py::test_{index}", *spec[:2], **spec[2] if len(spec) > 2 else {})
+            for index, spec in enumerate(screens)]
+
+
+def test_tests_on_the_same_screens_and_session_run_together():
+    tests = profiles(
+        (DEVICES, [DEVICE_DETAIL]),
+        (ME, []),
+        (DEVICES, [], {"session": "es-locale"}),
+        (DEVICES, [DEVICE_DETAIL]),
+        (PEOPLE, [PERSON_DETAIL]),
+        (ME, [], {"session": "es-locale"}),
+        (ITEMS, []),
+    )
+    model = CostModel(transition_seconds=1.0, session_setup_seconds=10.0)
+    order = optimize(tests, model)
+    
+    assert sorted(test.index for test in order) == list(range(len(tests)))
+    sessions = [test.session for test in order]
+    assert sessions == sorted(sessions, key=sessions.index)  # one block per session
+    assert model.total(order) < model.total(tests)
+    assert model.total(order)[1] == 2 and model.total(tests)[1] == 5
+    # Detail pages are closed by the pool, so a detail test ends on its tab
+    assert tests[0].end == DEVICES
+
+
+def test_order_after_constraints_are_kept():
+    tests = profiles(
+        (DEVICES, []),
+        (ME, [], {}),
+        (DEVICES, [DEVICE_DETAIL]),
+    )
+    tests[1].after = ("test_2",)
+    order = optimize(tests, CostModel())
+    names = [test.name for test in order]
+    assert names.index("test_2") < names.index("test_1")
+    
+    tests[2].after = ("test_x.py::test_1",)
+    with pytest.raises(ValueError, match="cycle"):
+        optimize(tests, CostModel())
+
+
+def test_collection_is_reordered_and_the_saving_reported():
+    completed = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", "--fake-appium",
+         "--optimize-order", "--transition-seconds", "1", "tests/test_findmy_navigation.py", "tests/test_device.py"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    collected = [line.rsplit("::", 1)[-1] for line in completed.stdout.splitlines() if "::" in line]
+    assert collected.index("test_view_person_details") < collected.index("test_navigate_to_devices_tab")
+    assert collected.index("test_view_device_details") < collected.index("test_navigate_to_items_tab")
+    assert "saved ~2.0 s" in completed.stdout
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the multi-device parallel scheduler against stand-in servers
+"""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+from harness import scheduler
+from harness.fake_appium import SimulatorBackend
+from harness.inventory import device_environment, validate_inventory
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CapturingBackend(SimulatorBackend):
+    """Simulator that remembers the capabilities of every new session"""
+    
+    def __init__(self):
+        super().__init__()
+        self.capabilities = []
+    
+    def cmd_newSession(self, session, params, body):
+        result = super().cmd_newSession(session, params, body)
+        self.capabilities.append(result['capabilities'])
+        return result
+
+
+def make_device(index, server_url):
+    return {
+        'name': f"device-{index}",
+        'udid': f"0000-FAKE-{index}",
+        'server_url': server_url,
+        'wda_local_port': 8100 + index,
+        'updated_wda_bundle_id': f"com.example.wda{index}",
+    }
+
+
+def test_partition_balances_by_history():
+    """Longest tests are spread first, unknown tests assume the median"""
+    durations = {'a': 10.0, 'b': 6.0, 'c': 5.0, 'd': 4.0}
+    buckets, loads = scheduler.partition(['a', 'b', 'c', 'd', 'new'], durations, 2)
+    
+    assert buckets == [['a', 'c'], ['b', 'd', 'new']]
+    assert loads == [15.0, 15.5]
+
+
+def test_inventory_rejects_shared_wda_ports():
+    devices = [make_device(1, 'http://a'), make_device(2, 'http://b')]
+    devices[1]['wda_local_port'] = devices[0]['wda_local_port']
+    with pytest.raises(ValueError, match="wda_local_port"):
+        validate_inventory(devices)
+    assert device_environment(make_device(3, 'http://c'))['WDA_LOCAL_PORT'] == '8103'
+
+
+def test_option_values_are_not_taken_for_test_paths():
+    """pytest's own parse decides which arguments are test paths"""
+    pytest_args = ['tests/test_scheduler.py', '--rootdir', '.', '-x', '-p', 'harness.pytest_results']
+    node_ids, test_paths = scheduler.collect_tests(pytest_args, cwd=PROJECT_DIR)
+    
+    assert test_paths == ['tests/test_scheduler.py'] and node_ids
+    assert scheduler.options_only(pytest_args, test_paths) == ['--rootdir', '.', '-x', '-p', 'harness.pytest_results']
+    # A value spelled like a test path stays with its option
+    assert scheduler.options_only(['--rootdir', 'tests', '-x', 'tests'], ['tests']) == ['--rootdir', 'tests', '-x']
+    assert scheduler.options_only(['-x', 'tests'], ['tests']) == ['-x']
+
+
+def test_parallel_run_against_stand_in_servers(fake_findmy, tmp_path):
+    """Each worker drives its own server with its own UDID and WDA port"""
+    backends = [CapturingBackend(), CapturingBackend()]
+    servers = [fake_findmy(backend=backend) for backend in backends]
+    inventory = tmp_path / "devices.json"
+    inventory.write_text(json.dumps([make_device(i, server.url) for i, server in enumerate(servers)]))
+    report = scheduler.run(
+        str(inventory), ['tests/test_findmy_navigation.py'],
+        durations_path=str(tmp_path / "durations.json"),
+        report_path=str(tmp_path / "report.json"),
+        junit_path=str(tmp_path / "report.xml"),
+        cwd=PROJECT_DIR,
+    )
+    
+    assert report['summary']['passed'] == len(report['tests']) > 1
+    assert {test['device'] for test in report['tests'].values()} == {'device-0', 'device-1'}
+    for index, backend in enumerate(backends):
+        assert backend.capabilities
+        assert {caps['appium:udid'] for caps in backend.capabilities} == {f"0000-FAKE-{index}"}
+        assert {caps['appium:wdaLocalPort'] for caps in backend.capabilities} == {8100 + index}
+        assert {caps['appium:updatedWDABundleId'] for caps in backend.capabilities} == {f"com.example.wda{index}"}
+    
+    durations = json.loads((tmp_path / "durations.json").read_text())
+    assert set(durations) == set(report['tests'])
+    merged = ET.parse(tmp_path / "report.xml").getroot()
+    assert int(merged.get('tests')) == len(report['tests'])
+    assert len(merged.findall('testsuite')) == 2
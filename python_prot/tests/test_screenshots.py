@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the asynchronous screenshot pipeline
+"""
+
+import base64
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+from harness.screenshots import ALL, FAILURES, ScreenshotArchive, ScreenshotPipeline, dhash, hamming
+
+
+def png(boxes=(), noise=0):
+    """A 390x844 white frame with dark boxes, optionally one pixel off"""
+    image = Image.new('L', (390, 844), 255)
+    draw = ImageDraw.Draw(image)
+    for box in boxes:
+        draw.rectangle(box, fill=40)
+    if noise:
+        image.putpixel((5, 5), 255 - noise)
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+
+class FrameDriver:
+    """Serves a scripted sequence of screenshots"""
+    
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.calls = 0
+    
+    def get_screenshot_as_base64(self):
+        self.calls += 1
+        return base64.b64encode(self.frames.pop(0)).decode('ascii')
+
+
+def test_dhash_ignores_noise_but_not_layout():
+    main = png([(0, 760, 389, 843), (100, 300, 290, 540)])
+    assert hamming(dhash(main), dhash(png([(0, 760, 389, 843), (100, 300, 290, 540)], noise=3))) == 0
+    assert hamming(dhash(main), dhash(png([(0, 760, 389, 843), (200, 120, 389, 300)]))) > 10
+
+
+def test_near_identical_frames_are_stored_once(tmp_path):
+    main, detail = png([(0, 760, 389, 843), (100, 300, 290, 540)]), png([(200, 120, 389, 300)])
+    driver = FrameDriver([main, png([(0, 760, 389, 843), (100, 300, 290, 540)], noise=2), detail, main])
+    path = tmp_path / "run.zip"
+    
+    # One worker keeps "which of two near-identical frames is stored" deterministic
+    with ScreenshotPipeline(str(path), mode=ALL, workers=1) as pipeline:
+        for step in ("main", "main again", "detail"):
+            pipeline.capture(driver, step, test="test_one")
+        pipeline.capture(driver, "main", test="test_two")
+    
+    index = ScreenshotArchive.read_index(str(path))
+    assert [(entry['test'], entry['step']) for entry in index] == [
+        ("test_one", "main"), ("test_one", "main again"), ("test_one", "detail"), ("test_two", "main"),
+    ]
+    assert [entry['duplicate_of'] for entry in index] == [None, 1, None, None]
+    assert pipeline.stats() == {'captured': 4, 'stored': 3, 'skipped': 1}
+
+
+def test_failures_mode_only_captures_failures(tmp_path):
+    driver = FrameDriver([png()])
+    with ScreenshotPipeline(str(tmp_path / "run.zip"), mode=FAILURES) as pipeline:
+        assert pipeline.capture(driver, "step") is None
+        assert driver.calls == 0
+        pipeline.capture_failure(driver, test="test_broken")
+    assert [entry['step'] for entry in ScreenshotArchive.read_index(str(tmp_path / "run.zip"))] == ["failure"]
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="screenshot mode"):
+        ScreenshotPipeline(str(tmp_path / "run.zip"), mode="sometimes")
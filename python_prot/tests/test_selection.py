@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test change-aware test selection
+"""
+
+import subprocess
+
+from harness.selection import ChangeSet, DependencyRecorder, analyze_changes, changed_symbols, select_tests
+from page_objects import BasePage
+
+
+PAGE = '''
+"""Device page"""
+
+AREA = (0, 0, 10, 10)
+
+
+class DevicePage(BasePage):
+    """Device screen"""
+    
+    PLAY = "Play Sound,Off"
+    
+    def play(self):
+        """Tap play"""
+        return self.tap(self.PLAY)
+    
+    def _helper(self):
+        return 1
+'''
+
+MODULE = "page_objects.device_page"
+DEVICE_PAGE = f"{MODULE}:DevicePage"
+
+
+def test_changes_are_compared_member_by_member():
+    # Docstrings, comments and formatting do not count
+    reworded = PAGE.replace('"""Tap play"""', '"""Tap the play button"""').replace("return 1", "return 1  # one")
+    assert changed_symbols(PAGE, reworded, MODULE) == (set(), set())
+    
+    renamed = PAGE.replace('"Play Sound,Off"', '"Play Sound, Off"')
+    assert changed_symbols(PAGE, renamed, MODULE)[0] == {f"{DEVICE_PAGE}.PLAY"}
+    
+    extended = PAGE + "\n    def stop(self):\n        pass\n"
+    assert changed_symbols(PAGE, extended, MODULE) == ({f"{DEVICE_PAGE}.stop"}, {f"{DEVICE_PAGE}.stop"})
+    
+    moved = PAGE.replace("(0, 0, 10, 10)", "(0, 0, 20, 20)")
+    assert changed_symbols(PAGE, moved, MODULE)[0] == {f"{MODULE}:"}
+
+
+def test_only_users_of_changed_members_are_selected():
+    dependencies = {
+        "page_classes": [DEVICE_PAGE, "page_objects.main_page:MainPage"],
+        "tests": {
+            "tests/test_device.py::test_play": [DEVICE_PAGE, f"{DEVICE_PAGE}.PLAY", f"{DEVICE_PAGE}.play"],
+            "tests/test_device.py::test_open": [DEVICE_PAGE],
+            "tests/test_tabs.py::test_tabs": ["page_objects.main_page:MainPage"],
+        },
+    }
+    nodeids = list(dependencies["tests"]) + ["tests/test_new.py::test_new"]
+    
+    def select(**changes):
+        return select_tests(nodeids, dependencies, ChangeSet(**changes))[0]
+    
+    assert select(symbols={f"{DEVICE_PAGE}.PLAY"}) == ["tests/test_device.py::test_play", "tests/test_new.py::test_new"]
+    # Private helpers and module code reach every user of the class
+    assert select(symbols={f"{DEVICE_PAGE}._helper"})[:2] == nodeids[:2]
+    assert select(symbols={f"{MODULE}:"})[:2] == nodeids[:2]
+    assert select(test_files={"tests/test_tabs.py"}) == nodeids[2:]
+    
+    # Code outside page objects cannot be attributed: everything runs
+    changes = ChangeSet(symbols={"page_objects.navigation:Navigator.go_to"})
+    assert select_tests(nodeids, dependencies, changes)[0] == nodeids
+    assert "Navigator" in changes.full_run_reason
+
+
+def test_imported_module_code_and_copied_members_are_followed(tmp_path):
+    (tmp_path / "page_objects" / "aio").mkdir(parents=True)
+    (tmp_path / "page_objects" / "device_page.py").write_text(PAGE)
+    (tmp_path / "page_objects" / "people_page.py").write_text(
+        "from .device_page import AREA\n\n\nclass PeoplePage(BasePage):\n    MASKS = (AREA,)\n")
+    (tmp_path / "page_objects" / "aio" / "device_page.py").write_text(
+        "from ..device_page import DevicePage\n\n\nclass AsyncDevicePage(AsyncBasePage):\n"
+        "    PLAY = DevicePage.PLAY\n")
+    people_page, async_page = "page_objects.people_page:PeoplePage", "page_objects.aio.device_page:AsyncDevicePage"
+    dependencies = {
+        "page_classes": [DEVICE_PAGE, people_page, async_page],
+        "tests": {
+            "tests/test_device.py::test_play": [DEVICE_PAGE, f"{DEVICE_PAGE}.PLAY"],
+            "tests/test_people.py::test_masks": [people_page],
+            "tests/test_aio.py::test_play": [async_page, f"{async_page}.PLAY"],
+            "tests/test_aio.py::test_open": [async_page],
+        },
+    }
+    nodeids = list(dependencies["tests"])
+    
+    def select(symbol):
+        return select_tests(nodeids, dependencies, ChangeSet(symbols={symbol}, root=str(tmp_path)))[0]
+    
+    # Module code reaches the classes of every module importing from it
+    assert select(f"{MODULE}:") == nodeids
+    # A member copied into another class changes with it
+    assert select(f"{DEVICE_PAGE}.PLAY") == [nodeids[0], nodeids[2]]
+
+
+def test_git_diff_is_mapped_to_page_object_members(tmp_path):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+    
+    (tmp_path / "page_objects").mkdir()
+    (tmp_path / "page_objects" / "device_page.py").write_text(PAGE)
+    (tmp_path / "README.md").write_text("# Tests\n")
+    git("init", "-q")
+    git("add", "-A")
+    git("-c", "user.email=ci@example.com", "-c", "user.name=ci", "commit", "-qm", "base")
+    
+    (tmp_path / "page_objects" / "device_page.py").write_text(PAGE.replace("Play Sound,Off", "Play Sound, Off"))
+    (tmp_path / "README.md").write_text("# Device tests\n")
+    changes = analyze_changes("HEAD", str(tmp_path))
+    assert changes.full_run_reason is None
+    assert changes.symbols == {f"{DEVICE_PAGE}.PLAY"}
+    
+    (tmp_path / "harness").mkdir()
+    (tmp_path / "harness" / "pool.py").write_text("POOL = 1\n")
+    assert analyze_changes("HEAD", str(tmp_path)).full_run_reason == "harness/pool.py changed"
+
+
+def test_recorder_captures_methods_and_locator_constants(fake_findmy):
+    recorder = DependencyRecorder()
+    main_page = fake_findmy().main_page()
+    recorder.start()
+    main_page.tap_devices_tab().tap_device_by_name("Chi's Laptop").tap_play_sound_button()
+    used = recorder.stop()
+    
+    assert "__getattribute__" not in vars(BasePage)
+    assert {
+        "page_objects.findmy_main_page:FindMyMainPage.tap_device_by_name",
+        "page_objects.device_detail_page:DeviceDetailPage.tap_play_sound_button",
+        "page_objects.device_detail_page:DeviceDetailPage.PLAY_SOUND_BUTTON",
+        "page_objects.findmy_main_page:FindMyMainPage.DEVICES_TAB",
+        "page_objects.base_page:BasePage.find_element",
+        "page_objects.base_page:BasePage",
+    } <= set(used)
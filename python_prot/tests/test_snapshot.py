@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test page-source snapshot lookups
+"""
+
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+from page_objects.snapshot import PageSnapshot
+
+
+PAGE_SOURCE = """<?xml version="1.0" encoding="UTF-8"?>
+<AppiumAUT>
+  <XCUIElementTypeApplication type="XCUIElementTypeApplication" name="Find My" label="Find My">
+    <XCUIElementTypeWindow type="XCUIElementTypeWindow">
+      <XCUIElementTypeTable type="XCUIElementTypeTable">
+        <XCUIElementTypeCell type="XCUIElementTypeCell" label="Chi's iPhone, This iPhone"/>
+        <XCUIElementTypeCell type="XCUIElementTypeCell" label="Chi's Laptop, Home, Now"/>
+        <XCUIElementTypeOther type="XCUIElementTypeOther" name="Footer"/>
+      </XCUIElementTypeTable>
+      <XCUIElementTypeTabBar type="XCUIElementTypeTabBar">
+        <XCUIElementTypeButton type="XCUIElementTypeButton" name="People" label="People"/>
+        <XCUIElementTypeButton type="XCUIElementTypeButton" name="Devices" label="Devices"/>
+      </XCUIElementTypeTabBar>
+    </XCUIElementTypeWindow>
+  </XCUIElementTypeApplication>
+</AppiumAUT>
+"""
+
+
+@pytest.fixture
+def snapshot():
+    return PageSnapshot(PAGE_SOURCE)
+
+
+def test_indexes_by_type_label_and_name(snapshot):
+    """Nodes are indexed by type, label and accessibility id"""
+    assert len(snapshot.find_by_type("XCUIElementTypeButton")) == 2
+    assert snapshot.find_by_label("Chi's Laptop, Home, Now")[0].type == "XCUIElementTypeCell"
+    assert snapshot.find_by_accessibility_id("Devices")[0].label == "Devices"
+
+
+def test_table_cells_and_case_insensitive_match(snapshot):
+    """Only table cells are listed and matched"""
+    labels = [cell.label for cell in snapshot.table_cells()]
+    assert labels == ["Chi's iPhone, This iPhone", "Chi's Laptop, Home, Now"]
+    assert snapshot.find_cell("chi's laptop").label.startswith("Chi's Laptop")
+    assert snapshot.find_cell("Footer") is None
+
+
+def test_locator_for_single_element(snapshot):
+    """Unique names use accessibility id, everything else a class chain"""
+    devices = snapshot.find_by_accessibility_id("Devices")[0]
+    assert snapshot.locator_for(devices) == (AppiumBy.ACCESSIBILITY_ID, "Devices")
+    
+    laptop = snapshot.find_cell("Laptop")
+    assert snapshot.locator_for(laptop) == (
+        AppiumBy.IOS_CLASS_CHAIN,
+        "XCUIElementTypeWindow[1]/XCUIElementTypeTable[1]/XCUIElementTypeCell[2]",
+    )
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test the soak runner against the stand-in server
+"""
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from harness.fake_appium import LatencyModel
+from harness import soak
+from harness.soak import RollingStats, SoakRunner
+
+
+def test_rolling_stats_flag_upward_drift_only():
+    stats = RollingStats(window=5)
+    for _ in range(5):
+        stats.add(0.100)
+    assert stats.baseline == 0.100 and stats.drift() is None
+    for _ in range(5):
+        stats.add(0.110)
+    assert not stats.drifting()
+    for _ in range(5):
+        stats.add(0.200)
+    assert stats.drift() == pytest.approx(1.0) and stats.drifting()
+    
+    # A large relative change of a tiny step is noise, not drift
+    fast = RollingStats(window=2)
+    for seconds in (0.001, 0.001, 0.005, 0.005):
+        fast.add(seconds)
+    assert fast.drift() > 1 and not fast.drifting()
+
+
+def test_soak_counts_timeouts_and_samples_health(fake_findmy):
+    findmy = fake_findmy(latency=LatencyModel(spike=0.4, spike_every=9))
+    logged = []
+    runner = SoakRunner(findmy.pool, ["tabs"], window=2, step_timeout=0.35, sample_interval=0, log=logged.append)
+    report = runner.run(iterations=3)
+    
+    assert report["iterations"] == 3
+    assert set(report["steps"]) == {"tabs.devices_tab", "tabs.items_tab", "tabs.me_tab", "tabs.people_tab"}
+    assert all(stats["count"] == 3 for stats in report["steps"].values())
+    assert report["timeouts"] > 0 and any(line.startswith("⏰") for line in logged)
+    assert len(report["samples"]) == 4
+    assert all(sample["ready"] and sample["ui_elements"] > 10 for sample in report["samples"])
+    assert report["ui_elements_growth"] == 0
+
+
+def test_failed_recovery_surfaces_the_real_error(fake_findmy, monkeypatch):
+    def wrong_screen(page):
+        raise AssertionError("not on the main screen")
+    
+    def server_down():
+        raise WebDriverException("server down")
+    
+    monkeypatch.setitem(soak.FLOWS, "broken", [("wrong_screen", wrong_screen)])
+    pool = fake_findmy().pool
+    acquire = pool.acquire
+    
+    def acquire_once():
+        pool.acquire = server_down
+        return acquire()
+    
+    pool.acquire = acquire_once
+    runner = SoakRunner(pool, ["broken"], log=lambda message: None)
+    with pytest.raises(WebDriverException, match="server down"):
+        runner.run(iterations=1)
+    assert runner.recoveries == 1 and runner.driver is None
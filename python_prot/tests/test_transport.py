@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test the keep-alive, retrying, gzip-aware Appium transport
+"""
+
+import pytest
+from appium import webdriver
+from selenium.common.exceptions import WebDriverException
+from harness import build_options
+from harness.fake_appium import LatencyModel, SimulatorBackend
+from harness.transport import TunedConnection
+
+
+class FlakyBackend(SimulatorBackend):
+    """Answers the first requests of some commands with 503, like an overloaded lab proxy"""
+    
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = dict(failures)
+    
+    def handle(self, command, method, path, params, body):
+        if self.failures.get(command):
+            self.failures[command] -= 1
+            return 503, {'value': {'error': 'unknown error', 'message': 'Service Unavailable'}}
+        return super().handle(command, method, path, params, body)
+
+
+def test_one_connection_serves_a_whole_flow(fake_findmy):
+    findmy = fake_findmy()
+    findmy.main_page().tap_devices_tab().tap_device_by_name("Chi's Laptop").tap_close_button()
+    
+    stats = findmy.pool.transport_stats.as_dict()
+    assert stats["connections"] == 1
+    assert stats["reuse_rate"] > 0.95
+
+
+def test_large_responses_are_gzipped(fake_findmy):
+    connection = TunedConnection(fake_findmy(latency=LatencyModel(bandwidth=2_000_000)).url)
+    driver = webdriver.Remote(command_executor=connection, options=build_options())
+    try:
+        source = driver.page_source
+    finally:
+        driver.quit()
+    
+    assert "XCUIElementTypeTabBar" in source
+    assert connection.stats.compressed >= 1
+    assert connection.stats.wire_bytes * 3 < connection.stats.body_bytes
+
+
+def test_transient_errors_are_retried_only_when_safe(fake_findmy):
+    findmy = fake_findmy(backend=FlakyBackend({'getPageSource': 2, 'click': 1}))
+    connection = TunedConnection(findmy.url, backoff_factor=0.01)
+    driver = webdriver.Remote(command_executor=connection, options=build_options())
+    try:
+        assert "XCUIElementTypeApplication" in driver.page_source
+        assert connection.stats.retries == 2
+        
+        # A tap is not replayed: it might already have happened
+        tab = driver.find_element("accessibility id", "Devices")
+        with pytest.raises(WebDriverException):
+            tab.click()
+        assert connection.stats.retries == 2
+    finally:
+        driver.quit()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test visual checks against reference screenshots
+"""
+
+import time
+
+import numpy as np
+import pytest
+from page_objects import BasePage, DeviceDetailPage
+from page_objects.visual import VisualChecker, compare
+
+
+def screen(height=844, width=390):
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    image[440:470, 16:316] = 60       # name
+    image[500:556, 16:374] = (0, 122, 255)  # button
+    return image
+
+
+def test_masked_regions_and_tolerance():
+    reference = screen()
+    actual = screen()
+    actual[0:420] = np.random.default_rng(1).integers(0, 256, (420, 390, 3), dtype=np.uint8)  # map tiles
+    actual[440:470, 16:316] = 200                                                              # other name
+    assert not compare(actual, reference)
+    assert compare(actual, reference, masks=[(0, 0, 390, 420), (16, 440, 300, 30)])
+    
+    # Rendering noise stays under the pixel tolerance
+    noisy = np.where(reference > 127, reference - 10, reference + 10).astype(np.uint8)
+    assert compare(noisy, reference).mismatch == 0.0
+    
+    # A missing button is more than 1% of the screen
+    actual = screen()
+    actual[500:556, 16:374] = 255
+    result = compare(actual, reference, masks=[(0, 0, 390, 420)])
+    assert not result.matched and result.mismatch > result.tolerance
+
+
+def test_masks_scale_to_device_pixels():
+    reference = screen(844 * 3, 390 * 3)
+    actual = reference.copy()
+    actual[0:1260] = 0
+    assert compare(actual, reference, masks=[(0, 0, 390, 420)], scale=3.0)
+    assert not compare(actual, reference, masks=[(0, 0, 390, 420)])
+
+
+def test_full_resolution_check_takes_milliseconds():
+    reference = screen(844 * 3, 390 * 3)
+    actual = reference.copy()
+    compare(actual, reference, masks=[(0, 0, 390, 420)], scale=3.0)
+    started = time.perf_counter()
+    for _ in range(5):
+        compare(actual, reference, masks=[(0, 0, 390, 420)], scale=3.0)
+    assert (time.perf_counter() - started) / 5 < 0.1
+
+
+@pytest.fixture
+def devices_page(fake_findmy, monkeypatch, tmp_path):
+    monkeypatch.setattr(BasePage, "visual_checker", VisualChecker(str(tmp_path), update=True))
+    return fake_findmy().main_page().tap_devices_tab()
+
+
+def test_detail_pages_are_verified_from_one_screenshot(devices_page, tmp_path):
+    # Record the reference on one device, then check another
+    devices_page.tap_device_by_name("Chi's Laptop").tap_close_button()
+    assert (tmp_path / "device_detail.png").exists()
+    BasePage.visual_checker = VisualChecker(str(tmp_path))
+    
+    detail = devices_page.tap_device_by_name("Chi's iPad")
+    assert detail.uses_visual_check()
+    
+    screenshots = []
+    original = detail.driver.get_screenshot_as_png
+    detail.driver.get_screenshot_as_png = lambda: screenshots.append(1) or original()
+    detail.verify_detail_page_displayed()
+    assert screenshots == [1]
+    
+    # The people card has different buttons and must not pass as a device card
+    people = detail.tap_close_button().tap_people_tab().tap_person_by_name("Anna Le")
+    assert not people.uses_visual_check()
+    people.VISUAL_REFERENCE = DeviceDetailPage.VISUAL_REFERENCE
+    assert not people.matches_reference().matched
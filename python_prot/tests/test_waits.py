@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test adaptive polling and fast absence checks
+"""
+
+import threading
+import time
+
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchElementException,
+                                        StaleElementReferenceException, TimeoutException)
+from page_objects import DeviceDetailPage
+from page_objects.waits import MIN_POLL_INTERVAL, LatencyTracker, next_interval, poll
+
+
+def test_schedule_converges_then_backs_off():
+    # No history: short first, then longer and longer
+    first, backoff = next_interval(0.0, None, MIN_POLL_INTERVAL)
+    second, backoff = next_interval(first, None, backoff)
+    assert first == MIN_POLL_INTERVAL and second > first
+    
+    # Usually appears after 0.8 s: halve the gap instead of polling every 50 ms
+    assert next_interval(0.0, 0.8, MIN_POLL_INTERVAL)[0] == pytest.approx(0.4)
+    assert next_interval(0.79, 0.8, MIN_POLL_INTERVAL)[0] == MIN_POLL_INTERVAL
+
+
+def test_poll_learns_latency_and_fails_fast():
+    tracker = LatencyTracker()
+    appears_at = time.monotonic() + 0.2
+    
+    def condition():
+        if time.monotonic() < appears_at:
+            raise NoSuchElementException()
+        return "found"
+    
+    assert poll(condition, 2, key="button", tracker=tracker) == "found"
+    assert 0.2 <= tracker.expected("button") < 0.5
+    
+    with pytest.raises(TimeoutException):
+        poll(lambda: None, 0.1, tracker=tracker)
+    
+    def dead_session():
+        raise InvalidSessionIdException("session deleted")
+    
+    started = time.monotonic()
+    with pytest.raises(InvalidSessionIdException):
+        poll(dead_session, 5, tracker=tracker)
+    assert time.monotonic() - started < 0.1
+
+
+def test_absence_checks_are_fast_and_errors_surface(fake_findmy):
+    findmy = fake_findmy()
+    main_page = findmy.main_page()
+    
+    started = time.monotonic()
+    assert not main_page.is_element_visible(AppiumBy.CLASS_NAME, "XCUIElementTypeMap", timeout=0)
+    assert main_page.is_element_absent(AppiumBy.ACCESSIBILITY_ID, "Close")
+    assert time.monotonic() - started < 1
+    
+    detail = main_page.tap_devices_tab().tap_device_by_name("Chi's Laptop")
+    assert isinstance(detail, DeviceDetailPage) and detail.is_map_visible()
+    # A live map never settles; the absence check does not wait for it
+    started = time.monotonic()
+    assert detail.is_element_absent(AppiumBy.ACCESSIBILITY_ID, "No Such Button")
+    assert time.monotonic() - started < 1
+    detail.tap(detail.find_element_by_accessibility_id(detail.CLOSE_BUTTON))
+    assert main_page.is_element_absent(AppiumBy.CLASS_NAME, "XCUIElementTypeMap")
+    
+    # An element going stale before is_displayed() is looked up again
+    class StaleElement:
+        def is_displayed(self):
+            raise StaleElementReferenceException("redrawn")
+    
+    stale = iter([[StaleElement()]])
+    find_elements = findmy.driver.find_elements
+    findmy.driver.find_elements = lambda *locator: next(stale, None) or find_elements(*locator)
+    assert main_page.is_element_visible(AppiumBy.ACCESSIBILITY_ID, "Devices", timeout=1)
+    del findmy.driver.find_elements
+    
+    # A dead session is an error, not "not visible"
+    findmy.backend.sessions.clear()
+    with pytest.raises(InvalidSessionIdException):
+        main_page.is_element_visible(AppiumBy.ACCESSIBILITY_ID, "Close")
+
+
+def test_elements_that_appear_without_a_tap_are_still_found(fake_findmy):
+    findmy = fake_findmy()
+    main_page = findmy.main_page()
+    assert main_page._is_settled()
+    
+    # A card slides in on its own (like a late alert) while the settled snapshot is cached
+    app = findmy.app
+    threading.Timer(0.3, lambda: setattr(app, "detail", ("Devices", "Chi's Laptop"))).start()
+    assert main_page.is_element_visible(AppiumBy.ACCESSIBILITY_ID, "Close", timeout=3)
+    
+    # App-lifecycle commands and pool checkouts drop the snapshot
+    main_page.wait_for_stable_hierarchy()
+    findmy.driver.terminate_app(app.bundle_id)
+    findmy.driver.activate_app(app.bundle_id)
+    assert not main_page._is_settled()
+    main_page.wait_for_stable_hierarchy()
+    findmy.pool.release(findmy.driver)
+    assert findmy.pool.acquire() is findmy.driver and not main_page._is_settled()
+
+
+def test_detail_pages_skip_page_source_and_report_unsettled_screens(fake_findmy, caplog):
+    findmy = fake_findmy()
+    detail = findmy.main_page().tap_devices_tab().tap_device_by_name("Chi's Laptop")
+    ready = {sample.command for sample in findmy.commands.samples if "DeviceDetailPage.wait_until_ready" in sample.path}
+    assert ready and "getPageSource" not in ready
+    
+    # A screen that never stops changing (a live map) is reported, not failed
+    assert not detail._settle(lambda _: False, 0.2, "map")
+    assert "DeviceDetailPage: map still changing after 0.2 s" in caplog.text